@@ -1,5 +1,4 @@
 import streamlit as st
-import sqlite3
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
@@ -11,6 +10,8 @@ import time
 import calendar
 import io
 
+from src.core.archive import connect_with_history
+
 
 def check_db_modified():
     db_path = "data/bets.db"
@@ -253,7 +254,8 @@ def get_connection():
     """Gerenciador de contexto para conexões SQLite thread-safe"""
     db_path = "data/bets.db"
     os.makedirs(os.path.dirname(db_path), exist_ok=True)
-    conn = sqlite3.connect(db_path, check_same_thread=False)
+    # Inclui os arquivos mensais (data/archive/bets_AAAA_MM.db) via visões de união
+    conn = connect_with_history(db_path, check_same_thread=False)
     try:
         yield conn
     finally:
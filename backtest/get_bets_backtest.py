@@ -2,6 +2,8 @@
 import itertools
 import random
 import sqlite3
+import sys
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
@@ -9,6 +11,9 @@ import pandas as pd
 from get_roi_backtest import ROIAnalyzer
 from scipy import stats
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.core.archive import connect_with_history
+
 
 class BacktestScanner:
     def __init__(
@@ -113,7 +118,7 @@ class BacktestScanner:
         conn.close()
 
     def get_all_events(self) -> List[str]:
-        conn = sqlite3.connect(self.odds_db_path)
+        conn = connect_with_history(self.odds_db_path)
         cursor = conn.cursor()
         cursor.execute(
             """
@@ -2,10 +2,16 @@
 import logging
 import re
 import sqlite3
+import sys
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import pandas as pd
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.core.archive import connect_with_history
+from src.core.database import MAP_STATS
+
 logging.basicConfig(
     level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s"
 )
@@ -20,7 +26,7 @@ class BacktestResultsUpdater:
 
     def get_finished_events_from_esports(self) -> List[Dict]:
         """Busca eventos finalizados do banco de esports"""
-        conn = sqlite3.connect(self.esports_db_path)
+        conn = connect_with_history(self.esports_db_path)
 
         query = """
         SELECT 
@@ -111,7 +117,7 @@ class BacktestResultsUpdater:
         self, match_id: int, map_number: int = 1
     ) -> Dict[str, Tuple]:
         """Busca estatísticas do mapa específico de uma partida"""
-        conn = sqlite3.connect(self.esports_db_path)
+        conn = connect_with_history(self.esports_db_path)
 
         map_query = """
         SELECT map_id 
@@ -128,22 +134,35 @@ class BacktestResultsUpdater:
 
         map_id = map_result[0]
 
-        stats_query = """
+        # Estatísticas tipadas: uma linha por mapa em map_stats
+        columns = ", ".join(f"home_{stat}, away_{stat}" for stat in MAP_STATS)
+        stats_cursor = conn.cursor()
+        stats_cursor.execute(
+            f"SELECT {columns} FROM map_stats WHERE map_id = ?", (map_id,)
+        )
+        typed_row = stats_cursor.fetchone()
+
+        statistics = {}
+        if typed_row:
+            for i, stat_name in enumerate(MAP_STATS):
+                home_value, away_value = typed_row[2 * i], typed_row[2 * i + 1]
+                if home_value is not None and away_value is not None:
+                    statistics[stat_name] = (home_value, away_value)
+
+        # Estatísticas ainda não modeladas (ex.: gold) continuam em map_statistics;
+        # linhas antigas de MAP_STATS são só backup da migração
+        placeholders = ", ".join("?" for _ in MAP_STATS)
+        stats_query = f"""
         SELECT stat_name, home_value, away_value
         FROM map_statistics
-        WHERE map_id = ?
+        WHERE map_id = ? AND stat_name NOT IN ({placeholders})
         """
-
-        stats_cursor = conn.cursor()
-        stats_cursor.execute(stats_query, (map_id,))
-        stats_results = stats_cursor.fetchall()
+        stats_cursor.execute(stats_query, (map_id, *MAP_STATS))
+        for stat_name, home_value, away_value in stats_cursor.fetchall():
+            statistics[stat_name] = (home_value, away_value)
 
         conn.close()
 
-        statistics = {}
-        for stat_name, home_value, away_value in stats_results:
-            statistics[stat_name] = (home_value, away_value)
-
         return statistics
 
     def determine_map_number_from_market_name(self, market_name: str) -> int:
@@ -1,21 +1,34 @@
 import sqlite3
+import sys
+from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
 import numpy as np
 import pandas as pd
 from colorama import Back, Fore, Style, init
 
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from src.core.archive import connect_with_history
+from src.core.database import MAP_STATS
+from src.core.entity_registry import SOURCE_BETSAPI, EntityRegistry
+
+ESPORTS_DB_PATH = "../data/lol_esports.db"
+
 
 class ROIAnalyzer:
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.conn = None
+        self.esports_conn = None
+        self.registry: Optional[EntityRegistry] = None
+        # nome do time -> team_id de lol_esports.db (None = não resolvido)
+        self._team_ids: Dict[str, Optional[int]] = {}
         init()
 
     def connect(self):
         """Conecta ao banco de dados"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = connect_with_history(self.db_path)
             return True
         except sqlite3.Error as e:
             print(f"Erro ao conectar ao banco de dados: {e}")
@@ -97,6 +110,34 @@ class ROIAnalyzer:
         finally:
             self.disconnect()
 
+    def _get_esports_connection(self):
+        """Conexão com lol_esports.db (com histórico) reaproveitada entre consultas"""
+        if self.esports_conn is None:
+            self.esports_conn = connect_with_history(ESPORTS_DB_PATH)
+        return self.esports_conn
+
+    def _get_registry(self) -> EntityRegistry:
+        """Registro de entidades compartilhado, só para consulta (a sincronização
+        fica com a ingestão e scripts/sync_entity_registry.py)"""
+        if self.registry is None:
+            self.registry = EntityRegistry.shared(Path(ESPORTS_DB_PATH))
+        return self.registry
+
+    def resolve_team_id(self, team_name: str) -> Optional[int]:
+        """team_id de lol_esports.db para um nome de time (qualquer alias conhecido)"""
+        if team_name not in self._team_ids:
+            registry = self._get_registry()
+            entity_id = registry.resolve("team", team_name)
+            external_id = (
+                registry.external_id(entity_id, SOURCE_BETSAPI)
+                if entity_id is not None
+                else None
+            )
+            self._team_ids[team_name] = (
+                int(external_id) if external_id is not None else None
+            )
+        return self._team_ids[team_name]
+
     def get_team_stats(
         self, team_name: str, stat_type: str, limit: int = 10
     ) -> List[float]:
@@ -104,90 +145,30 @@ class ROIAnalyzer:
         Busca estatísticas históricas reais de uma equipe do banco lol_esports.db
         """
         try:
-            esports_conn = sqlite3.connect("../data/lol_esports.db")
-            cursor = esports_conn.cursor()
-
-            cursor.execute(
-                "SELECT team_id, name FROM teams WHERE name = ?", (team_name,)
-            )
-            team_result = cursor.fetchone()
+            # team_id pelo registro de entidades (aliases entre fontes)
+            team_id = self.resolve_team_id(team_name)
 
-            if not team_result:
-                esports_conn.close()
+            if team_id is None or stat_type not in MAP_STATS:
                 return self._get_fallback_stats(team_name, stat_type, limit)
 
-            team_id = team_result[0]
-
-            query_matches = """
-            SELECT m.match_id, m.home_team_id, m.away_team_id, m.event_time
-            FROM matches m
-            WHERE (m.home_team_id = ? OR m.away_team_id = ?)
-            AND m.time_status = 3
-            AND m.event_time >= datetime('now', '-60 days')
-            ORDER BY m.event_time DESC
-            LIMIT 30
-            """
-
-            cursor.execute(query_matches, (team_id, team_id))
-            matches = cursor.fetchall()
-
-            if not matches:
-                esports_conn.close()
-                return self._get_fallback_stats(team_name, stat_type, limit)
-
-            match_ids = [str(match[0]) for match in matches]
-            placeholders = ",".join(["?"] * len(match_ids))
-
-            query_maps = f"""
-            SELECT gm.map_id, gm.match_id, gm.map_number
-            FROM game_maps gm
-            WHERE gm.match_id IN ({placeholders})
-            ORDER BY gm.match_id DESC, gm.map_number ASC
-            """
-
-            cursor.execute(query_maps, match_ids)
-            all_maps = cursor.fetchall()
-
-            if not all_maps:
-                esports_conn.close()
-                return self._get_fallback_stats(team_name, stat_type, limit)
-
-            map_ids = [str(map_data[0]) for map_data in all_maps]
-            placeholders = ",".join(["?"] * len(map_ids))
+            cursor = self._get_esports_connection().cursor()
 
+            # Últimos mapas do time: leitura de intervalo em team_map_timeline
+            # (total = casa + fora já calculado na ingestão)
             query_stats = f"""
-            SELECT ms.map_id, ms.stat_name, ms.home_value, ms.away_value
-            FROM map_statistics ms
-            WHERE ms.map_id IN ({placeholders})
-            AND ms.stat_name = ?
-            ORDER BY ms.map_id DESC
+            SELECT {stat_type}_total
+            FROM team_map_timeline
+            WHERE team_id = ?
+            AND event_time >= datetime('now', '-60 days')
+            AND {stat_type}_total >= ?
+            ORDER BY event_time DESC, match_id DESC, map_number DESC
+            LIMIT ?
             """
 
-            cursor.execute(query_stats, map_ids + [stat_type])
-            all_stats = cursor.fetchall()
-
-            valid_stats = []
-
-            for stat in all_stats:
-                if len(valid_stats) >= limit:
-                    break
-
-                map_id, stat_name, home_value, away_value = stat
-
-                try:
-                    home_val = float(home_value) if home_value else 0.0
-                    away_val = float(away_value) if away_value else 0.0
-                    total_value = home_val + away_val
-
-                    if stat_type == "inhibitors" and total_value == 0:
-                        continue
-
-                    valid_stats.append(total_value)
-
-                except (ValueError, TypeError):
-                    continue
-
-            esports_conn.close()
+            # Apenas para inhibitors, filtra valores = 0 (NULL = sem a estatística)
+            min_total = 1 if stat_type == "inhibitors" else 0
+            cursor.execute(query_stats, (team_id, min_total, limit))
+            valid_stats = [float(row[0]) for row in cursor.fetchall()]
 
             if len(valid_stats) == 0:
                 return self._get_fallback_stats(team_name, stat_type, limit)
@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Armazenamento em camadas: move o histórico de lol_odds.db, bets.db e
+lol_esports.db para arquivos SQLite mensais (data/archive/) e libera o espaço
+dos bancos quentes com incremental_vacuum.
+
+lol_odds.db também é arquivado a cada execução de db_get_odds.py. Para ler o
+histórico use src.core.archive.connect_with_history.
+
+Uso:
+    python scripts/archive_databases.py [--only odds bets esports] [--days N]
+    python scripts/archive_databases.py --list
+"""
+
+import argparse
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.settings import settings
+from src.core.archive import TieredStorage
+
+DATABASES = {
+    "odds": ("lol_odds.db", settings.ODDS_ARCHIVE_AFTER_DAYS),
+    "bets": ("bets.db", settings.BETS_ARCHIVE_AFTER_DAYS),
+    "esports": ("lol_esports.db", settings.ESPORTS_ARCHIVE_AFTER_DAYS),
+}
+
+
+def _size_mb(path: Path) -> float:
+    return path.stat().st_size / 1024 / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Arquiva o histórico em bancos mensais"
+    )
+    parser.add_argument(
+        "--only", nargs="+", choices=sorted(DATABASES), default=sorted(DATABASES)
+    )
+    parser.add_argument(
+        "--days", type=int, default=None, help="Dias no banco quente (padrão: settings)"
+    )
+    parser.add_argument("--data-dir", type=Path, default=settings.DATA_DIR)
+    parser.add_argument(
+        "--list", action="store_true", help="Só lista os arquivos existentes"
+    )
+    args = parser.parse_args()
+
+    print("🗄️ ARMAZENAMENTO EM CAMADAS")
+    print("=" * 40)
+
+    for name in args.only:
+        filename, default_days = DATABASES[name]
+        db_path = args.data_dir / filename
+        if not db_path.exists():
+            print(f"⚠️ {filename}: banco não encontrado, ignorado")
+            continue
+
+        storage = TieredStorage(db_path)
+        if args.list:
+            months = storage.archive_months()
+            print(f"📁 {filename}: {', '.join(months) if months else 'sem arquivos'}")
+            continue
+
+        days = default_days if args.days is None else args.days
+        size_before = _size_mb(db_path)
+        moved = storage.archive(datetime.now() - timedelta(days=days))
+        freed_pages = storage.incremental_vacuum()
+
+        print(
+            f"✅ {filename}: {sum(moved.values()):,} registros arquivados "
+            f"({len(moved)} meses, corte de {days} dias), {freed_pages:,} páginas "
+            f"liberadas, {size_before:.2f} MB -> {_size_mb(db_path):.2f} MB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Benchmark do codec JSON (stdlib vs orjson) sobre payloads gravados da BetsAPI.
+
+Usa as gravações do replay (data/replay) e os arquivos de lol_results/*.json.
+
+Uso:
+    python scripts/bench_json_codec.py [--repeat 20]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.settings import settings
+from src.core import json_codec
+
+ROOT_DIR = Path(__file__).parent.parent
+
+
+def load_payloads():
+    """Carrega os payloads gravados como bytes (como chegam da API)"""
+    paths = list(Path(settings.REPLAY_DIR).rglob("*.json"))
+    paths += list((ROOT_DIR / "lol_results").glob("*.json"))
+    return [path.read_bytes() for path in paths]
+
+
+def bench(label, func, items, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            func(item)
+    elapsed = time.perf_counter() - start
+    per_call = elapsed / (repeat * len(items)) * 1e6
+    print(f"   {label:<28} {elapsed:8.3f}s  ({per_call:8.1f} µs/chamada)")
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark do codec JSON")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    raw_payloads = load_payloads()
+    if not raw_payloads:
+        print("❌ Nenhum payload encontrado (rode scripts/seed_replay_store.py)")
+        return
+
+    total_mb = sum(len(p) for p in raw_payloads) / 1024 / 1024
+    print("⏱️  BENCHMARK JSON")
+    print("=" * 60)
+    print(
+        f"📦 {len(raw_payloads)} payloads ({total_mb:.2f} MB), {args.repeat} repetições"
+    )
+    print(f"🔧 Backend ativo: {json_codec.BACKEND}")
+
+    objects = [json.loads(p) for p in raw_payloads]
+    # Amostra de "odds" individuais, como em _save_single_odd
+    small_objects = [
+        {"id": str(i), "odds": "1.83", "header": "Over", "name": "12.5", "handicap": ""}
+        for i in range(20000)
+    ]
+
+    print("\n🔽 Decodificação (bytes da resposta):")
+    std_loads = bench(
+        "json.loads(bytes.decode())",
+        lambda p: json.loads(p.decode("utf-8")),
+        raw_payloads,
+        args.repeat,
+    )
+    fast_loads = bench(
+        "json_codec.loads(bytes)", json_codec.loads, raw_payloads, args.repeat
+    )
+
+    print("\n🔼 Codificação (payloads completos):")
+    std_dumps = bench("json.dumps", json.dumps, objects, args.repeat)
+    fast_dumps = bench("json_codec.dumps", json_codec.dumps, objects, args.repeat)
+
+    print("\n🔼 Codificação (odds individuais / raw_data):")
+    std_small = bench("json.dumps", json.dumps, small_objects, 1)
+    fast_small = bench("json_codec.dumps", json_codec.dumps, small_objects, 1)
+
+    print("\n📊 Ganho:")
+    print(f"   loads:       {std_loads / fast_loads:5.1f}x")
+    print(f"   dumps:       {std_dumps / fast_dumps:5.1f}x")
+    print(f"   dumps (odd): {std_small / fast_small:5.1f}x")
+
+
+if __name__ == "__main__":
+    main()
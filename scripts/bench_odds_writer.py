@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Benchmark da gravação de odds: caminho antigo (um INSERT por odd, uma conexão
+por evento) vs parse + executemany em uma transação por lote de eventos.
+
+Usa payloads de prematch gravados (API_MODE=record) em data/replay; sem
+gravações, gera payloads sintéticos com o mesmo formato.
+
+Uso:
+    python scripts/bench_odds_writer.py [--events 200] [--batch-size 10]
+"""
+
+import argparse
+import asyncio
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db_get_odds import LoLOddsDatabase
+from src.core import json_codec
+from src.core.replay import ReplayStore
+
+
+def synthetic_payload(fi: str, markets: int = 40, players: int = 10) -> dict:
+    """Gera um payload no formato do v3/bet365/prematch"""
+    rnd = random.Random(fi)
+
+    def odds(n):
+        return [
+            {
+                "id": f"{fi}{i}",
+                "odds": f"{rnd.uniform(1.1, 4.0):.2f}",
+                "header": rnd.choice(["Over", "Under", "1", "2"]),
+                "name": f"{rnd.randint(5, 40)}.5",
+                "handicap": f"{rnd.randint(-5, 5)}.5",
+            }
+            for i in range(n)
+        ]
+
+    sp = {
+        f"market_{m}": {"id": str(m), "name": f"Market {m}", "odds": odds(6)}
+        for m in range(markets)
+    }
+    player_sp = {
+        f"player_{p}": {"id": str(p), "name": f"Player Kills {p}", "odds": odds(20)}
+        for p in range(players)
+    }
+    return {
+        "FI": fi,
+        "main": {"sp": sp},
+        "map_1": {"sp": dict(list(sp.items())[: markets // 2])},
+        "player": {"sp": player_sp},
+    }
+
+
+def load_payloads(limit: int):
+    payloads = []
+    for body in ReplayStore().iter_bodies("v3/bet365/prematch"):
+        if body.get("results"):
+            payloads.append(body["results"][0])
+        if len(payloads) >= limit:
+            break
+    source = "gravações do replay"
+    if not payloads:
+        payloads = [synthetic_payload(str(100000 + i)) for i in range(limit)]
+        source = "payloads sintéticos"
+    return payloads, source
+
+
+LEGACY_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS current_odds (
+        id INTEGER PRIMARY KEY,
+        event_id TEXT NOT NULL,
+        odds_type TEXT NOT NULL,
+        market_name TEXT NOT NULL,
+        selection_name TEXT NOT NULL,
+        odds_value REAL NOT NULL,
+        handicap TEXT,
+        updated_at TEXT DEFAULT (datetime('now')),
+        raw_data TEXT
+    )
+"""
+
+
+def legacy_write(db_path: Path, event_id: str, rows):
+    """Caminho antigo: conexão por evento e um INSERT por odd (layout antigo de current_odds)"""
+    with sqlite3.connect(db_path) as conn:
+        conn.execute(LEGACY_SCHEMA)
+        conn.execute("DELETE FROM current_odds WHERE event_id = ?", (event_id,))
+        for row in rows:
+            event_id, odds_type, market, selection, odds_value, handicap, text = row
+            conn.execute(
+                """
+                INSERT INTO current_odds
+                (event_id, odds_type, market_name, selection_name, odds_value, handicap, raw_data)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                (
+                    event_id,
+                    odds_type,
+                    market,
+                    selection,
+                    odds_value,
+                    text if handicap is None else str(handicap),
+                    json_codec.dumps(row),
+                ),
+            )
+        conn.commit()
+
+
+def table_bytes(db_path: Path, tables) -> int:
+    """Bytes ocupados pelas tabelas (extensão dbstat do SQLite; 0 se indisponível)"""
+    placeholders = ",".join("?" for _ in tables)
+    try:
+        with sqlite3.connect(db_path) as conn:
+            return conn.execute(
+                f"SELECT COALESCE(SUM(pgsize), 0) FROM dbstat WHERE name IN ({placeholders})",
+                tuple(tables),
+            ).fetchone()[0]
+    except sqlite3.OperationalError:
+        return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark da gravação de odds")
+    parser.add_argument("--events", type=int, default=200)
+    parser.add_argument("--batch-size", type=int, default=10)
+    args = parser.parse_args()
+
+    payloads, source = load_payloads(args.events)
+    tmp_dir = Path(tempfile.mkdtemp())
+    legacy_path = tmp_dir / "legacy.db"
+    bulk_db = LoLOddsDatabase(db_path=tmp_dir / "bulk.db")
+    event_ids = [str(p.get("FI") or i) for i, p in enumerate(payloads)]
+
+    print("⏱️  BENCHMARK GRAVAÇÃO DE ODDS")
+    print("=" * 60)
+    print(f"📦 {len(payloads)} eventos ({source}), JSON: {json_codec.BACKEND}")
+
+    # Antes: parse + INSERT linha a linha
+    start = time.perf_counter()
+    legacy_rows = 0
+    for event_id, payload in zip(event_ids, payloads):
+        rows = bulk_db._parse_odds_rows(event_id, payload)
+        legacy_write(legacy_path, event_id, rows)
+        legacy_rows += len(rows)
+    legacy_elapsed = time.perf_counter() - start
+
+    # Depois: parse + executemany por lote de eventos
+    start = time.perf_counter()
+    bulk_rows = 0
+    for i in range(0, len(payloads), args.batch_size):
+        batch = {
+            event_id: bulk_db._parse_odds_rows(event_id, payload)
+            for event_id, payload in zip(
+                event_ids[i : i + args.batch_size], payloads[i : i + args.batch_size]
+            )
+        }
+        bulk_db._write_odds_batch(batch)
+        bulk_rows += sum(len(rows) for rows in batch.values())
+    bulk_elapsed = time.perf_counter() - start
+
+    print(
+        f"\n   Antes  (linha a linha): {legacy_rows:>8} linhas em {legacy_elapsed:6.2f}s "
+        f"-> {legacy_rows / legacy_elapsed:>10,.0f} linhas/s"
+    )
+    print(
+        f"   Depois (executemany):   {bulk_rows:>8} linhas em {bulk_elapsed:6.2f}s "
+        f"-> {bulk_rows / bulk_elapsed:>10,.0f} linhas/s"
+    )
+    print(f"\n📊 Ganho: {legacy_elapsed / bulk_elapsed:.1f}x")
+    legacy_size = table_bytes(legacy_path, ("current_odds",))
+    bulk_size = table_bytes(
+        Path(bulk_db.db_path), ("odds", "odds_markets", "odds_selections")
+    )
+    if legacy_size and bulk_size:
+        print(
+            f"💾 Odds atuais: {legacy_size / 1024:,.0f} KB (texto + raw_data por linha) vs "
+            f"{bulk_size / 1024:,.0f} KB (normalizado)"
+        )
+
+    asyncio.run(bulk_db.close())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Consolida o WAL dos bancos em data/*.db e data/archive/*.db antes de versioná-los.
+
+Os bancos rodam em journal_mode=WAL; o workflow diário commita apenas os
+arquivos .db, então as transações que ainda estão no -wal seriam perdidas.
+Os arquivos mensais de data/archive/ recebem as linhas que o arquivamento tira
+dos bancos principais e precisam ser commitados junto.
+
+Uso:
+    python scripts/checkpoint_databases.py [--data-dir data]
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.archive import ARCHIVE_SUBDIR
+from src.core.connection import checkpoint
+
+ROOT_DIR = Path(__file__).parent.parent
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Consolida o WAL de data/*.db e data/archive/*.db"
+    )
+    parser.add_argument("--data-dir", type=Path, default=ROOT_DIR / "data")
+    args = parser.parse_args()
+
+    failed = []
+    db_paths = sorted(args.data_dir.glob("*.db")) + sorted(
+        (args.data_dir / ARCHIVE_SUBDIR).glob("*.db")
+    )
+    for db_path in db_paths:
+        name = db_path.relative_to(args.data_dir)
+        if checkpoint(db_path):
+            print(f"✅ {name}")
+        else:
+            print(f"⚠️ {name}: checkpoint incompleto (banco em uso)")
+            failed.append(str(name))
+
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
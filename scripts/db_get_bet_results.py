@@ -1,9 +1,14 @@
-import sqlite3
 import pandas as pd
 from datetime import datetime
 from typing import Dict, List, Optional, Tuple
 import logging
 import re
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.core.connection import connect
+from src.core.database import MAP_STATS
 
 # Configurar logging
 logging.basicConfig(
@@ -19,7 +24,7 @@ class BetResultsUpdater:
 
     def get_finished_events_from_esports(self) -> List[Dict]:
         """Busca eventos finalizados do banco de esports"""
-        conn = sqlite3.connect(self.esports_db_path)
+        conn = connect(self.esports_db_path, reuse=True)
 
         query = """
         SELECT 
@@ -63,7 +68,7 @@ class BetResultsUpdater:
 
     def get_pending_bets_from_bets_db(self) -> List[Dict]:
         """Busca apostas pendentes do banco de apostas"""
-        conn = sqlite3.connect(self.bets_db_path)
+        conn = connect(self.bets_db_path, reuse=True)
 
         query = """
         SELECT 
@@ -114,7 +119,7 @@ class BetResultsUpdater:
         self, match_id: int, map_number: int = 1
     ) -> Dict[str, Tuple]:
         """Busca estatísticas do mapa específico de uma partida"""
-        conn = sqlite3.connect(self.esports_db_path)
+        conn = connect(self.esports_db_path, reuse=True)
 
         # Primeiro, encontrar o map_id do mapa específico
         map_query = """
@@ -135,24 +140,35 @@ class BetResultsUpdater:
 
         map_id = map_result[0]
 
-        # Buscar todas as estatísticas deste mapa
-        stats_query = """
+        # Estatísticas tipadas: uma linha por mapa em map_stats
+        columns = ", ".join(f"home_{stat}, away_{stat}" for stat in MAP_STATS)
+        stats_cursor = conn.cursor()
+        stats_cursor.execute(
+            f"SELECT {columns} FROM map_stats WHERE map_id = ?", (map_id,)
+        )
+        typed_row = stats_cursor.fetchone()
+
+        statistics = {}
+        if typed_row:
+            for i, stat_name in enumerate(MAP_STATS):
+                home_value, away_value = typed_row[2 * i], typed_row[2 * i + 1]
+                if home_value is not None and away_value is not None:
+                    statistics[stat_name] = (home_value, away_value)
+
+        # Estatísticas ainda não modeladas (ex.: gold) continuam em map_statistics;
+        # linhas antigas de MAP_STATS são só backup da migração
+        placeholders = ", ".join("?" for _ in MAP_STATS)
+        stats_query = f"""
         SELECT stat_name, home_value, away_value
         FROM map_statistics
-        WHERE map_id = ?
+        WHERE map_id = ? AND stat_name NOT IN ({placeholders})
         """
-
-        stats_cursor = conn.cursor()
-        stats_cursor.execute(stats_query, (map_id,))
-        stats_results = stats_cursor.fetchall()
+        stats_cursor.execute(stats_query, (map_id, *MAP_STATS))
+        for stat_name, home_value, away_value in stats_cursor.fetchall():
+            statistics[stat_name] = (home_value, away_value)
 
         conn.close()
 
-        # Organizar as estatísticas em um dicionário
-        statistics = {}
-        for stat_name, home_value, away_value in stats_results:
-            statistics[stat_name] = (home_value, away_value)
-
         return statistics
 
     def determine_map_number_from_market_name(self, market_name: str) -> int:
@@ -360,7 +376,7 @@ class BetResultsUpdater:
             events_dict = {event["event_id"]: event for event in finished_events}
 
             # Conectar ao banco de apostas
-            bets_conn = sqlite3.connect(self.bets_db_path)
+            bets_conn = connect(self.bets_db_path, reuse=True)
             bets_cursor = bets_conn.cursor()
 
             updated_count = 0
@@ -452,7 +468,7 @@ class BetResultsUpdater:
     def get_performance_report(self) -> Dict:
         """Geras relatório de performance das apostas"""
         try:
-            conn = sqlite3.connect(self.bets_db_path)
+            conn = connect(self.bets_db_path, reuse=True)
 
             query = """
             SELECT 
@@ -1,6 +1,5 @@
 import os
 import re
-import sqlite3
 import sys
 from datetime import datetime
 from pathlib import Path
@@ -16,6 +15,7 @@ from scipy import stats
 load_dotenv(os.path.join(os.path.dirname(__file__), "..", ".env"))
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.connection import connect
 from src.services.telegram_notifier import TelegramNotifier
 
 
@@ -32,7 +32,7 @@ class BetScanner:
 
     def setup_database(self):
         """Cria as tabelas necessárias com estrutura expandida"""
-        conn = sqlite3.connect(self.bets_db_path)
+        conn = connect(self.bets_db_path, reuse=True)
         cursor = conn.cursor()
 
         # Tabela de eventos com status e resultado
@@ -288,7 +288,7 @@ class BetScanner:
         away_team = event_info.get("away_team")
 
         # Buscar odds de players
-        conn = sqlite3.connect(self.odds_db_path)
+        conn = connect(self.odds_db_path, reuse=True)
         q = """
             SELECT market_name, selection_name, handicap, odds_value
             FROM current_odds
@@ -399,7 +399,7 @@ class BetScanner:
         winner: Optional[str] = None,
     ):
         """Atualiza o status e resultado de um evento"""
-        conn = sqlite3.connect(self.bets_db_path)
+        conn = connect(self.bets_db_path, reuse=True)
         cursor = conn.cursor()
 
         if home_score is not None and away_score is not None:
@@ -550,21 +550,21 @@ class BetScanner:
 
             message += "#LoL #Bet365 #Aposta #EV+"
 
-            # Enviar notificação
-            success = self.telegram_notifier.send_message(
-                message, parse_mode="Markdown"
+            # Enfileirar notificação (enviada por flush após gravar as apostas)
+            success = self.telegram_notifier.queue_message(
+                message, parse_mode="Markdown", kind="new_bet"
             )
             if success:
-                print(f"📤 Notificação agrupada enviada para Telegram")
+                print(f"📥 Notificação agrupada enfileirada para Telegram")
             else:
-                print(f"⚠️ Falha ao enviar notificação agrupada")
+                print(f"⚠️ Falha ao enfileirar notificação agrupada")
 
         except Exception as e:
             print(f"❌ Erro ao enviar notificação agrupada: {str(e)}")
 
     def update_bet_result(self, bet_id: int, bet_status: str, actual_win: float = 0):
         """Atualiza o resultado de uma aposta"""
-        conn = sqlite3.connect(self.bets_db_path)
+        conn = connect(self.bets_db_path, reuse=True)
         cursor = conn.cursor()
 
         cursor.execute(
@@ -584,7 +584,7 @@ class BetScanner:
         Verifica os resultados das apostas para um evento finalizado
         Retorna o lucro/prejuízo total para o evento
         """
-        conn = sqlite3.connect(self.bets_db_path)
+        conn = connect(self.bets_db_path, reuse=True)
         cursor = conn.cursor()
 
         # Busca informações do evento
@@ -687,8 +687,8 @@ class BetScanner:
         return False  # Padrão: aposta perdida
 
     def get_future_events(self) -> List[str]:
-        odds_conn = sqlite3.connect(self.odds_db_path)
-        bets_conn = sqlite3.connect(self.bets_db_path)
+        odds_conn = connect(self.odds_db_path, reuse=True)
+        bets_conn = connect(self.bets_db_path, reuse=True)
 
         odds_cursor = odds_conn.cursor()
         odds_cursor.execute(
@@ -719,7 +719,7 @@ class BetScanner:
 
     def save_event_info(self, event_id: str, event_info: Dict):
         """Salva informações do evento"""
-        conn = sqlite3.connect(self.bets_db_path)
+        conn = connect(self.bets_db_path, reuse=True)
         cursor = conn.cursor()
 
         cursor.execute(
@@ -765,11 +765,13 @@ class BetScanner:
                 handicap = line["handicap"]
                 odds = line["odds"]
 
-                roi_team1, roi_team2, roi_average, fair_odds_average = (
-                    self.analyzer.calculate_average_roi(
-                        team1, team2, selection, handicap, odds
-                    )
+                average_roi = self.analyzer.calculate_average_roi(
+                    team1, team2, selection, handicap, odds
                 )
+                # Time sem histórico: a linha não é avaliada
+                if average_roi is None:
+                    continue
+                roi_team1, roi_team2, roi_average, fair_odds_average = average_roi
 
                 if roi_average > min_roi:
                     bet_data = {
@@ -800,7 +802,7 @@ class BetScanner:
         if not bets:
             return
 
-        conn = sqlite3.connect(self.bets_db_path)
+        conn = connect(self.bets_db_path, reuse=True)
         cursor = conn.cursor()
 
         bets_by_event = {}
@@ -871,9 +873,12 @@ class BetScanner:
         for event_id, event_bets in new_bets_by_event.items():
             self._notify_new_bet(event_bets, stake)
 
+        if new_bets_by_event:
+            self.telegram_notifier.flush()
+
     def get_performance_stats(self) -> Dict:
         """Retorna estatísticas de desempenho das apostas"""
-        conn = sqlite3.connect(self.bets_db_path)
+        conn = connect(self.bets_db_path, reuse=True)
 
         query = """
         SELECT 
@@ -925,6 +930,9 @@ class BetScanner:
         total_good_bets = 0
         print(f"📋 Encontrados {total_events} eventos NOVOS para analisar")
 
+        # Resolve todos os times dos eventos futuros em uma consulta
+        self.analyzer.resolve_upcoming_teams()
+
         all_good_bets = []
 
         for i, event_id in enumerate(events, 1):
@@ -948,7 +956,7 @@ class BetScanner:
 
     def show_summary(self, limit: int = 10):
         """Mostra resumo das melhores apostas"""
-        conn = sqlite3.connect(self.bets_db_path)
+        conn = connect(self.bets_db_path, reuse=True)
 
         query = """
         SELECT 
@@ -1003,7 +1011,7 @@ class BetScanner:
 
     def get_stats(self) -> Dict:
         """Retorna estatísticas do banco incluindo desempenho"""
-        conn = sqlite3.connect(self.bets_db_path)
+        conn = connect(self.bets_db_path, reuse=True)
         cursor = conn.cursor()
 
         cursor.execute("SELECT COUNT(*) FROM events")
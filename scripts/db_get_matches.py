@@ -9,19 +9,25 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from scripts.update_30_days import DatabaseUpdater
+from scripts.update_30_days import DatabaseUpdater, parse_args
 
 
 async def main():
+    args = parse_args(default_days=2)
     print("📅 ATUALIZADOR DIÁRIO")
     print("=" * 40)
-    print("🔄 Verificando últimos 2 dias...")
+    print(f"🔄 Verificando últimos {args.days} dias...")
 
     updater = DatabaseUpdater()
 
     try:
         # Apenas últimos 2 dias para atualização diária
-        await updater.update_last_days(days_back=2)
+        await updater.update_last_days(
+            days_back=args.days,
+            day_concurrency=args.day_concurrency,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+        )
         print("✅ Atualização diária concluída!")
 
     except Exception as e:
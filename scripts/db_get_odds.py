@@ -1,10 +1,14 @@
+import argparse
 import asyncio
-import json
+import hashlib
 import logging
 import os
-import sqlite3
 import sys
 import time
+import zlib
+from collections import Counter
+from contextlib import closing, contextmanager
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
@@ -14,7 +18,13 @@ import aiohttp
 # Adicionar o diretório pai ao path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+from src.core import json_codec
+from src.core.archive import ODDS_ARCHIVE_PLAN, TieredStorage
+from src.config.settings import settings
 from src.core.bet365_client import Bet365Client
+from src.core.connection import close_thread_connections, connect
+from src.core.database import LoLDatabase
+from src.core.entity_registry import EntityRegistry
 from src.services.telegram_notifier import TelegramNotifier
 
 # Verificar se as variáveis do Telegram estão configuradas
@@ -96,47 +106,10 @@ def setup_logging():
 logger = setup_logging()
 
 
-class RateLimiter:
-    """Controla a taxa de requisições para respeitar os limites da API"""
-
-    def __init__(self, max_requests=3500, time_window=3600):
-        self.max_requests = max_requests
-        self.time_window = time_window
-        self.requests = []
-        self.lock = asyncio.Lock()
-
-    async def acquire(self):
-        async with self.lock:
-            now = time.time()
-
-            # Remove requisições antigas
-            self.requests = [
-                req_time
-                for req_time in self.requests
-                if now - req_time < self.time_window
-            ]
-
-            # Verifica se podemos fazer mais requisições
-            if len(self.requests) >= self.max_requests:
-                # Calcula quando a próxima requisição pode ser feita
-                oldest_req = min(self.requests)
-                wait_time = self.time_window - (now - oldest_req)
-                if wait_time > 0:
-                    logger.debug(f"⏰ Rate limit atingido, aguardando {wait_time:.2f}s")
-                    await asyncio.sleep(wait_time)
-                    now = time.time()
-                    # Atualiza a lista após esperar
-                    self.requests = [
-                        req_time
-                        for req_time in self.requests
-                        if now - req_time < self.time_window
-                    ]
-
-            # Adiciona a nova requisição
-            self.requests.append(now)
-
-
 class LoLOddsDatabase:
+    # Eventos por INSERT multi-linha (6 parâmetros cada, abaixo do limite do SQLite)
+    EVENT_INSERT_CHUNK = 500
+
     def __init__(self, db_path: str = None):
         if db_path is None:
             data_dir = Path(__file__).parent.parent / "data"
@@ -144,18 +117,21 @@ class LoLOddsDatabase:
             db_path = data_dir / "lol_odds.db"
 
         self.db_path = str(db_path)
-        self.client = Bet365Client()
+        # Telemetria da API em update_logs de lol_esports.db
+        self.client = Bet365Client(telemetry_db=LoLDatabase())
         self.telegram_notifier = TelegramNotifier()
         self.lol_sport_id = 151
-        self.rate_limiter = RateLimiter(max_requests=3500, time_window=3600)
-        self.semaphore = asyncio.Semaphore(10)
-        self.odds_cache = {}
+        self.semaphore = asyncio.Semaphore(settings.ODDS_FETCH_CONCURRENCY)
+        self._market_ids: Dict[Tuple[str, str], int] = {}
+        self._selection_ids: Dict[str, int] = {}
+        self._known_team_ids: Optional[Set[str]] = None
         self.init_database()
         logger.info(f"📀 Database inicializado: {self.db_path}")
 
     def init_database(self):
         """Inicializa o banco de dados com as tabelas necessárias incluindo teams"""
-        with sqlite3.connect(self.db_path) as conn:
+        # Conexão própria: foreign_keys não vale para a conexão reaproveitada
+        with closing(connect(self.db_path)) as conn, conn:
             conn.execute("PRAGMA foreign_keys = ON")
 
             # Tabela de times
@@ -184,6 +160,7 @@ class LoLOddsDatabase:
                     match_date TEXT,
                     match_timestamp INTEGER,
                     status TEXT DEFAULT 'upcoming',
+                    last_odds_fetch INTEGER,
                     created_at TEXT DEFAULT (datetime('now')),
                     updated_at TEXT DEFAULT (datetime('now')),
                     FOREIGN KEY (home_team_id) REFERENCES teams (id),
@@ -192,24 +169,113 @@ class LoLOddsDatabase:
             """
             )
 
-            # Tabela de odds atuais
+            # Dicionários de mercados e seleções (chaves inteiras)
             conn.execute(
                 """
-                CREATE TABLE IF NOT EXISTS current_odds (
-                    id INTEGER PRIMARY KEY,
-                    event_id TEXT NOT NULL,
+                CREATE TABLE IF NOT EXISTS odds_markets (
+                    market_id INTEGER PRIMARY KEY,
                     odds_type TEXT NOT NULL,
                     market_name TEXT NOT NULL,
-                    selection_name TEXT NOT NULL,
+                    UNIQUE (odds_type, market_name)
+                )
+            """
+            )
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS odds_selections (
+                    selection_id INTEGER PRIMARY KEY,
+                    name TEXT UNIQUE NOT NULL
+                )
+            """
+            )
+
+            # Odds atuais normalizadas (handicap numérico; handicap_text só
+            # quando o valor da API não é numérico)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS odds (
+                    id INTEGER PRIMARY KEY,
+                    event_id TEXT NOT NULL,
+                    market_id INTEGER NOT NULL,
+                    selection_id INTEGER NOT NULL,
+                    handicap REAL,
+                    handicap_text TEXT,
                     odds_value REAL NOT NULL,
-                    handicap TEXT,
                     updated_at TEXT DEFAULT (datetime('now')),
-                    raw_data TEXT,
+                    FOREIGN KEY (event_id) REFERENCES events (event_id) ON DELETE CASCADE,
+                    FOREIGN KEY (market_id) REFERENCES odds_markets (market_id),
+                    FOREIGN KEY (selection_id) REFERENCES odds_selections (selection_id)
+                )
+            """
+            )
+
+            # Payload bruto do prematch, um blob zlib por evento (opcional)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS event_odds_payload (
+                    event_id TEXT PRIMARY KEY,
+                    payload BLOB NOT NULL,
+                    updated_at TEXT DEFAULT (datetime('now')),
                     FOREIGN KEY (event_id) REFERENCES events (event_id) ON DELETE CASCADE
                 )
             """
             )
 
+            # Ledger de buscas de prematch (persiste entre execuções)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS odds_fetch_ledger (
+                    event_id TEXT PRIMARY KEY,
+                    fetched_at INTEGER NOT NULL,
+                    payload_hash TEXT,
+                    outcome TEXT NOT NULL CHECK (outcome IN ('ok', 'empty', 'error')),
+                    FOREIGN KEY (event_id) REFERENCES events (event_id) ON DELETE CASCADE
+                )
+            """
+            )
+
+            self._migrate_legacy_odds(conn)
+
+            # Histórico de preços (apenas linhas novas ou com preço alterado)
+            conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS odds_history (
+                    id INTEGER PRIMARY KEY,
+                    event_id TEXT NOT NULL,
+                    market_id INTEGER NOT NULL,
+                    selection_id INTEGER NOT NULL,
+                    handicap REAL,
+                    handicap_text TEXT,
+                    odds_value REAL NOT NULL,
+                    ts TEXT DEFAULT (datetime('now')),
+                    FOREIGN KEY (event_id) REFERENCES events (event_id) ON DELETE CASCADE
+                )
+            """
+            )
+            self._migrate_legacy_odds_history(conn)
+            self._add_last_odds_fetch_column(conn)
+
+            # Visão de compatibilidade com o layout antigo de current_odds
+            # (ROIAnalyzer.get_market_odds, db_get_bets, backtests)
+            conn.execute(
+                """
+                CREATE VIEW IF NOT EXISTS current_odds AS
+                SELECT
+                    o.id,
+                    o.event_id,
+                    m.odds_type,
+                    m.market_name,
+                    s.name AS selection_name,
+                    o.odds_value,
+                    COALESCE(o.handicap_text, o.handicap) AS handicap,
+                    o.updated_at,
+                    NULL AS raw_data
+                FROM odds o
+                JOIN odds_markets m ON o.market_id = m.market_id
+                JOIN odds_selections s ON o.selection_id = s.selection_id
+            """
+            )
+
             # Tabela de resultados
             conn.execute(
                 """
@@ -234,36 +300,238 @@ class LoLOddsDatabase:
             conn.execute(
                 "CREATE INDEX IF NOT EXISTS idx_events_timestamp ON events (match_timestamp)"
             )
+            # (status, last_odds_fetch) também atende as buscas só por status e
+            # permite ao agendador ler apenas os eventos upcoming possivelmente
+            # vencidos
+            conn.execute("DROP INDEX IF EXISTS idx_events_status")
+            conn.execute("DROP INDEX IF EXISTS idx_events_last_odds_fetch")
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_events_status ON events (status)"
+                "CREATE INDEX IF NOT EXISTS idx_events_status_last_fetch "
+                "ON events (status, last_odds_fetch)"
             )
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_current_odds_event ON current_odds (event_id)"
+                "CREATE INDEX IF NOT EXISTS idx_odds_event_market ON odds (event_id, market_id)"
             )
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_current_odds_market ON current_odds (market_name)"
+                "CREATE INDEX IF NOT EXISTS idx_odds_updated ON odds (updated_at)"
             )
             conn.execute(
-                "CREATE INDEX IF NOT EXISTS idx_current_odds_updated ON current_odds (updated_at)"
+                "CREATE INDEX IF NOT EXISTS idx_odds_history_event_market_ts ON odds_history (event_id, market_id, ts)"
             )
 
             conn.commit()
 
-    def _get_or_create_team(
-        self, conn, team_id: str, team_name: str, region: str = None
-    ) -> str:
-        """Obtém ou cria um time e retorna o team_id real da API"""
-        cursor = conn.execute("SELECT team_id FROM teams WHERE team_id = ?", (team_id,))
-        existing_team = cursor.fetchone()
+    def _migrate_legacy_odds(self, conn):
+        """Migração única: tabela current_odds (texto repetido por linha) -> odds.
 
-        if existing_team:
-            return existing_team[0]
+        O raw_data por linha e as odds órfãs (evento já removido) são
+        descartados; a tabela antiga dá lugar à visão de compatibilidade com o
+        mesmo nome.
+        """
+        legacy = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'current_odds'"
+        ).fetchone()
+        if not legacy:
+            return
 
+        logger.info("🔄 Migrando current_odds para o formato normalizado...")
         cursor = conn.execute(
-            "INSERT INTO teams (team_id, name, region) VALUES (?, ?, ?)",
-            (team_id, team_name, region),
+            """
+            SELECT event_id, odds_type, market_name, selection_name, handicap,
+                   odds_value, updated_at
+            FROM current_odds
+            WHERE event_id IN (SELECT event_id FROM events)
+            ORDER BY id
+        """
+        )
+        migrated = 0
+        while True:
+            chunk = cursor.fetchmany(5000)
+            if not chunk:
+                break
+            conn.executemany(
+                """
+                INSERT INTO odds
+                (event_id, market_id, selection_id, handicap, handicap_text, odds_value, updated_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+                [
+                    (
+                        event_id,
+                        self._market_id(conn, odds_type, market_name),
+                        self._selection_id(conn, selection_name),
+                        *self._split_handicap(handicap),
+                        odds_value,
+                        updated_at,
+                    )
+                    for event_id, odds_type, market_name, selection_name, handicap, odds_value, updated_at in chunk
+                ],
+            )
+            migrated += len(chunk)
+
+        conn.execute("DROP TABLE current_odds")
+        logger.info(
+            f"✅ {migrated:,} odds migradas (execute VACUUM para liberar espaço)"
+        )
+
+    def _migrate_legacy_odds_history(self, conn):
+        """Converte o odds_history com colunas de texto para chaves de dicionário"""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(odds_history)")}
+        if "market_name" not in columns:
+            return
+
+        conn.execute("DROP INDEX IF EXISTS idx_odds_history_event_market_ts")
+        conn.execute("ALTER TABLE odds_history RENAME TO odds_history_legacy")
+        conn.execute(
+            """
+            CREATE TABLE odds_history (
+                id INTEGER PRIMARY KEY,
+                event_id TEXT NOT NULL,
+                market_id INTEGER NOT NULL,
+                selection_id INTEGER NOT NULL,
+                handicap REAL,
+                handicap_text TEXT,
+                odds_value REAL NOT NULL,
+                ts TEXT DEFAULT (datetime('now')),
+                FOREIGN KEY (event_id) REFERENCES events (event_id) ON DELETE CASCADE
+            )
+        """
+        )
+        conn.executemany(
+            """
+            INSERT INTO odds_history
+            (event_id, market_id, selection_id, handicap, handicap_text, odds_value, ts)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """,
+            [
+                (
+                    event_id,
+                    self._market_id(conn, odds_type, market_name),
+                    self._selection_id(conn, selection_name),
+                    *self._split_handicap(handicap),
+                    odds_value,
+                    ts,
+                )
+                for event_id, odds_type, market_name, selection_name, handicap, odds_value, ts in conn.execute(
+                    """
+                    SELECT event_id, odds_type, market_name, selection_name, handicap,
+                           odds_value, ts
+                    FROM odds_history_legacy
+                    WHERE event_id IN (SELECT event_id FROM events)
+                    ORDER BY id
+                """
+                ).fetchall()
+            ],
+        )
+        conn.execute("DROP TABLE odds_history_legacy")
+
+    def _add_last_odds_fetch_column(self, conn):
+        """Adiciona events.last_odds_fetch (epoch) a bancos antigos.
+
+        O valor inicial vem da última gravação de odds do evento, para que a
+        primeira execução do agendador não trate todos os eventos como nunca
+        atualizados.
+        """
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(events)")}
+        if "last_odds_fetch" in columns:
+            return
+
+        conn.execute("ALTER TABLE events ADD COLUMN last_odds_fetch INTEGER")
+        conn.execute(
+            """
+            UPDATE events SET last_odds_fetch = (
+                SELECT CAST(strftime('%s', MAX(o.updated_at)) AS INTEGER)
+                FROM odds o WHERE o.event_id = events.event_id
+            )
+        """
+        )
+
+    @contextmanager
+    def _transaction(self):
+        """Transação na conexão reaproveitada da thread.
+
+        Se a transação for desfeita, o cache de mercados/seleções é descartado:
+        ids criados nela deixam de existir e o SQLite pode reutilizá-los.
+        """
+        conn = connect(self.db_path, reuse=True)
+        try:
+            with conn:
+                yield conn
+        except BaseException:
+            self._market_ids.clear()
+            self._selection_ids.clear()
+            raise
+
+    def _market_id(self, conn, odds_type: str, market_name: str) -> int:
+        """Chave inteira do mercado (cria no dicionário se necessário)"""
+        key = (odds_type, market_name)
+        market_id = self._market_ids.get(key)
+        if market_id is None:
+            conn.execute(
+                "INSERT OR IGNORE INTO odds_markets (odds_type, market_name) VALUES (?, ?)",
+                key,
+            )
+            market_id = conn.execute(
+                "SELECT market_id FROM odds_markets WHERE odds_type = ? AND market_name = ?",
+                key,
+            ).fetchone()[0]
+            self._market_ids[key] = market_id
+        return market_id
+
+    def _selection_id(self, conn, name: str) -> int:
+        """Chave inteira da seleção (cria no dicionário se necessário)"""
+        selection_id = self._selection_ids.get(name)
+        if selection_id is None:
+            conn.execute(
+                "INSERT OR IGNORE INTO odds_selections (name) VALUES (?)", (name,)
+            )
+            selection_id = conn.execute(
+                "SELECT selection_id FROM odds_selections WHERE name = ?", (name,)
+            ).fetchone()[0]
+            self._selection_ids[name] = selection_id
+        return selection_id
+
+    @staticmethod
+    def _split_handicap(value) -> Tuple[Optional[float], Optional[str]]:
+        """Handicap da API -> (valor numérico, texto se não for numérico)"""
+        if value is None:
+            return None, None
+        text = str(value).strip()
+        if not text:
+            return None, None
+        try:
+            return float(text), None
+        except ValueError:
+            return None, text
+
+    def _ensure_teams(self, conn, teams: Dict[str, str]) -> int:
+        """Cria os times ainda desconhecidos; retorna quantos foram criados.
+
+        O conjunto de team_ids conhecidos é carregado uma vez por execução e
+        mantido em memória.
+        """
+        if self._known_team_ids is None:
+            self._known_team_ids = {
+                row[0] for row in conn.execute("SELECT team_id FROM teams")
+            }
+
+        missing = [
+            (team_id, name)
+            for team_id, name in teams.items()
+            if team_id not in self._known_team_ids
+        ]
+        if not missing:
+            return 0
+
+        conn.executemany(
+            """
+            INSERT INTO teams (team_id, name) VALUES (?, ?)
+            ON CONFLICT (team_id) DO NOTHING
+        """,
+            missing,
         )
-        return team_id
+        self._known_team_ids.update(team_id for team_id, _ in missing)
+        return len(missing)
 
     def _is_lol_event(self, event: Dict) -> bool:
         """Filtro para identificar apenas League of Legends"""
@@ -295,148 +563,171 @@ class LoLOddsDatabase:
 
         return starts_with_lol and is_not_other
 
-    async def fetch_upcoming_events(self, days_ahead: int = 10) -> List[Dict]:
-        """Busca eventos futuros de LoL - padrão aumentado para 10 dias"""
-        events = []
-        logger.info(f"🔍 Buscando eventos para os próximos {days_ahead} dias")
+    async def fetch_upcoming_events(
+        self, days_ahead: int = 10, day_concurrency: Optional[int] = None
+    ) -> List[Dict]:
+        """Busca eventos futuros de LoL - dias buscados em paralelo (limitado)"""
+        day_concurrency = day_concurrency or settings.DAY_FETCH_CONCURRENCY
+        logger.info(
+            f"🔍 Buscando eventos para os próximos {days_ahead} dias "
+            f"({day_concurrency} dias em paralelo)"
+        )
+        semaphore = asyncio.Semaphore(day_concurrency)
 
-        for i in range(days_ahead + 1):
-            target_date = datetime.now() + timedelta(days=i)
+        async def fetch_day(target_date: datetime) -> List[Dict]:
             day_str = target_date.strftime("%Y%m%d")
+            # Filtra LoL conforme as páginas chegam; em caso de erro fica com
+            # o que já foi recebido
+            lol_events = []
+            async with semaphore:
+                try:
+                    async for event in self.client.upcoming_all(
+                        sport_id=self.lol_sport_id, day=day_str
+                    ):
+                        if self._is_lol_event(event):
+                            lol_events.append(event)
+                except Exception as e:
+                    logger.error(
+                        f"❌ Erro ao buscar eventos para {day_str} "
+                        f"({len(lol_events)} já recebidos): {str(e)}"
+                    )
 
-            try:
+            if lol_events:
                 logger.info(
-                    f"📅 Buscando eventos para {target_date.strftime('%Y-%m-%d')}"
+                    f"📅 {target_date.strftime('%Y-%m-%d')}: "
+                    f"✅ {len(lol_events)} jogos de LoL encontrados"
                 )
-                await self.rate_limiter.acquire()
-
-                daily_events = await self.client.upcoming(
-                    sport_id=self.lol_sport_id, day=day_str
+            else:
+                logger.info(
+                    f"📅 {target_date.strftime('%Y-%m-%d')}: "
+                    "ℹ️  Nenhum jogo de LoL encontrado"
                 )
+            return lol_events
 
-                if daily_events.get("success") == 1 and daily_events.get("results"):
-                    lol_events = [
-                        event
-                        for event in daily_events["results"]
-                        if self._is_lol_event(event)
-                    ]
-                    events.extend(lol_events)
-
-                    if lol_events:
-                        logger.info(f"   ✅ {len(lol_events)} jogos de LoL encontrados")
-                    else:
-                        logger.info("   ℹ️  Nenhum jogo de LoL encontrado")
-                else:
-                    logger.info(f"   ℹ️  Nenhum evento encontrado para {day_str}")
-
-            except Exception as e:
-                logger.error(f"❌ Erro ao buscar eventos para {day_str}: {str(e)}")
+        today = datetime.now()
+        daily_results = await asyncio.gather(
+            *[fetch_day(today + timedelta(days=i)) for i in range(days_ahead + 1)]
+        )
 
+        # Junta na ordem dos dias
+        events = [event for lol_events in daily_results for event in lol_events]
         logger.info(f"📊 Total de eventos encontrados: {len(events)}")
         return events
 
     def save_events(self, events: List[Dict]) -> Dict[str, int]:
-        """Salva eventos no banco, incluindo informações dos times e notificações do Telegram"""
+        """Salva eventos no banco, incluindo informações dos times e notificações do Telegram.
+
+        Gravação em conjunto: times novos em um executemany e eventos em
+        INSERT multi-linha com ``ON CONFLICT DO NOTHING RETURNING``; os
+        event_ids devolvidos são os eventos novos.
+        """
         stats = {
             "new": 0,
             "existing": 0,
             "teams_created": 0,
-            "notifications_sent": 0,
+            "notifications_queued": 0,
             "notification_errors": 0,
         }
 
-        with sqlite3.connect(self.db_path) as conn:
-            for event in events:
-                event_id = event.get("id")
+        rows = {}
+        teams = {}
+        for event in events:
+            event_id = event.get("id")
+            home_team_info = event.get("home", {})
+            away_team_info = event.get("away", {})
+            home_team_id = home_team_info.get("id")
+            away_team_id = away_team_info.get("id")
+            teams.setdefault(home_team_id, home_team_info.get("name", "Unknown"))
+            teams.setdefault(away_team_id, away_team_info.get("name", "Unknown"))
+
+            match_date = None
+            match_timestamp = None
+            if event.get("time"):
+                try:
+                    match_timestamp = int(event["time"])
+                    match_date = datetime.fromtimestamp(match_timestamp).strftime(
+                        "%Y-%m-%d %H:%M:%S"
+                    )
+                except:
+                    pass
+
+            rows[event_id] = (
+                event_id,
+                home_team_id,
+                away_team_id,
+                event.get("league", {}).get("name", "Unknown"),
+                match_date,
+                match_timestamp,
+            )
+
+        new_ids = set()
+        with connect(self.db_path, reuse=True) as conn:
+            stats["teams_created"] = self._ensure_teams(conn, teams)
 
+            pending = list(rows.values())
+            for i in range(0, len(pending), self.EVENT_INSERT_CHUNK):
+                chunk = pending[i : i + self.EVENT_INSERT_CHUNK]
+                placeholders = ", ".join(["(?, ?, ?, ?, ?, ?)"] * len(chunk))
                 cursor = conn.execute(
-                    "SELECT 1 FROM events WHERE event_id = ?", (event_id,)
+                    f"""
+                    INSERT INTO events
+                    (event_id, home_team_id, away_team_id, league_name, match_date, match_timestamp)
+                    VALUES {placeholders}
+                    ON CONFLICT (event_id) DO NOTHING
+                    RETURNING event_id
+                """,
+                    [value for row in chunk for value in row],
                 )
-                exists = cursor.fetchone() is not None
+                new_ids.update(row[0] for row in cursor.fetchall())
 
-                if exists:
-                    stats["existing"] += 1
-                    continue
+            conn.commit()
 
-                home_team_info = event.get("home", {})
-                away_team_info = event.get("away", {})
-                home_team_id = home_team_info.get("id")
-                away_team_id = away_team_info.get("id")
-                home_team_name = home_team_info.get("name", "Unknown")
-                away_team_name = away_team_info.get("name", "Unknown")
+        stats["new"] = len(new_ids)
+        stats["existing"] = len(rows) - len(new_ids)
 
-                home_api_id = self._get_or_create_team(
-                    conn, home_team_id, home_team_name
-                )
-                away_api_id = self._get_or_create_team(
-                    conn, away_team_id, away_team_name
-                )
-
-                if home_api_id and away_api_id:
-                    stats["teams_created"] += 1
+        for event_id, row in rows.items():
+            if event_id not in new_ids:
+                continue
 
-                league_name = event.get("league", {}).get("name", "Unknown")
+            _, home_team_id, away_team_id, league_name, match_date, _ = row
+            home_team_name = teams[home_team_id]
+            away_team_name = teams[away_team_id]
+            logger.info(
+                f"✅ Novo evento: {home_team_name} vs {away_team_name} - {league_name}"
+            )
 
-                match_date = None
-                match_timestamp = None
-                if event.get("time"):
+            try:
+                display_date = "Data não definida"
+                if match_date:
                     try:
-                        match_timestamp = int(event["time"])
-                        match_date = datetime.fromtimestamp(match_timestamp).strftime(
-                            "%Y-%m-%d %H:%M:%S"
-                        )
+                        dt = datetime.strptime(match_date, "%Y-%m-%d %H:%M:%S")
+                        display_date = dt.strftime("%d/%m/%Y às %H:%M")
                     except:
-                        pass
-
-                conn.execute(
-                    """
-                    INSERT INTO events 
-                    (event_id, home_team_id, away_team_id, league_name, match_date, match_timestamp)
-                    VALUES (?, ?, ?, ?, ?, ?)
-                """,
-                    (
-                        event_id,
-                        home_api_id,
-                        away_api_id,
-                        league_name,
-                        match_date,
-                        match_timestamp,
-                    ),
-                )
+                        display_date = match_date
 
-                stats["new"] += 1
-                logger.info(
-                    f"✅ Novo evento: {home_team_name} vs {away_team_name} - {league_name}"
+                success = self.telegram_notifier.notify_new_event(
+                    home_team=home_team_name,
+                    away_team=away_team_name,
+                    league_name=league_name,
+                    match_date=display_date,
                 )
 
-                try:
-                    display_date = "Data não definida"
-                    if match_date:
-                        try:
-                            dt = datetime.strptime(match_date, "%Y-%m-%d %H:%M:%S")
-                            display_date = dt.strftime("%d/%m/%Y às %H:%M")
-                        except:
-                            display_date = match_date
-
-                    success = self.telegram_notifier.notify_new_event(
-                        home_team=home_team_name,
-                        away_team=away_team_name,
-                        league_name=league_name,
-                        match_date=display_date,
-                    )
-
-                    if success:
-                        stats["notifications_sent"] += 1
-                    else:
-                        stats["notification_errors"] += 1
-
-                except Exception as e:
+                if success:
+                    stats["notifications_queued"] += 1
+                else:
                     stats["notification_errors"] += 1
-                    logger.error(
-                        f"❌ Erro ao enviar notificação para Telegram: {str(e)}"
-                    )
 
-            conn.commit()
+            except Exception as e:
+                stats["notification_errors"] += 1
+                logger.error(
+                    f"❌ Erro ao enfileirar notificação para Telegram: {str(e)}"
+                )
+
+        # Times novos entram no registro de entidades usado pelas análises
+        try:
+            EntityRegistry.shared().sync_from_odds(self.db_path)
+        except Exception as e:
+            logger.error(f"❌ Erro ao sincronizar o registro de entidades: {e}")
 
         logger.info(
             f"📝 Eventos processados - "
@@ -445,143 +736,315 @@ class LoLOddsDatabase:
         )
         return stats
 
-    async def fetch_and_save_odds(
-        self, hours_old_threshold: int = 2, batch_size: int = 10
-    ):
-        """Busca e salva odds em lotes para melhor performance"""
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                """
-                SELECT DISTINCT e.event_id, ht.name, at.name
-                FROM events e
-                JOIN teams ht ON e.home_team_id = ht.team_id
-                JOIN teams at ON e.away_team_id = at.team_id
-                LEFT JOIN current_odds co ON e.event_id = co.event_id
-                WHERE e.status = 'upcoming'
+    @staticmethod
+    def _refresh_tier_sql() -> Tuple[str, str]:
+        """Expressões SQL (faixa, intervalo em segundos) de ``ODDS_REFRESH_TIERS``.
+
+        Dependem de ``e.match_timestamp`` e do parâmetro ``:now``; partidas sem
+        horário caem na primeira faixa.
+        """
+        tiers = settings.ODDS_REFRESH_TIERS
+        tier_cases, interval_cases = [], []
+        for index, (max_hours, interval_minutes) in enumerate(tiers):
+            if max_hours is None:
+                break
+            condition = (
+                "e.match_timestamp IS NULL "
+                f"OR e.match_timestamp - :now <= {int(max_hours * 3600)}"
+            )
+            tier_cases.append(f"WHEN {condition} THEN {index}")
+            interval_cases.append(f"WHEN {condition} THEN {int(interval_minutes * 60)}")
+        else:
+            index = len(tiers)
+        last_interval = int(tiers[min(index, len(tiers) - 1)][1] * 60)
+        return (
+            f"CASE {' '.join(tier_cases)} ELSE {index} END",
+            f"CASE {' '.join(interval_cases)} ELSE {last_interval} END",
+        )
+
+    def select_events_to_refresh(
+        self, budget: int
+    ) -> List[Tuple[str, str, str, Optional[str]]]:
+        """Agendador: eventos com odds vencidas, do mais valioso ao menos valioso.
+
+        O intervalo de cada evento depende da distância até ``match_timestamp``
+        (``settings.ODDS_REFRESH_TIERS``). Entre os vencidos, partidas mais
+        próximas vêm primeiro e, dentro da mesma faixa, os mais atrasados em
+        relação ao próprio intervalo (nunca buscados primeiro). Partidas já
+        iniciadas não têm mais prematch e ficam de fora, assim como eventos
+        cuja última busca veio vazia ou com erro há menos que o maior entre o
+        intervalo da faixa e ``ODDS_EMPTY_TTL``/``ODDS_ERROR_TTL``. Todo o
+        filtro e a ordenação rodam no SQLite (``idx_events_status_last_fetch``
+        limita a busca aos eventos que podem estar vencidos). Retorna no máximo
+        ``budget`` eventos como (event_id, casa, fora, hash do último payload).
+        """
+        tier_sql, interval_sql = self._refresh_tier_sql()
+        now = int(time.time())
+        min_interval = min(minutes for _, minutes in settings.ODDS_REFRESH_TIERS) * 60
+        params = {
+            "now": now,
+            # Nenhum evento buscado depois disso está vencido, em qualquer faixa
+            "fetched_before": now - min_interval,
+            "empty_ttl": settings.ODDS_EMPTY_TTL,
+            "error_ttl": settings.ODDS_ERROR_TTL,
+            # Ao menos uma linha, para informar quantos ficaram de fora
+            "limit": max(budget, 1),
+        }
+
+        with connect(self.db_path, reuse=True) as conn:
+            rows = conn.execute(
+                f"""
+                WITH candidates AS (
+                    SELECT e.event_id, e.home_team_id, e.away_team_id,
+                           e.match_timestamp, e.last_odds_fetch,
+                           {tier_sql} AS tier,
+                           {interval_sql} AS refresh_interval
+                    FROM events e
+                    WHERE e.status = 'upcoming'
+                    AND (e.last_odds_fetch IS NULL
+                         OR e.last_odds_fetch <= :fetched_before)
+                    AND (e.match_timestamp IS NULL OR e.match_timestamp > :now)
+                )
+                SELECT c.event_id, ht.name, at.name, l.payload_hash,
+                       COUNT(*) OVER () AS due_total
+                FROM candidates c
+                JOIN teams ht ON c.home_team_id = ht.team_id
+                JOIN teams at ON c.away_team_id = at.team_id
+                LEFT JOIN odds_fetch_ledger l ON c.event_id = l.event_id
+                WHERE COALESCE(c.last_odds_fetch, 0) <= :now - c.refresh_interval
                 AND (
-                    co.event_id IS NULL
-                    OR datetime(co.updated_at) < datetime('now', ?)
+                    l.outcome IS NULL
+                    OR l.outcome = 'ok'
+                    OR (l.outcome = 'empty'
+                        AND l.fetched_at <= :now - MAX(c.refresh_interval, :empty_ttl))
+                    OR (l.outcome = 'error'
+                        AND l.fetched_at <= :now - MAX(c.refresh_interval, :error_ttl))
                 )
-                ORDER BY e.match_timestamp ASC
+                ORDER BY c.tier,
+                         c.last_odds_fetch IS NOT NULL,
+                         CAST(:now - c.last_odds_fetch AS REAL) / c.refresh_interval DESC,
+                         COALESCE(c.match_timestamp, :now),
+                         c.event_id
+                LIMIT :limit
             """,
-                (f"-{hours_old_threshold} hours",),
+                params,
+            ).fetchall()
+
+        due_total = rows[0][-1] if rows else 0
+        if due_total > budget:
+            logger.info(
+                f"⏳ {due_total - budget} eventos vencidos ficam para a próxima execução "
+                f"(orçamento de {budget} requisições)"
             )
+        return [tuple(row[:-1]) for row in rows[:budget]]
+
+    async def _refresh_budget(self, quota_share: Optional[float] = None) -> int:
+        """Requisições de prematch permitidas nesta execução"""
+        share = settings.ODDS_QUOTA_SHARE if quota_share is None else quota_share
+        budget = int(settings.API_HOURLY_QUOTA * share)
+        return max(0, min(budget, await self.client.remaining_quota()))
+
+    async def fetch_and_save_odds(
+        self,
+        quota_share: Optional[float] = None,
+        batch_size: int = 10,
+        queue_size: Optional[int] = None,
+    ):
+        """Busca e salva odds em um pipeline contínuo fetch -> parse -> gravação.
 
-            events_to_update = cursor.fetchall()
+        Os eventos vêm do agendador (``select_events_to_refresh``), limitados a
+        ``quota_share`` da cota horária. Os fetchers (limitados pelo semáforo e
+        pela cota) colocam as linhas já convertidas em uma fila limitada
+        (``queue_size`` = backpressure); uma thread dedicada grava os eventos
+        em transações de até ``batch_size`` eventos, sem bloquear o event loop.
+        """
+        budget = await self._refresh_budget(quota_share)
+        events_to_update = self.select_events_to_refresh(budget)
 
         if not events_to_update:
-            logger.info("✅ Todos os eventos têm odds atualizadas")
+            logger.info(
+                "✅ Todos os eventos têm odds atualizadas"
+                if budget
+                else "⏸️ Sem cota disponível para atualizar odds"
+            )
             return 0
 
+        queue_size = queue_size or settings.ODDS_QUEUE_SIZE
         logger.info(
-            f"💰 Coletando odds para {len(events_to_update)} eventos em lotes de {batch_size}"
+            f"💰 Coletando odds para {len(events_to_update)} eventos "
+            f"(fila de {queue_size}, transações de até {batch_size} eventos)"
         )
-        odds_collected = 0
 
-        for i in range(0, len(events_to_update), batch_size):
-            batch = events_to_update[i : i + batch_size]
-            logger.info(
-                f"   📦 Processando lote {i // batch_size + 1}/{(len(events_to_update) - 1) // batch_size + 1}"
-            )
+        queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        loop = asyncio.get_running_loop()
+        writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="odds_writer")
+        start_time = time.perf_counter()
 
-            tasks = []
-            for event_id, home, away in batch:
-                task = self._fetch_odds_for_event(event_id, home, away)
-                tasks.append(task)
+        outcomes: Counter = Counter()
 
-            batch_results = await asyncio.gather(*tasks, return_exceptions=True)
+        async def fetcher(event_id: str, home: str, away: str, previous_hash):
+            fetched = await self._fetch_odds_for_event(
+                event_id, home, away, previous_hash
+            )
+            outcomes[fetched[0]] += 1
+            # Bloqueia quando a fila está cheia (backpressure)
+            await queue.put((event_id, *fetched))
+
+        async def consumer() -> int:
+            written = 0
+            finished = False
+            while not finished:
+                item = await queue.get()
+                if item is None:
+                    break
+
+                # Agrupa o que já estiver na fila em uma única transação
+                odds_by_event, payloads, ledger = {}, {}, []
+                while True:
+                    event_id, outcome, payload_hash, rows, raw = item
+                    if rows is not None:
+                        odds_by_event[event_id] = rows
+                    if raw is not None:
+                        payloads[event_id] = raw
+                    ledger.append((event_id, outcome, payload_hash))
+                    if len(ledger) >= batch_size:
+                        break
+                    try:
+                        item = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if item is None:
+                        finished = True
+                        break
 
-            for result in batch_results:
+                try:
+                    await loop.run_in_executor(
+                        writer,
+                        self._write_odds_batch,
+                        odds_by_event,
+                        payloads,
+                        ledger,
+                    )
+                    written += sum(
+                        1 for _, outcome, _ in ledger if outcome in ("ok", "unchanged")
+                    )
+                except Exception as e:
+                    logger.error(
+                        f"      ❌ Erro ao gravar {len(ledger)} eventos: {str(e)}"
+                    )
+            return written
+
+        consumer_task = asyncio.create_task(consumer())
+        try:
+            results = await asyncio.gather(
+                *[fetcher(*event) for event in events_to_update],
+                return_exceptions=True,
+            )
+            for result in results:
                 if isinstance(result, Exception):
                     logger.error(f"      ❌ Erro em tarefa: {str(result)}")
-                elif result:
-                    odds_collected += 1
-
-            if i + batch_size < len(events_to_update):
-                await asyncio.sleep(0.5)
+        finally:
+            await queue.put(None)
+            odds_collected = await consumer_task
+            # A conexão reaproveitada da thread de escrita não fecha sozinha
+            await loop.run_in_executor(writer, close_thread_connections)
+            writer.shutdown(wait=True)
 
         logger.info(
-            f"📊 Coleta finalizada: {odds_collected}/{len(events_to_update)} eventos com odds"
+            f"🧾 Buscas: {outcomes['ok']} com odds novas, {outcomes['unchanged']} sem mudança, "
+            f"{outcomes['empty']} vazias, {outcomes['error']} com erro"
+        )
+        elapsed = time.perf_counter() - start_time
+        logger.info(
+            f"📊 Coleta finalizada: {odds_collected}/{len(events_to_update)} eventos com odds "
+            f"em {elapsed:.1f}s ({len(events_to_update) / elapsed:.1f} eventos/s)"
         )
         return odds_collected
 
-    async def _fetch_odds_for_event(self, event_id: str, home: str, away: str) -> bool:
-        """Busca odds para um evento específico com controle de concorrência"""
+    async def _fetch_odds_for_event(
+        self, event_id: str, home: str, away: str, previous_hash: Optional[str] = None
+    ) -> Tuple[str, Optional[str], Optional[List[Tuple]], Optional[bytes]]:
+        """Busca e converte as odds de um evento (sem gravar) com controle de concorrência.
+
+        Retorna (resultado, hash do payload, linhas, payload bruto compactado).
+        O resultado é "ok", "unchanged" (mesmo hash da última busca: parse e
+        gravação são pulados), "empty" ou "error". O payload bruto só é
+        devolvido com ``ODDS_STORE_RAW_PAYLOAD``.
+        """
         async with self.semaphore:
             try:
-                cache_key = f"{event_id}_{int(time.time() / 3600)}"
-                if cache_key in self.odds_cache:
-                    logger.debug(f"      ♻️  Usando cache para {home} vs {away}")
-                    return True
-
-                await self.rate_limiter.acquire()
-
                 logger.debug(f"      📡 Buscando odds para {home} vs {away}")
                 odds_data = await self.client.prematch(FI=event_id)
 
-                if (
+                if not (
                     odds_data
                     and odds_data.get("success") == 1
                     and odds_data.get("results")
                 ):
-                    result = odds_data["results"][0]
-                    self._save_odds_data(event_id, result)
-
-                    self.odds_cache[cache_key] = True
-                    if len(self.odds_cache) > 1000:
-                        self.odds_cache.pop(next(iter(self.odds_cache)))
-
-                    logger.debug(f"      ✅ Odds salvas para {home} vs {away}")
-                    return True
-                else:
                     logger.debug(f"      ⚠️ Sem odds disponíveis para {home} vs {away}")
-                    return False
+                    return "empty", None, None, None
+
+                payload = odds_data["results"][0]
+                payload_bytes = json_codec.dumps_bytes(payload)
+                payload_hash = hashlib.blake2b(
+                    payload_bytes, digest_size=16
+                ).hexdigest()
+
+                if payload_hash == previous_hash:
+                    logger.debug(f"      ♻️  Odds sem mudança para {home} vs {away}")
+                    return "unchanged", payload_hash, None, None
+
+                rows = self._parse_odds_rows(event_id, payload)
+                raw = (
+                    zlib.compress(payload_bytes)
+                    if settings.ODDS_STORE_RAW_PAYLOAD
+                    else None
+                )
+
+                logger.debug(
+                    f"      ✅ {len(rows)} odds coletadas para {home} vs {away}"
+                )
+                return "ok", payload_hash, rows, raw
 
             except Exception as e:
                 logger.error(
                     f"      ❌ Erro ao coletar odds para {home} vs {away}: {str(e)}"
                 )
-                return False
-
-    def _save_odds_data(self, event_id: str, odds_data: Dict):
-        """Processa e salva dados de odds INCLUINDO PLAYER ODDS"""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("DELETE FROM current_odds WHERE event_id = ?", (event_id,))
-
-            total_odds = 0
+                return "error", None, None, None
+
+    def _parse_odds_rows(self, event_id: str, odds_data: Dict) -> List[Tuple]:
+        """Fase de parse: achata o payload de prematch (INCLUINDO PLAYER ODDS) em linhas"""
+        rows = []
+
+        # Seções regulares
+        sections = ["main", "map_1", "map_2", "match", "schedule"]
+        for section in sections:
+            if section in odds_data and "sp" in odds_data[section]:
+                self._collect_section_rows(
+                    rows, event_id, section, odds_data[section]["sp"]
+                )
 
-            # Seções regulares
-            sections = ["main", "map_1", "map_2", "match", "schedule"]
-            for section in sections:
-                if section in odds_data and "sp" in odds_data[section]:
-                    total_odds += self._process_odds_section(
-                        conn, event_id, section, odds_data[section]["sp"]
+        # Processar 'others'
+        if "others" in odds_data and isinstance(odds_data["others"], list):
+            for i, other_item in enumerate(odds_data["others"]):
+                if "sp" in other_item:
+                    self._collect_section_rows(
+                        rows, event_id, f"others_{i}", other_item["sp"]
                     )
 
-            # Processar 'others'
-            if "others" in odds_data and isinstance(odds_data["others"], list):
-                for i, other_item in enumerate(odds_data["others"]):
-                    if "sp" in other_item:
-                        total_odds += self._process_odds_section(
-                            conn, event_id, f"others_{i}", other_item["sp"]
-                        )
-
-            # PROCESSAR PLAYER ODDS
-            if "player" in odds_data and "sp" in odds_data["player"]:
-                player_odds = self._process_player_odds(
-                    conn, event_id, odds_data["player"]["sp"]
-                )
-                total_odds += player_odds
-                if player_odds > 0:
-                    logger.debug(f"      🎮 {player_odds} player odds processadas")
+        # PROCESSAR PLAYER ODDS
+        if "player" in odds_data and "sp" in odds_data["player"]:
+            before = len(rows)
+            self._collect_player_rows(rows, event_id, odds_data["player"]["sp"])
+            if len(rows) > before:
+                logger.debug(f"      🎮 {len(rows) - before} player odds processadas")
 
-            conn.commit()
-            logger.debug(f"      📊 {total_odds} odds processadas")
+        return rows
 
-    def _process_player_odds(self, conn, event_id: str, player_markets: Dict) -> int:
+    def _collect_player_rows(
+        self, rows: List[Tuple], event_id: str, player_markets: Dict
+    ):
         """Processa mercados de jogadores"""
-        odds_count = 0
-
         for market_key, market_data in player_markets.items():
             if not isinstance(market_data, dict) or "odds" not in market_data:
                 continue
@@ -590,53 +1053,22 @@ class LoLOddsDatabase:
 
             for odd in market_data["odds"]:
                 if isinstance(odd, dict):
-                    try:
-                        header = odd.get("header", "")
-                        name = odd.get("name", "")
-                        selection_name = f"{header} {name}".strip() if header else name
-                        odds_value = float(odd.get("odds", 0))
-                        handicap = odd.get("handicap", "")
-
-                        if odds_value == 0:
-                            continue
-
-                        conn.execute(
-                            """
-                            INSERT INTO current_odds 
-                            (event_id, odds_type, market_name, selection_name, odds_value, handicap, raw_data)
-                            VALUES (?, ?, ?, ?, ?, ?, ?)
-                        """,
-                            (
-                                event_id,
-                                "player",  # odds_type = player
-                                market_name,
-                                selection_name,
-                                odds_value,
-                                handicap,
-                                json.dumps(odd),
-                            ),
-                        )
-
-                        odds_count += 1
-                    except Exception as e:
-                        logger.error(f"❌ Erro ao salvar player odd: {str(e)}")
-
-        return odds_count
-
-    def _process_odds_section(
-        self, conn, event_id: str, section: str, markets: Dict
-    ) -> int:
-        """Processa uma seção de mercados"""
-        odds_count = 0
+                    row = self._odd_row(event_id, "player", market_name, odd)
+                    if row is not None:
+                        rows.append(row)
 
+    def _collect_section_rows(
+        self, rows: List[Tuple], event_id: str, section: str, markets: Dict
+    ):
+        """Processa uma seção de mercados"""
         for market_key, market_data in markets.items():
             if isinstance(market_data, list):
                 market_name = f"{section}_{market_key}"
                 for odd in market_data:
                     if isinstance(odd, dict):
-                        odds_count += self._save_single_odd(
-                            conn, event_id, section, market_name, odd
-                        )
+                        row = self._odd_row(event_id, section, market_name, odd)
+                        if row is not None:
+                            rows.append(row)
                 continue
 
             if not isinstance(market_data, dict) or "odds" not in market_data:
@@ -646,51 +1078,181 @@ class LoLOddsDatabase:
 
             for odd in market_data["odds"]:
                 if isinstance(odd, dict):
-                    odds_count += self._save_single_odd(
-                        conn, event_id, section, market_name, odd
-                    )
-
-        return odds_count
-
-    def _save_single_odd(
-        self, conn, event_id: str, section: str, market_name: str, odd: Dict
-    ) -> int:
-        """Salva uma odd individual"""
+                    row = self._odd_row(event_id, section, market_name, odd)
+                    if row is not None:
+                        rows.append(row)
+
+    @staticmethod
+    def _odd_row(
+        event_id: str, odds_type: str, market_name: str, odd: Dict
+    ) -> Optional[Tuple]:
+        """Converte uma odd individual em linha de odds (None se inválida)"""
         try:
             header = odd.get("header", "")
             name = odd.get("name", "")
             selection_name = f"{header} {name}".strip() if header else name
             odds_value = float(odd.get("odds", 0))
-            handicap = odd.get("handicap", "")
+            handicap, handicap_text = LoLOddsDatabase._split_handicap(
+                odd.get("handicap")
+            )
+        except (TypeError, ValueError) as e:
+            logger.error(f"❌ Erro ao converter odd: {str(e)}")
+            return None
+
+        if odds_value == 0:
+            return None
+
+        return (
+            event_id,
+            odds_type,
+            market_name,
+            selection_name,
+            odds_value,
+            handicap,
+            handicap_text,
+        )
 
-            if odds_value == 0:
-                return 0
+    def _write_odds_batch(
+        self,
+        odds_by_event: Dict[str, List[Tuple]],
+        payloads: Optional[Dict[str, bytes]] = None,
+        ledger: Optional[List[Tuple[str, str, Optional[str]]]] = None,
+    ) -> Dict[str, int]:
+        """Fase de escrita: aplica o diff das odds de um lote de eventos em uma transação.
+
+        Compara o payload novo com as linhas gravadas (chave: mercado,
+        seleção e handicap) e grava apenas o que mudou: linhas novas, preços
+        alterados e linhas que saíram do mercado. Cada preço novo ou alterado
+        é registrado em ``odds_history``. O resultado de cada busca do lote
+        (``ledger``: event_id, resultado, hash) vai para ``odds_fetch_ledger``.
+        """
+        stats = {"inserted": 0, "updated": 0, "deleted": 0, "unchanged": 0}
+        inserts, updates, deletes, history = [], [], [], []
+
+        with self._transaction() as conn:
+            for event_id, rows in odds_by_event.items():
+                existing = {
+                    (market_id, selection_id, handicap, handicap_text): (
+                        row_id,
+                        odds_value,
+                    )
+                    for row_id, market_id, selection_id, handicap, handicap_text, odds_value in conn.execute(
+                        """
+                        SELECT id, market_id, selection_id, handicap, handicap_text, odds_value
+                        FROM odds WHERE event_id = ?
+                    """,
+                        (event_id,),
+                    )
+                }
+
+                # Em chaves repetidas no payload prevalece a última
+                incoming = {}
+                for (
+                    _,
+                    odds_type,
+                    market,
+                    selection,
+                    odds_value,
+                    handicap,
+                    handicap_text,
+                ) in rows:
+                    key = (
+                        self._market_id(conn, odds_type, market),
+                        self._selection_id(conn, selection),
+                        handicap,
+                        handicap_text,
+                    )
+                    incoming[key] = odds_value
+
+                for key, odds_value in incoming.items():
+                    current = existing.pop(key, None)
+                    if current is None:
+                        inserts.append((event_id, *key, odds_value))
+                    elif current[1] != odds_value:
+                        updates.append((odds_value, current[0]))
+                    else:
+                        stats["unchanged"] += 1
+                        continue
+                    history.append((event_id, *key, odds_value))
 
-            conn.execute(
+                deletes.extend((row_id,) for row_id, _ in existing.values())
+
+            conn.executemany(
                 """
-                INSERT INTO current_odds 
-                (event_id, odds_type, market_name, selection_name, odds_value, handicap, raw_data)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                INSERT INTO odds
+                (event_id, market_id, selection_id, handicap, handicap_text, odds_value)
+                VALUES (?, ?, ?, ?, ?, ?)
             """,
-                (
-                    event_id,
-                    section,
-                    market_name,
-                    selection_name,
-                    odds_value,
-                    handicap,
-                    json.dumps(odd),
-                ),
+                inserts,
+            )
+            conn.executemany(
+                """
+                UPDATE odds
+                SET odds_value = ?, updated_at = datetime('now')
+                WHERE id = ?
+            """,
+                updates,
+            )
+            conn.executemany("DELETE FROM odds WHERE id = ?", deletes)
+            fetched_ok = set(odds_by_event) | {
+                event_id
+                for event_id, outcome, _ in ledger or []
+                if outcome in ("ok", "unchanged")
+            }
+            conn.executemany(
+                "UPDATE events SET last_odds_fetch = strftime('%s', 'now') WHERE event_id = ?",
+                [(event_id,) for event_id in fetched_ok],
+            )
+            # O hash anterior é mantido quando a busca vem vazia ou com erro
+            conn.executemany(
+                """
+                INSERT INTO odds_fetch_ledger (event_id, fetched_at, payload_hash, outcome)
+                VALUES (?, strftime('%s', 'now'), ?, ?)
+                ON CONFLICT (event_id) DO UPDATE SET
+                    fetched_at = excluded.fetched_at,
+                    payload_hash = COALESCE(excluded.payload_hash, payload_hash),
+                    outcome = excluded.outcome
+            """,
+                [
+                    (
+                        event_id,
+                        payload_hash,
+                        "ok" if outcome == "unchanged" else outcome,
+                    )
+                    for event_id, outcome, payload_hash in ledger or []
+                ],
+            )
+            conn.executemany(
+                """
+                INSERT INTO odds_history
+                (event_id, market_id, selection_id, handicap, handicap_text, odds_value)
+                VALUES (?, ?, ?, ?, ?, ?)
+            """,
+                history,
             )
+            if payloads:
+                conn.executemany(
+                    """
+                    INSERT OR REPLACE INTO event_odds_payload (event_id, payload, updated_at)
+                    VALUES (?, ?, datetime('now'))
+                """,
+                    payloads.items(),
+                )
+            conn.commit()
 
-            return 1
-        except Exception as e:
-            logger.error(f"❌ Erro ao salvar odd: {str(e)}")
-            return 0
+        stats["inserted"] = len(inserts)
+        stats["updated"] = len(updates)
+        stats["deleted"] = len(deletes)
+        logger.debug(
+            f"      📊 {len(odds_by_event)} eventos - novas: {stats['inserted']}, "
+            f"alteradas: {stats['updated']}, removidas: {stats['deleted']}, "
+            f"iguais: {stats['unchanged']}"
+        )
+        return stats
 
     def generate_dashboard(self) -> str:
         """Gera um dashboard com estatísticas do banco"""
-        with sqlite3.connect(self.db_path) as conn:
+        with connect(self.db_path, reuse=True) as conn:
             dashboard = []
             dashboard.append("\n" + "=" * 60)
             dashboard.append("📊 DASHBOARD - LOL ODDS DATABASE")
@@ -699,7 +1261,7 @@ class LoLOddsDatabase:
             cursor = conn.execute("SELECT COUNT(*) FROM events")
             total_events = cursor.fetchone()[0]
 
-            cursor = conn.execute("SELECT COUNT(*) FROM current_odds")
+            cursor = conn.execute("SELECT COUNT(*) FROM odds")
             total_odds = cursor.fetchone()[0]
 
             cursor = conn.execute(
@@ -710,11 +1272,24 @@ class LoLOddsDatabase:
             cursor = conn.execute("SELECT COUNT(*) FROM teams")
             total_teams = cursor.fetchone()[0]
 
+            cursor = conn.execute("SELECT COUNT(*) FROM odds_history")
+            history_rows = cursor.fetchone()[0]
+
+            cursor = conn.execute(
+                "SELECT outcome, COUNT(*) FROM odds_fetch_ledger GROUP BY outcome"
+            )
+            ledger = dict(cursor.fetchall())
+
             dashboard.append(f"\n📈 ESTATÍSTICAS GERAIS:")
             dashboard.append(f"  Total de Eventos: {total_events:,}")
             dashboard.append(f"  Total de Times: {total_teams:,}")
             dashboard.append(f"  Odds Atuais: {total_odds:,}")
             dashboard.append(f"  Player Odds: {player_odds:,}")
+            dashboard.append(f"  Histórico de Preços: {history_rows:,}")
+            dashboard.append(
+                f"  Última Busca por Evento: {ledger.get('ok', 0)} ok, "
+                f"{ledger.get('empty', 0)} vazias, {ledger.get('error', 0)} com erro"
+            )
 
             if os.path.exists(self.db_path):
                 size_mb = os.path.getsize(self.db_path) / 1024 / 1024
@@ -746,7 +1321,7 @@ class LoLOddsDatabase:
                     COUNT(DISTINCT e.event_id) as total,
                     COUNT(DISTINCT co.event_id) as with_odds
                 FROM events e
-                LEFT JOIN current_odds co ON e.event_id = co.event_id
+                LEFT JOIN odds co ON e.event_id = co.event_id
                 WHERE e.status = 'upcoming'
             """
             )
@@ -769,7 +1344,7 @@ class LoLOddsDatabase:
             events_with_player_odds = cursor.fetchone()[0]
             dashboard.append(f"  Eventos com Player Odds: {events_with_player_odds}")
 
-            cursor = conn.execute("SELECT MAX(updated_at) FROM current_odds")
+            cursor = conn.execute("SELECT MAX(updated_at) FROM odds")
             last_update = cursor.fetchone()[0]
             if last_update:
                 dashboard.append(f"\n⏰ Última Atualização de Odds: {last_update}")
@@ -778,16 +1353,14 @@ class LoLOddsDatabase:
 
             return "\n".join(dashboard)
 
-    def cleanup_old_data(self, days_keep: int = 30):
-        """Remove dados antigos"""
-        cutoff_timestamp = int((datetime.now() - timedelta(days=days_keep)).timestamp())
-
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute(
-                "DELETE FROM events WHERE match_timestamp < ?", (cutoff_timestamp,)
-            )
-            deleted_events = cursor.rowcount
+    def cleanup_old_data(self, days_keep: Optional[int] = None):
+        """Move eventos antigos (odds e histórico) para os arquivos mensais"""
+        days_keep = settings.ODDS_ARCHIVE_AFTER_DAYS if days_keep is None else days_keep
+        storage = TieredStorage(self.db_path, ODDS_ARCHIVE_PLAN)
+        moved = storage.archive(datetime.now() - timedelta(days=days_keep))
 
+        with connect(self.db_path, reuse=True) as conn:
+            # Os times continuam nos arquivos (dicionário copiado a cada mês)
             cursor = conn.execute(
                 """
                 DELETE FROM teams 
@@ -799,17 +1372,24 @@ class LoLOddsDatabase:
             """
             )
             deleted_teams = cursor.rowcount
+            self._known_team_ids = None
 
             conn.commit()
 
-        with sqlite3.connect(self.db_path) as conn:
-            conn.execute("VACUUM")
+        freed_pages = storage.incremental_vacuum()
 
         logger.info(
-            f"🧹 Limpeza concluída - Removidos: {deleted_events} eventos, {deleted_teams} times"
+            f"🧹 Limpeza concluída - Arquivados: {sum(moved.values())} eventos "
+            f"({len(moved)} meses), {deleted_teams} times removidos, "
+            f"{freed_pages} páginas liberadas"
         )
 
-    async def run_update(self):
+    async def run_update(
+        self,
+        day_concurrency: Optional[int] = None,
+        queue_size: Optional[int] = None,
+        quota_share: Optional[float] = None,
+    ):
         """Executa atualização completa"""
         logger.info("=" * 60)
         logger.info("🚀 INICIANDO ATUALIZAÇÃO DO BANCO DE ODDS LOL")
@@ -819,7 +1399,9 @@ class LoLOddsDatabase:
 
         try:
             logger.info("\n📅 FASE 1: Buscando eventos...")
-            events = await self.fetch_upcoming_events(days_ahead=10)
+            events = await self.fetch_upcoming_events(
+                days_ahead=10, day_concurrency=day_concurrency
+            )
 
             if events:
                 stats = self.save_events(events)
@@ -831,16 +1413,25 @@ class LoLOddsDatabase:
 
             logger.info("\n💰 FASE 2: Atualizando odds...")
             odds_collected = await self.fetch_and_save_odds(
-                hours_old_threshold=2, batch_size=10
+                quota_share=quota_share, batch_size=10, queue_size=queue_size
             )
             logger.info(
                 f"✅ Fase 2 concluída - {odds_collected} eventos com odds atualizadas"
             )
+            logger.info(
+                f"📉 Cota da API restante nesta hora: {await self.client.remaining_quota()}"
+            )
+            cache_stats = self.client.cache_stats()
+            logger.info(
+                f"♻️  Cache da API: {cache_stats['hits']} hits / "
+                f"{cache_stats['misses']} misses "
+                f"({cache_stats['hit_rate']:.0%} de requisições economizadas)"
+            )
+            logger.info(f"🔗 Requisições duplicadas agrupadas: {self.client.coalesced}")
 
-            # 3. Limpeza (uma vez por semana)
-            if datetime.now().weekday() == 0:  # Segunda-feira
-                logger.info("\n🧹 FASE 3: Limpeza semanal...")
-                self.cleanup_old_data(days_keep=30)
+            # 3. Arquivamento (só move o que passou do corte: barato a cada execução)
+            logger.info("\n🧹 FASE 3: Arquivando eventos antigos...")
+            self.cleanup_old_data()
 
             # 4. Gerar e exibir dashboard
             dashboard = self.generate_dashboard()
@@ -862,18 +1453,54 @@ class LoLOddsDatabase:
             logger.error(f"❌ Erro durante atualização: {str(e)}", exc_info=True)
             raise
 
+        finally:
+            # Sempre, com ou sem eventos novos: reenvia também o que ficou
+            # pendente na outbox em execuções anteriores
+            try:
+                await self.telegram_notifier.flush_outbox()
+            except Exception as e:
+                logger.error(f"❌ Erro ao enviar a outbox do Telegram: {str(e)}")
+
     async def close(self):
         """Fecha conexões"""
         await self.client.close()
         logger.info("🔌 Conexões fechadas")
 
 
+def parse_args():
+    parser = argparse.ArgumentParser(description="Atualiza o banco de odds de LoL")
+    parser.add_argument(
+        "--day-concurrency",
+        type=int,
+        default=settings.DAY_FETCH_CONCURRENCY,
+        help="Quantidade de dias buscados em paralelo",
+    )
+    parser.add_argument(
+        "--queue-size",
+        type=int,
+        default=settings.ODDS_QUEUE_SIZE,
+        help="Eventos com odds aguardando gravação antes de pausar os fetchers",
+    )
+    parser.add_argument(
+        "--quota-share",
+        type=float,
+        default=settings.ODDS_QUOTA_SHARE,
+        help="Fração da cota horária da API usada para atualizar odds",
+    )
+    return parser.parse_args()
+
+
 async def main():
     """Função principal - executa atualização completa"""
+    args = parse_args()
     db = LoLOddsDatabase()
 
     try:
-        await db.run_update()
+        await db.run_update(
+            day_concurrency=args.day_concurrency,
+            queue_size=args.queue_size,
+            quota_share=args.quota_share,
+        )
     finally:
         await db.close()
 
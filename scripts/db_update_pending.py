@@ -24,6 +24,12 @@ logging.getLogger("asyncio").setLevel(logging.WARNING)
 
 # Importações reais do seu projeto
 from src.core.bet365_client import Bet365Client
+from src.core.database import (
+    LoLDatabase,
+    refresh_team_map_timeline,
+    save_map_stats,
+)
+from src.core.entity_registry import EntityRegistry
 
 # Configurar logging
 logging.basicConfig(
@@ -39,7 +45,6 @@ logger = logging.getLogger("add_missing_events")
 
 class MissingEventsAdder:
     def __init__(self):
-        self.client = Bet365Client()
         self.esports_db_path = "../data/lol_esports.db"
         self.bets_db_path = "../data/bets.db"
         self.problematic_events_file = "problematic_event_ids.json"
@@ -58,6 +63,14 @@ class MissingEventsAdder:
         logger.info(f"✅ Banco de eSports encontrado: {self.esports_db_path}")
         logger.info(f"✅ Banco de apostas encontrado: {self.bets_db_path}")
 
+        # Garante o schema atual do banco de eSports (tabela map_stats)
+        self.db = LoLDatabase()
+        self.client = Bet365Client(telemetry_db=self.db)
+
+        # Nomes de times de bets.db resolvidos por qualquer alias conhecido
+        self.registry = EntityRegistry.shared(Path(self.esports_db_path))
+        self.registry.sync_from_esports()
+
     async def add_missing_events(self):
         """Adiciona eventos faltantes ao banco de eSports"""
         logger.info("🚀 INICIANDO ADIÇÃO DE EVENTOS FALTANTES")
@@ -277,6 +290,7 @@ class MissingEventsAdder:
             # Se houver dados de mapas da API, inseri-los
             if api_data.get("time_status") == "3" and api_data.get("period_stats"):
                 self._add_map_stats(cursor, match_id, api_data["period_stats"])
+                refresh_team_map_timeline(cursor, match_id)
 
             conn.commit()
             logger.info(f"   💾 Evento {event_id} inserido como match_id {match_id}")
@@ -313,7 +327,20 @@ class MissingEventsAdder:
 
     def get_or_create_team(self, cursor, team_name):
         """Obtém ou cria um time no banco de eSports"""
-        # Primeiro, tenta encontrar o time
+        # Primeiro, pelo registro de entidades (aliases entre fontes)
+        entity_id = self.registry.resolve("team", team_name)
+        external_id = (
+            self.registry.external_id(entity_id) if entity_id is not None else None
+        )
+        if external_id is not None:
+            cursor.execute(
+                "SELECT team_id FROM teams WHERE team_id = ?", (int(external_id),)
+            )
+            team_row = cursor.fetchone()
+            if team_row:
+                return team_row[0]
+
+        # Depois, pelo nome exato
         cursor.execute(
             "SELECT team_id FROM teams WHERE name = ?",
             (team_name,),
@@ -362,35 +389,10 @@ class MissingEventsAdder:
 
         for map_number, stats in period_stats.items():
             try:
-                # Inserir mapa
-                cursor.execute(
-                    "INSERT INTO game_maps (match_id, map_number, created_at) VALUES (?, ?, ?)",
-                    (
-                        match_id,
-                        int(map_number),
-                        datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                    ),
-                )
-
-                # Obter o ID do mapa inserido
-                map_id = cursor.lastrowid
+                # Mapa + estatísticas (tipadas em map_stats, demais em map_statistics)
+                stat_count += save_map_stats(cursor, match_id, int(map_number), stats)
                 map_count += 1
 
-                # Inserir estatísticas
-                for stat_name, values in stats.items():
-                    if isinstance(values, list) and len(values) == 2:
-                        cursor.execute(
-                            "INSERT INTO map_statistics (map_id, stat_name, home_value, away_value, created_at) VALUES (?, ?, ?, ?, ?)",
-                            (
-                                map_id,
-                                stat_name,
-                                values[0],
-                                values[1],
-                                datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                            ),
-                        )
-                        stat_count += 1
-
             except (ValueError, TypeError) as e:
                 logger.warning(f"      ⚠️  Erro ao processar mapa {map_number}: {e}")
                 continue
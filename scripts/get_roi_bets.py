@@ -1,20 +1,31 @@
+import os
 import sqlite3
+import sys
 import pandas as pd
 from typing import Dict, List, Tuple, Optional
 from colorama import init, Fore, Back, Style
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.connection import connect
+from src.core.database import MAP_STATS
+from src.core.entity_registry import EntityRegistry, SOURCE_BETSAPI
+
 
 class ROIAnalyzer:
     def __init__(self, db_path: str):
         self.db_path = db_path
         self.conn = None
+        self.registry: Optional[EntityRegistry] = None
+        self.esports_conn: Optional[sqlite3.Connection] = None
+        # nome do time -> team_id de lol_esports.db (None = não resolvido)
+        self._team_ids: Dict[str, Optional[int]] = {}
         # Inicializa colorama
         init()
 
     def connect(self):
         """Conecta ao banco de dados"""
         try:
-            self.conn = sqlite3.connect(self.db_path)
+            self.conn = connect(self.db_path, reuse=True)
             return True
         except sqlite3.Error as e:
             print(f"Erro ao conectar ao banco de dados: {e}")
@@ -93,104 +104,104 @@ class ROIAnalyzer:
         finally:
             self.disconnect()
 
-    def get_team_stats(
-        self, team_name: str, stat_type: str, limit: int = 10
-    ) -> List[float]:
-        """
-        Busca estatísticas históricas reais de uma equipe do banco lol_esports.db
+    def _get_registry(self) -> EntityRegistry:
+        """Registro de entidades compartilhado, só para consulta (a sincronização
+        fica com a ingestão e scripts/sync_entity_registry.py)"""
+        if self.registry is None:
+            self.registry = EntityRegistry.shared()
+        return self.registry
+
+    def _get_esports_connection(self) -> sqlite3.Connection:
+        """Conexão com lol_esports.db reaproveitada por todas as consultas de stats"""
+        if self.esports_conn is None:
+            self.esports_conn = connect(self._get_registry().db_path)
+        return self.esports_conn
+
+    def _esports_team_id(self, entity_id: Optional[int]) -> Optional[int]:
+        if entity_id is None:
+            return None
+        external_id = self._get_registry().external_id(entity_id, SOURCE_BETSAPI)
+        return int(external_id) if external_id is not None else None
+
+    def resolve_team_id(self, team_name: str) -> Optional[int]:
+        """team_id de lol_esports.db para um nome de time (qualquer alias conhecido)"""
+        if team_name not in self._team_ids:
+            entity_id = self._get_registry().resolve("team", team_name)
+            self._team_ids[team_name] = self._esports_team_id(entity_id)
+        return self._team_ids[team_name]
+
+    def resolve_upcoming_teams(self) -> Dict[str, Optional[int]]:
+        """Resolve de uma vez todos os times dos eventos futuros de lol_odds.db.
+
+        Usa o team_id da BetsAPI de lol_odds.db e, se ele não estiver no
+        registro, o nome; o resultado fica em cache para get_team_stats.
         """
-        try:
-            # Conecta ao banco lol_esports.db
-            esports_conn = sqlite3.connect("../data/lol_esports.db")
-            cursor = esports_conn.cursor()
-
-            # 1. Busca o team_id pelo nome
-            cursor.execute(
-                "SELECT team_id, name FROM teams WHERE name = ?", (team_name,)
-            )
-            team_result = cursor.fetchone()
-
-            if not team_result:
-                esports_conn.close()
-                return self._get_fallback_stats(team_name, stat_type, limit)
-
-            team_id = team_result[0]
-
-            # 2. Busca últimas partidas do time
-            query_matches = """
-            SELECT m.match_id, m.home_team_id, m.away_team_id, m.event_time
-            FROM matches m
-            WHERE (m.home_team_id = ? OR m.away_team_id = ?)
-            AND m.time_status = 3
-            AND m.event_time >= datetime('now', '-60 days')
-            ORDER BY m.event_time DESC
-            LIMIT 30
+        registry = self._get_registry()
+        with connect(self.db_path, reuse=True) as conn:
+            teams = conn.execute(
+                """
+                SELECT DISTINCT t.team_id, t.name
+                FROM events e
+                JOIN teams t ON t.team_id IN (e.home_team_id, e.away_team_id)
+                WHERE e.status = 'upcoming'
             """
+            ).fetchall()
 
-            cursor.execute(query_matches, (team_id, team_id))
-            matches = cursor.fetchall()
+        by_name = registry.resolve_many("team", [name for _, name in teams])
+        resolved = {}
+        for team_id, name in teams:
+            entity_id = registry.resolve_external("team", team_id) or by_name.get(name)
+            resolved[name] = self._esports_team_id(entity_id)
 
-            if not matches:
-                esports_conn.close()
-                return self._get_fallback_stats(team_name, stat_type, limit)
+        self._team_ids.update(resolved)
+        missing = sorted(name for name, team_id in resolved.items() if team_id is None)
+        if missing:
+            print(
+                f"{Fore.YELLOW}⚠️ Times sem correspondência em lol_esports.db: "
+                f"{', '.join(missing)}{Style.RESET_ALL}"
+            )
+        return resolved
 
-            # 3. Busca mapas dessas partidas
-            match_ids = [str(match[0]) for match in matches]
-            placeholders = ",".join(["?"] * len(match_ids))
+    def get_team_stats(
+        self, team_name: str, stat_type: str, limit: int = 10
+    ) -> Optional[List[float]]:
+        """
+        Busca estatísticas históricas reais de uma equipe do banco lol_esports.db
 
-            query_maps = f"""
-            SELECT gm.map_id, gm.match_id, gm.map_number
-            FROM game_maps gm
-            WHERE gm.match_id IN ({placeholders})
-            ORDER BY gm.match_id DESC, gm.map_number ASC
-            """
+        Retorna None se o time não estiver no registro de entidades: sem
+        histórico, a linha não deve ser avaliada (nem com ROI 0).
+        """
+        try:
+            # 1. Resolve o team_id pelo registro de entidades (aliases entre fontes)
+            team_id = self.resolve_team_id(team_name)
 
-            cursor.execute(query_maps, match_ids)
-            all_maps = cursor.fetchall()
+            if team_id is None:
+                print(
+                    f"{Fore.YELLOW}⚠️ Time não encontrado no registro: {team_name}{Style.RESET_ALL}"
+                )
+                return None
 
-            if not all_maps:
-                esports_conn.close()
+            if stat_type not in MAP_STATS:
                 return self._get_fallback_stats(team_name, stat_type, limit)
 
-            # 4. Busca estatísticas dos mapas
-            map_ids = [str(map_data[0]) for map_data in all_maps]
-            placeholders = ",".join(["?"] * len(map_ids))
-
+            # 2. Últimos mapas do time: leitura de intervalo em team_map_timeline
+            # (chave team_id, event_time DESC), na conexão mantida entre chamadas
             query_stats = f"""
-            SELECT ms.map_id, ms.stat_name, ms.home_value, ms.away_value
-            FROM map_statistics ms
-            WHERE ms.map_id IN ({placeholders})
-            AND ms.stat_name = ?
-            ORDER BY ms.map_id DESC
+            SELECT {stat_type}_total
+            FROM team_map_timeline
+            WHERE team_id = ?
+            AND event_time >= datetime('now', '-60 days')
+            AND {stat_type}_total >= ?
+            ORDER BY event_time DESC, match_id DESC, map_number DESC
+            LIMIT ?
             """
 
-            cursor.execute(query_stats, map_ids + [stat_type])
-            all_stats = cursor.fetchall()
-
-            # 5. Processa estatísticas
-            valid_stats = []
-
-            for stat in all_stats:
-                if len(valid_stats) >= limit:
-                    break
-
-                map_id, stat_name, home_value, away_value = stat
-
-                try:
-                    home_val = float(home_value) if home_value else 0.0
-                    away_val = float(away_value) if away_value else 0.0
-                    total_value = home_val + away_val
-
-                    # Apenas para inhibitors, filtra valores = 0
-                    if stat_type == "inhibitors" and total_value == 0:
-                        continue
-
-                    valid_stats.append(total_value)
-
-                except (ValueError, TypeError):
-                    continue
-
-            esports_conn.close()
+            # Apenas para inhibitors, filtra valores = 0 (NULL = sem a estatística)
+            min_total = 1 if stat_type == "inhibitors" else 0
+            cursor = self._get_esports_connection().execute(
+                query_stats, (team_id, min_total, limit)
+            )
+            valid_stats = [float(row[0]) for row in cursor.fetchall()]
 
             if len(valid_stats) == 0:
                 return self._get_fallback_stats(team_name, stat_type, limit)
@@ -274,28 +285,39 @@ class ROIAnalyzer:
         handicap: float,
         odds: float,
         debug: bool = False,
-    ) -> Tuple[float, float]:
-        """Calcula ROI e fair_odds para um time específico"""
+    ) -> Optional[Tuple[float, float]]:
+        """Calcula ROI e fair_odds para um time específico (None se o time não
+        foi encontrado)"""
         stat_type = self._get_stat_type(selection)
         if not stat_type:
             return 0.0, 0.0
 
         team_stats = self.get_team_stats(team_name, stat_type)
+        if team_stats is None:
+            return None
         return self.calculate_roi(
             team_stats, handicap, odds, selection, debug, team_name
         )
 
     def calculate_average_roi(
         self, team1: str, team2: str, selection: str, handicap: float, odds: float
-    ) -> Tuple[float, float, float, float]:
-        """Calcula ROI e fair_odds para ambos os times"""
+    ) -> Optional[Tuple[float, float, float, float]]:
+        """Calcula ROI e fair_odds para ambos os times.
+
+        Retorna None se algum dos times não foi encontrado: a média com o ROI
+        de um só time não deve aprovar a linha.
+        """
         # Calcula para cada time
-        roi_team1, fair_odds_team1 = self.calculate_team_roi(
+        team1_roi = self.calculate_team_roi(
             team1, selection, handicap, odds, debug=True
         )
-        roi_team2, fair_odds_team2 = self.calculate_team_roi(
+        team2_roi = self.calculate_team_roi(
             team2, selection, handicap, odds, debug=True
         )
+        if team1_roi is None or team2_roi is None:
+            return None
+        roi_team1, fair_odds_team1 = team1_roi
+        roi_team2, fair_odds_team2 = team2_roi
 
         # Médias
         roi_average = (roi_team1 + roi_team2) / 2
@@ -461,9 +483,15 @@ class ROIAnalyzer:
             )
 
             # Calcula ROI e fair_odds (com debug dos dados históricos)
-            roi_team1, roi_team2, roi_average, fair_odds_average = (
-                self.calculate_average_roi(team1, team2, selection, handicap, odds)
+            average_roi = self.calculate_average_roi(
+                team1, team2, selection, handicap, odds
             )
+            if average_roi is None:
+                print(
+                    f"    {Fore.YELLOW}⚠️ Linha ignorada: time sem histórico{Style.RESET_ALL}"
+                )
+                continue
+            roi_team1, roi_team2, roi_average, fair_odds_average = average_roi
 
             # Exibe os resultados
             print(
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Migração única de lol_odds.db para o armazenamento normalizado de odds
+(dicionários de mercados/seleções, handicap numérico, visão current_odds).
+
+A migração também roda automaticamente em LoLOddsDatabase.init_database; este
+script a executa isoladamente e compacta o arquivo com VACUUM.
+
+Uso:
+    python scripts/migrate_odds_storage.py [--db data/lol_odds.db]
+"""
+
+import argparse
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from db_get_odds import LoLOddsDatabase
+
+DEFAULT_DB = Path(__file__).parent.parent / "data" / "lol_odds.db"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Normaliza o armazenamento de odds")
+    parser.add_argument("--db", type=Path, default=DEFAULT_DB)
+    args = parser.parse_args()
+
+    if not args.db.exists():
+        print(f"❌ Banco não encontrado: {args.db}")
+        return
+
+    print("🔄 MIGRAÇÃO DO ARMAZENAMENTO DE ODDS")
+    print("=" * 40)
+    size_before = args.db.stat().st_size
+
+    db = LoLOddsDatabase(db_path=args.db)
+    asyncio.run(db.close())
+
+    with sqlite3.connect(args.db) as conn:
+        conn.execute("VACUUM")
+        total_odds = conn.execute("SELECT COUNT(*) FROM odds").fetchone()[0]
+        markets = conn.execute("SELECT COUNT(*) FROM odds_markets").fetchone()[0]
+        selections = conn.execute("SELECT COUNT(*) FROM odds_selections").fetchone()[0]
+
+    size_after = args.db.stat().st_size
+    print(f"📊 {total_odds:,} odds, {markets:,} mercados, {selections:,} seleções")
+    print(
+        f"💾 Tamanho: {size_before / 1024 / 1024:.2f} MB -> "
+        f"{size_after / 1024 / 1024:.2f} MB"
+    )
+    print("✅ Migração concluída")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+Remove de map_statistics (EAV) as estatísticas já copiadas para map_stats.
+
+A migração para map_stats mantém as linhas antigas como backup; este script
+confere cada mapa (mesmo parser da migração) e apaga só as cópias que batem.
+Linhas de mapas sem registro em game_maps (órfãs) também são apagadas.
+
+Uso:
+    python scripts/purge_map_statistics.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.database import LoLDatabase
+
+
+def main():
+    purged, mismatched, orphans = LoLDatabase().purge_migrated_map_statistics()
+    print(f"🧹 {purged} mapas removidos de map_statistics")
+    if orphans:
+        print(f"🗑️ {orphans} mapas órfãos (sem game_maps) removidos")
+    if mismatched:
+        print(f"⚠️ {mismatched} mapas divergentes mantidos para conferência")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
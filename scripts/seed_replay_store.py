@@ -0,0 +1,44 @@
+#!/usr/bin/env python3
+"""
+Popula o diretório de replay da BetsAPI com os payloads já salvos no repositório
+(lol_results/*.json e data/json_backups), para benchmarks offline. Os dias mais
+recentes de lol_results também são gravados como hoje..hoje+10, o intervalo de
+upcoming consultado por db_get_odds.py.
+
+Uso:
+    python scripts/seed_replay_store.py
+    API_MODE=replay REPLAY_LATENCY_MS=150 REPLAY_ERROR_RATE=0.02 python scripts/db_get_odds.py
+"""
+
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.config.settings import settings
+from src.core.replay import ReplayStore
+
+ROOT_DIR = Path(__file__).parent.parent
+
+
+def main():
+    store = ReplayStore()
+
+    print("🎞️  POPULANDO REPLAY DA BETSAPI")
+    print("=" * 40)
+
+    results = store.seed_from_results(ROOT_DIR / "lol_results")
+    print(f"🏆 {results} resultados importados de lol_results/")
+
+    backups = 0
+    for backup_dir in {ROOT_DIR / "data" / "json_backups", settings.JSON_BACKUP_DIR}:
+        if backup_dir.exists():
+            backups += store.seed_from_backups(backup_dir)
+    print(f"💾 {backups} respostas importadas de json_backups/")
+
+    print(f"✅ Gravações disponíveis em: {store.root}")
+    print("ℹ️  Para gravar novas respostas reais execute com API_MODE=record")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Sincroniza o registro de entidades (times, ligas e jogadores) com as fontes:
+lol_esports.db, lol_odds.db e, opcionalmente, um CSV do Oracle's Elixir.
+
+Uso:
+    python scripts/sync_entity_registry.py [--oracle-csv data/database/data_transformed.csv]
+    python scripts/sync_entity_registry.py --alias "TL" --team "Team Liquid"
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.core.entity_registry import EntityRegistry
+
+ROOT_DIR = Path(__file__).parent.parent
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sincroniza o registro de entidades")
+    parser.add_argument(
+        "--odds-db", type=Path, default=ROOT_DIR / "data" / "lol_odds.db"
+    )
+    parser.add_argument("--oracle-csv", type=Path)
+    parser.add_argument("--alias", help="Novo alias a associar a --team")
+    parser.add_argument("--team", help="Nome (ou alias) conhecido do time")
+    args = parser.parse_args()
+
+    registry = EntityRegistry.shared()
+
+    print("🗂️  REGISTRO DE ENTIDADES")
+    print("=" * 40)
+
+    print(f"🏆 lol_esports.db: {registry.sync_from_esports()} novos registros")
+    if args.odds_db.exists():
+        print(f"💰 lol_odds.db: {registry.sync_from_odds(args.odds_db)} novos registros")
+    if args.oracle_csv:
+        print(
+            f"📄 {args.oracle_csv.name}: "
+            f"{registry.sync_from_oracle_csv(args.oracle_csv)} novos registros"
+        )
+
+    if args.alias and args.team:
+        entity_id = registry.resolve("team", args.team)
+        if entity_id is None:
+            print(f"❌ Time não encontrado: {args.team}")
+        else:
+            registry.add_alias("team", args.alias, entity_id, source="manual")
+            print(f"🔗 '{args.alias}' -> {registry.aliases(entity_id)}")
+
+    registry.close()
+    print("✅ Registro sincronizado")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,6 +4,11 @@ from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 import statistics
+import sys
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+from src.core.database import MAP_STATS
+from src.core.entity_registry import EntityRegistry
 
 # Variáveis globais configuráveis
 MAX_SERIES = 5  # Número de séries para análise por série
@@ -81,6 +86,28 @@ class TeamStatsAnalyzer:
 
     def __init__(self):
         self.db_path = Path(__file__).parent.parent / "data" / "lol_esports.db"
+        self.registry: Optional[EntityRegistry] = None
+
+    def resolve_team_id(self, team_name: str) -> Optional[int]:
+        """team_id pelo registro de entidades (qualquer alias conhecido do time)"""
+        if self.registry is None:
+            # Só consulta; o registro é sincronizado pela ingestão
+            self.registry = EntityRegistry.shared(self.db_path)
+        entity_id = self.registry.resolve("team", team_name)
+        if entity_id is None:
+            return None
+        external_id = self.registry.external_id(entity_id)
+        return int(external_id) if external_id is not None else None
+
+    def get_team_stats(
+        self, team_name: str, limit: int = MAX_SERIES
+    ) -> TeamStatsAnalysis:
+        """Busca estatísticas de um time pelo nome (últimas ``limit`` séries)"""
+        team_id = self.resolve_team_id(team_name)
+        if team_id is None:
+            print(f"⚠️  Time não encontrado no registro: {team_name}")
+            return self._create_empty_stats(team_name)
+        return self.get_team_stats_by_id(team_id, limit)
 
     def get_team_name_by_id(self, team_id: int) -> str:
         """Obtém o nome do time pelo ID"""
@@ -98,7 +125,9 @@ class TeamStatsAnalyzer:
             print(f"❌ Erro ao buscar nome do time {team_id}: {e}")
             return f"Time_{team_id}"
 
-    def get_team_stats_by_id(self, team_id: int) -> TeamStatsAnalysis:
+    def get_team_stats_by_id(
+        self, team_id: int, max_series: int = MAX_SERIES
+    ) -> TeamStatsAnalysis:
         """Busca estatísticas de um time pelos últimos jogos usando team_id"""
         if not self.db_path.exists():
             print(f"❌ Banco de resultados não encontrado: {self.db_path}")
@@ -137,9 +166,9 @@ class TeamStatsAnalyzer:
                     print(f"⚠️  Nenhum jogo encontrado para {team_name}")
                     return self._create_empty_stats(team_name)
 
-                # Processar jogos para estatísticas por série (últimas MAX_SERIES séries)
+                # Processar jogos para estatísticas por série (últimas max_series séries)
                 series_games = []
-                for match in matches[:MAX_SERIES]:
+                for match in matches[:max_series]:
                     is_home = team_id == match["home_team_id"]
                     opponent_id = (
                         match["away_team_id"] if is_home else match["home_team_id"]
@@ -230,68 +259,28 @@ class TeamStatsAnalyzer:
                 maps_won = maps_lost = total_maps = 0
                 result = "L"
 
-            # Buscar estatísticas detalhadas por mapa
+            # Totais da série direto de map_stats (uma linha tipada por mapa)
+            side = "home" if is_home else "away"
             cursor.execute(
-                """
+                f"""
                 SELECT 
-                    ms.stat_name,
-                    ms.home_value,
-                    ms.away_value
-                FROM game_maps gm
-                JOIN map_statistics ms ON gm.map_id = ms.map_id
-                WHERE gm.match_id = ?
-                ORDER BY gm.map_number, ms.stat_name
+                    COALESCE(SUM({side}_kills), 0) AS kills,
+                    COALESCE(SUM({side}_dragons), 0) AS dragons,
+                    COALESCE(SUM({side}_towers), 0) AS towers,
+                    COALESCE(SUM({side}_inhibitors), 0) AS inhibitors,
+                    COALESCE(SUM({side}_barons), 0) AS barons
+                FROM map_stats
+                WHERE match_id = ?
             """,
                 (match_id,),
             )
 
-            map_stats = cursor.fetchall()
-
-            # Calcular totais da série
-            team_total_kills = 0
-            team_total_dragons = 0
-            team_total_towers = 0
-            team_total_inhibitors = 0
-            team_total_barons = 0
-
-            for stat in map_stats:
-                stat_name = stat["stat_name"]
-                home_value = stat["home_value"]
-                away_value = stat["away_value"]
-
-                try:
-                    # Converter valores para inteiros
-                    home_int = (
-                        int(home_value)
-                        if home_value and home_value.replace(",", "").isdigit()
-                        else 0
-                    )
-                    away_int = (
-                        int(away_value)
-                        if away_value and away_value.replace(",", "").isdigit()
-                        else 0
-                    )
-
-                    # Atribuir valores ao time correto
-                    if is_home:
-                        team_value = home_int
-                    else:
-                        team_value = away_int
-
-                    # Acumular estatísticas
-                    if stat_name == "kills":
-                        team_total_kills += team_value
-                    elif stat_name == "dragons":
-                        team_total_dragons += team_value
-                    elif stat_name == "towers":
-                        team_total_towers += team_value
-                    elif stat_name == "inhibitors":
-                        team_total_inhibitors += team_value
-                    elif stat_name == "barons":
-                        team_total_barons += team_value
-
-                except (ValueError, TypeError):
-                    continue
+            totals = cursor.fetchone()
+            team_total_kills = totals["kills"]
+            team_total_dragons = totals["dragons"]
+            team_total_towers = totals["towers"]
+            team_total_inhibitors = totals["inhibitors"]
+            team_total_barons = totals["barons"]
 
             # Calcular médias por mapa
             maps_played = total_maps if total_maps > 0 else 1
@@ -330,60 +319,25 @@ class TeamStatsAnalyzer:
     def _get_map_stats(self, match_id: int, is_home: bool, cursor) -> List[Dict]:
         """Obtém estatísticas individuais de cada mapa para análise geral"""
         try:
+            side = "home" if is_home else "away"
+            columns = ", ".join(f"{side}_{stat} AS {stat}" for stat in MAP_STATS)
             cursor.execute(
-                """
-                SELECT 
-                    gm.map_number,
-                    ms.stat_name,
-                    ms.home_value,
-                    ms.away_value
-                FROM game_maps gm
-                JOIN map_statistics ms ON gm.map_id = ms.map_id
-                WHERE gm.match_id = ?
-                ORDER BY gm.map_number, ms.stat_name
+                f"""
+                SELECT map_number, {columns}
+                FROM map_stats
+                WHERE match_id = ?
+                ORDER BY map_number
             """,
                 (match_id,),
             )
 
-            map_stats = cursor.fetchall()
-
-            # Organizar estatísticas por mapa
+            # Um dicionário por mapa com os valores do time
             maps_data = []
-            current_map = None
-            map_data = {}
-
-            for stat in map_stats:
-                map_number = stat["map_number"]
-                stat_name = stat["stat_name"]
-                home_value = stat["home_value"]
-                away_value = stat["away_value"]
-
-                if map_number != current_map:
-                    if current_map is not None:
-                        maps_data.append(map_data)
-                    current_map = map_number
-                    map_data = {"map_number": map_number}
-
-                try:
-                    home_int = (
-                        int(home_value)
-                        if home_value and home_value.replace(",", "").isdigit()
-                        else 0
-                    )
-                    away_int = (
-                        int(away_value)
-                        if away_value and away_value.replace(",", "").isdigit()
-                        else 0
-                    )
-
-                    if is_home:
-                        map_data[stat_name] = home_int
-                    else:
-                        map_data[stat_name] = away_int
-                except (ValueError, TypeError):
-                    continue
-
-            if map_data:
+            for row in cursor.fetchall():
+                map_data = {"map_number": row["map_number"]}
+                for stat in MAP_STATS:
+                    if row[stat] is not None:
+                        map_data[stat] = row[stat]
                 maps_data.append(map_data)
 
             return maps_data
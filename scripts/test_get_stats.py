@@ -1,7 +1,12 @@
+import os
 import sqlite3
+import sys
 from typing import List, Tuple
 from colorama import init, Fore, Back, Style
 
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from src.core.database import MAP_STATS
+
 # Inicializa colorama
 init()
 
@@ -98,47 +103,27 @@ def get_team_stats_for_event(
 
         print(f"{Fore.CYAN}📊 {len(matches)} partidas encontradas{Style.RESET_ALL}")
 
-        # 3. Busca mapas dessas partidas
+        # 3. Busca a estatística dos mapas dessas partidas (uma linha por mapa)
         match_ids = [str(match[0]) for match in matches]
         placeholders = ",".join(["?"] * len(match_ids))
 
-        query_maps = f"""
-        SELECT gm.map_id, gm.match_id, gm.map_number
-        FROM game_maps gm
-        WHERE gm.match_id IN ({placeholders})
-        ORDER BY gm.match_id DESC, gm.map_number ASC
-        """
-
-        cursor.execute(query_maps, match_ids)
-        all_maps = cursor.fetchall()
-
-        print(f"{Fore.CYAN}🗺️ {len(all_maps)} mapas disponíveis{Style.RESET_ALL}")
+        if stat_type not in MAP_STATS:
+            print(f"{Fore.RED}❌ Estatística '{stat_type}' inválida{Style.RESET_ALL}")
+            esports_conn.close()
+            return []
 
-        # 4. Busca estatísticas dos mapas
-        map_ids = [str(map_data[0]) for map_data in all_maps]
-        placeholders = ",".join(["?"] * len(map_ids))
+        query_stats = f"""
+        SELECT ms.map_id, ms.home_{stat_type}, ms.away_{stat_type}
+        FROM map_stats ms
+        WHERE ms.match_id IN ({placeholders})
+        ORDER BY ms.match_id DESC, ms.map_number ASC
+        """
 
-        # Para inhibitors, precisamos também buscar os valores para validação
-        if stat_type == "inhibitors":
-            query_stats = f"""
-            SELECT ms.map_id, ms.stat_name, ms.home_value, ms.away_value
-            FROM map_statistics ms
-            WHERE ms.map_id IN ({placeholders})
-            AND ms.stat_name = ?
-            ORDER BY ms.map_id
-            """
-        else:
-            query_stats = f"""
-            SELECT ms.map_id, ms.stat_name, ms.home_value, ms.away_value
-            FROM map_statistics ms
-            WHERE ms.map_id IN ({placeholders})
-            AND ms.stat_name = ?
-            ORDER BY ms.map_id
-            """
-
-        cursor.execute(query_stats, map_ids + [stat_type])
+        cursor.execute(query_stats, match_ids)
         all_stats = cursor.fetchall()
 
+        print(f"{Fore.CYAN}🗺️ {len(all_stats)} mapas disponíveis{Style.RESET_ALL}")
+
         # 5. Processa estatísticas
         valid_stats = []
         discarded_count = 0
@@ -149,11 +134,11 @@ def get_team_stats_for_event(
             if len(valid_stats) >= limit:
                 break
 
-            map_id, stat_name, home_value, away_value = stat
+            map_id, home_value, away_value = stat
 
             try:
-                home_val = float(home_value) if home_value else 0.0
-                away_val = float(away_value) if away_value else 0.0
+                home_val = float(home_value) if home_value is not None else 0.0
+                away_val = float(away_value) if away_value is not None else 0.0
                 total_value = home_val + away_val
 
                 # Apenas para inhibitors, filtra valores = 0
@@ -208,7 +193,7 @@ def test_event_stats(event_id: str):
     )
 
     # Stats para testar
-    stats = ["kills", "dragons", "barons", "towers", "inhibitors"]
+    stats = list(MAP_STATS)
 
     results = {}
 
@@ -262,12 +247,11 @@ def test_inhibitors_investigation():
 
         # Busca todos os mapas recentes e suas stats de inhibitors
         query = """
-        SELECT ms.map_id, ms.home_value, ms.away_value,
-               gm.match_id, gm.map_number
-        FROM map_statistics ms
-        JOIN game_maps gm ON ms.map_id = gm.map_id
-        WHERE ms.stat_name = 'inhibitors'
-        ORDER BY gm.match_id DESC, gm.map_number ASC
+        SELECT ms.map_id, ms.home_inhibitors, ms.away_inhibitors,
+               ms.match_id, ms.map_number
+        FROM map_stats ms
+        WHERE ms.home_inhibitors IS NOT NULL OR ms.away_inhibitors IS NOT NULL
+        ORDER BY ms.match_id DESC, ms.map_number ASC
         LIMIT 20
         """
 
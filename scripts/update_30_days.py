@@ -4,10 +4,14 @@ Script para atualizar os últimos 30 dias, verificando duplicatas
 Versão com logging otimizado para reduzir poluição
 """
 
+import argparse
 import asyncio
 import sys
 import sqlite3
 import logging
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
 from pathlib import Path
 
@@ -21,8 +25,14 @@ logging.getLogger("anyio").setLevel(logging.WARNING)
 logging.getLogger("asyncio").setLevel(logging.WARNING)
 
 # Importações reais do seu projeto
+from src.config.settings import settings
 from src.core.bet365_client import Bet365Client
-from src.core.database import LoLDatabase  # Assumindo que esta classe existe
+from src.core.database import (
+    LoLDatabase,
+    refresh_team_map_timeline,
+    save_map_stats,
+)
+from src.core.entity_registry import EntityRegistry
 
 # Configurar logging com mais detalhes
 logging.basicConfig(
@@ -39,83 +49,186 @@ logger = logging.getLogger("database_updater")
 class DatabaseUpdater:
     def __init__(self):
         self.db = LoLDatabase()
-        self.client = Bet365Client()
+        self.client = Bet365Client(telemetry_db=self.db)
         self.lol_sport_id = 151
 
-    async def update_last_days(self, days_back=30):
-        """Atualiza os últimos X dias, verificando duplicatas"""
+    async def update_last_days(
+        self, days_back=30, day_concurrency=None, concurrency=None, batch_size=None
+    ):
+        """Atualiza os últimos X dias, verificando duplicatas.
+
+        Os ``result()`` de todos os dias são buscados por um pool limitado a
+        ``concurrency`` requisições simultâneas; uma única conexão de escrita
+        (thread dedicada) grava os eventos em transações de até
+        ``batch_size`` eventos. O resumo de cada dia sai quando todos os
+        eventos dele terminam.
+        """
+        day_concurrency = day_concurrency or settings.DAY_FETCH_CONCURRENCY
+        concurrency = concurrency or settings.RESULT_FETCH_CONCURRENCY
+        batch_size = batch_size or settings.RESULT_WRITE_BATCH
         logger.info(f"🚀 INICIANDO ATUALIZAÇÃO DOS ÚLTIMOS {days_back} DIAS")
+        logger.info(f"   ⚡ {day_concurrency} dias buscados em paralelo")
+        logger.info(
+            f"   ⚡ {concurrency} resultados simultâneos, gravação em lotes de {batch_size}"
+        )
         logger.info("=" * 60)
 
-        total_processed = 0
-        total_new = 0
-        total_updated = 0
-        total_skipped = 0
-        total_errors = 0
-
-        for i in range(days_back):
-            target_date = datetime.now() - timedelta(days=i)
-            day_str = target_date.strftime("%Y%m%d")
-            formatted_date = target_date.strftime("%Y-%m-%d")
+        start_time = time.perf_counter()
+        totals = Counter()
+        day_stats = {}
+        day_pending = {}
+
+        def record(day, event_id, status):
+            """Contabiliza o evento no dia e no total; fecha o dia se for o último"""
+            day_stats[day][status] += 1
+            totals[status] += 1
+            if status == "new":
+                logger.info(f"   ✅ NOVO EVENTO ADICIONADO: {event_id}")
+            elif status == "updated":
+                logger.info(f"   🔄 EVENTO ATUALIZADO: {event_id}")
+            elif status == "skipped":
+                logger.info(f"   ⏭️  EVENTO PULADO: {event_id}")
+            else:
+                logger.error(f"   ❌ ERRO NO EVENTO: {event_id}")
+
+            day_pending[day] -= 1
+            if day_pending[day] == 0:
+                self._log_day_summary(day, day_stats[day])
+
+        # Busca os dias em paralelo (limitado); o processamento segue a ordem
+        # dos dias e começa assim que o dia corrente estiver disponível
+        semaphore = asyncio.Semaphore(day_concurrency)
+        fetch_semaphore = asyncio.Semaphore(concurrency)
+        queue: asyncio.Queue = asyncio.Queue(maxsize=concurrency * 2)
+        loop = asyncio.get_running_loop()
+        writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="results_writer")
+        # A conexão é criada e usada só na thread de escrita
+        writer_conn = await loop.run_in_executor(writer, self.db.get_connection)
+
+        async def fetch_day(day_str):
+            async with semaphore:
+                return await self.get_events_for_day(day_str)
+
+        async def fetch_result(day, event, action):
+            event_id = event.get("id")
+            async with fetch_semaphore:
+                result = await self.fetch_result(event_id, action)
+            if result is None:
+                record(day, event_id, "error")
+            else:
+                # Bloqueia quando a fila está cheia (backpressure)
+                await queue.put((day, event, action, result))
+
+        async def consumer():
+            finished = False
+            while not finished:
+                item = await queue.get()
+                if item is None:
+                    break
+
+                # Agrupa o que já estiver na fila em uma única transação
+                batch = [item]
+                while len(batch) < batch_size:
+                    try:
+                        item = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
+                    if item is None:
+                        finished = True
+                        break
+                    batch.append(item)
+
+                try:
+                    statuses = await loop.run_in_executor(
+                        writer, self.write_results_batch, writer_conn, batch
+                    )
+                except Exception as e:
+                    logger.error(f"   ❌ Erro ao gravar {len(batch)} eventos: {e}")
+                    statuses = ["error"] * len(batch)
+                for (day, event, _, _), status in zip(batch, statuses):
+                    record(day, event.get("id"), status)
+
+        today = datetime.now()
+        target_dates = [today - timedelta(days=i) for i in range(days_back)]
+
+        # Partidas já gravadas na janela (com um dia de folga em cada ponta)
+        window_start = today.replace(hour=0, minute=0, second=0, microsecond=0)
+        known = self.load_known_matches(
+            window_start - timedelta(days=days_back),
+            window_start + timedelta(days=2),
+        )
+        planned = set()
+        logger.info(f"   🗂️  {len(known)} partidas já gravadas na janela")
+        day_tasks = [
+            asyncio.create_task(fetch_day(target_date.strftime("%Y%m%d")))
+            for target_date in target_dates
+        ]
+
+        consumer_task = asyncio.create_task(consumer())
+        result_tasks = []
+        try:
+            for i, (target_date, day_task) in enumerate(zip(target_dates, day_tasks)):
+                formatted_date = target_date.strftime("%Y-%m-%d")
 
-            logger.info(f"📅 PROCESSANDO DIA: {formatted_date} ({i + 1}/{days_back})")
+                # Buscar eventos de LoL do dia
+                lol_events = await day_task
+                logger.info(
+                    f"📅 PROCESSANDO DIA: {formatted_date} ({i + 1}/{days_back})"
+                )
+                if not lol_events:
+                    logger.info(
+                        f"   ℹ️  Nenhum evento encontrado para {formatted_date}"
+                    )
+                    continue
 
-            # Buscar eventos do dia
-            events = await self.get_events_for_day(day_str)
-            if not events:
-                logger.info(f"   ℹ️  Nenhum evento encontrado para {formatted_date}")
-                continue
+                logger.info(f"   🎯 {len(lol_events)} jogos de LoL encontrados")
+                day_stats[formatted_date] = Counter()
+                day_pending[formatted_date] = len(lol_events)
 
-            # Filtrar apenas LoL
-            lol_events = [event for event in events if self.is_lol_event(event)]
-            logger.info(f"   🎯 {len(lol_events)} jogos de LoL encontrados")
+                for event in lol_events:
+                    event_id = event.get("id")
+                    home_team = event.get("home", {}).get("name", "Desconhecido")
+                    away_team = event.get("away", {}).get("name", "Desconhecido")
+                    league = event.get("league", {}).get("name", "Desconhecida")
 
-            day_processed = 0
-            day_new = 0
-            day_updated = 0
-            day_errors = 0
+                    logger.info(
+                        f"   ⚔️  Processando: {home_team} vs {away_team} ({league}) - ID: {event_id}"
+                    )
 
-            for event in lol_events:
-                event_id = event.get("id")
-                home_team = event.get("home", {}).get("name", "Desconhecido")
-                away_team = event.get("away", {}).get("name", "Desconhecido")
-                league = event.get("league", {}).get("name", "Desconhecida")
+                    # O mesmo evento pode aparecer em mais de um dia (remarcado)
+                    if event_id in planned:
+                        action = "skipped"
+                    else:
+                        planned.add(event_id)
+                        action = self.plan_event(event, known)
+                    if action in ("new", "update"):
+                        result_tasks.append(
+                            asyncio.create_task(
+                                fetch_result(formatted_date, event, action)
+                            )
+                        )
+                    else:
+                        record(formatted_date, event_id, action)
 
-                logger.info(
-                    f"   ⚔️  Processando: {home_team} vs {away_team} ({league}) - ID: {event_id}"
-                )
+            results = await asyncio.gather(*result_tasks, return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    logger.error(f"   ❌ Erro em tarefa: {result}")
+        finally:
+            await queue.put(None)
+            await consumer_task
+            await loop.run_in_executor(writer, writer_conn.close)
+            writer.shutdown(wait=True)
 
-                result = await self.process_event(event)
-                if result == "new":
-                    day_new += 1
-                    total_new += 1
-                    logger.info(f"   ✅ NOVO EVENTO ADICIONADO: {event_id}")
-                elif result == "updated":
-                    day_updated += 1
-                    total_updated += 1
-                    logger.info(f"   🔄 EVENTO ATUALIZADO: {event_id}")
-                elif result == "skipped":
-                    total_skipped += 1
-                    logger.info(f"   ⏭️  EVENTO PULADO: {event_id}")
-                elif result == "error":
-                    day_errors += 1
-                    total_errors += 1
-                    logger.error(f"   ❌ ERRO NO EVENTO: {event_id}")
-
-                day_processed += 1
-                total_processed += 1
-
-            logger.info(f"   📊 RESUMO DO DIA {formatted_date}:")
-            logger.info(f"      ➕ Novos: {day_new}")
-            logger.info(f"      🔄 Atualizados: {day_updated}")
-            logger.info(
-                f"      ⏭️  Pulados: {day_processed - day_new - day_updated - day_errors}"
-            )
-            logger.info(f"      ❌ Erros: {day_errors}")
-            logger.info(f"      📋 Total processado: {day_processed}")
+        # Times e ligas novos entram no registro de entidades usado pelas análises
+        try:
+            added = EntityRegistry.shared(Path(self.db.db_path)).sync_from_esports()
+            logger.info(f"🗂️  Registro de entidades: {added} novos registros")
+        except Exception as e:
+            logger.error(f"❌ Erro ao sincronizar o registro de entidades: {e}")
 
-            # Pequena pausa para não sobrecarregar a API
-            await asyncio.sleep(1)
+        elapsed = time.perf_counter() - start_time
+        total_processed = sum(totals.values())
 
         # Relatório final
         logger.info("=" * 60)
@@ -123,122 +236,137 @@ class DatabaseUpdater:
         logger.info("📊 RELATÓRIO FINAL:")
         logger.info(f"   📅 Período: {days_back} dias")
         logger.info(f"   📋 Total de eventos processados: {total_processed}")
-        logger.info(f"   ➕ Novos eventos: {total_new}")
-        logger.info(f"   🔄 Eventos atualizados: {total_updated}")
-        logger.info(f"   ⏭️  Eventos pulados: {total_skipped}")
-        logger.info(f"   ❌ Erros: {total_errors}")
+        logger.info(f"   ➕ Novos eventos: {totals['new']}")
+        logger.info(f"   🔄 Eventos atualizados: {totals['updated']}")
+        logger.info(f"   ⏭️  Eventos pulados: {totals['skipped']}")
+        logger.info(f"   ❌ Erros: {totals['error']}")
+        logger.info(f"   ⏱️  Tempo: {elapsed:.1f}s")
+        cache_stats = self.client.cache_stats()
+        logger.info(
+            f"   ♻️  Cache da API: {cache_stats['hits']} hits / {cache_stats['misses']} misses"
+        )
         logger.info("=" * 60)
+        return dict(totals)
+
+    def _log_day_summary(self, formatted_date, stats):
+        logger.info(f"   📊 RESUMO DO DIA {formatted_date}:")
+        logger.info(f"      ➕ Novos: {stats['new']}")
+        logger.info(f"      🔄 Atualizados: {stats['updated']}")
+        logger.info(f"      ⏭️  Pulados: {stats['skipped']}")
+        logger.info(f"      ❌ Erros: {stats['error']}")
+        logger.info(f"      📋 Total processado: {sum(stats.values())}")
 
     async def get_events_for_day(self, day_str):
-        """Busca eventos de um dia específico"""
+        """Busca os eventos de LoL de um dia específico (todas as páginas)"""
+        logger.info(f"   🔍 Buscando eventos para o dia {day_str}...")
+        total_events = 0
+        lol_events = []
         try:
-            logger.info(f"   🔍 Buscando eventos para o dia {day_str}...")
-            events_data = await self.client.upcoming(
+            # Filtra LoL conforme as páginas chegam
+            async for event in self.client.upcoming_all(
                 sport_id=self.lol_sport_id, day=day_str
+            ):
+                total_events += 1
+                if self.is_lol_event(event):
+                    lol_events.append(event)
+        except Exception as e:
+            # Mantém os eventos das páginas que já chegaram
+            logger.error(
+                f"   ❌ Erro ao buscar eventos para {day_str} "
+                f"({total_events} já recebidos): {e}"
             )
+            return lol_events
 
-            if events_data and events_data.get("success") == 1:
-                events = events_data.get("results", [])
-                logger.info(
-                    f"   ✅ {len(events)} eventos encontrados para o dia {day_str}"
-                )
-                return events
-            else:
-                logger.warning(f"   ⚠️  Nenhum dado retornado para o dia {day_str}")
-                return []
-
-        except Exception as e:
-            logger.error(f"   ❌ Erro ao buscar eventos para {day_str}: {e}")
-            return []
+        logger.info(
+            f"   ✅ {total_events} eventos encontrados para o dia {day_str}"
+        )
+        return lol_events
 
     def is_lol_event(self, event):
         """Filtra apenas eventos de LoL"""
         league_name = event.get("league", {}).get("name", "").strip()
         return league_name.startswith("LOL -")
 
-    def event_exists(self, event_id):
-        """Verifica se o evento já existe no banco"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        cursor.execute("SELECT 1 FROM matches WHERE bet365_id = ?", (event_id,))
-        exists = cursor.fetchone() is not None
+    def load_known_matches(self, start, end):
+        """Snapshot das partidas já gravadas na janela, em uma única consulta.
 
-        conn.close()
-        return exists
-
-    def needs_update(self, event_id):
-        """Verifica se o evento precisa ser atualizado"""
+        Retorna ``bet365_id -> (match_id, time_status, retrieved_at)`` com
+        ``retrieved_at`` já convertido para datetime (ou None).
+        """
         conn = self.db.get_connection()
-        cursor = conn.cursor()
-
-        # Buscar informações atuais do evento
-        cursor.execute(
-            """
-            SELECT time_status, retrieved_at 
-            FROM matches 
-            WHERE bet365_id = ?
-            """,
-            (event_id,),
-        )
-        result = cursor.fetchone()
+        try:
+            cursor = conn.execute(
+                """
+                SELECT bet365_id, match_id, time_status, retrieved_at
+                FROM matches
+                WHERE event_time >= ? AND event_time < ?
+                """,
+                (
+                    start.strftime("%Y-%m-%d %H:%M:%S"),
+                    end.strftime("%Y-%m-%d %H:%M:%S"),
+                ),
+            )
+            return {str(row[0]): self._known_match(row) for row in cursor}
+        finally:
+            conn.close()
 
-        if not result:
+    def lookup_known_match(self, event_id):
+        """Partida pelo bet365_id, para eventos fora da janela do snapshot"""
+        conn = self.db.get_connection()
+        try:
+            row = conn.execute(
+                """
+                SELECT bet365_id, match_id, time_status, retrieved_at
+                FROM matches
+                WHERE bet365_id = ?
+                """,
+                (str(event_id),),
+            ).fetchone()
+            return self._known_match(row) if row else None
+        finally:
             conn.close()
-            return False
 
-        time_status, retrieved_at = result
+    @staticmethod
+    def _known_match(row):
+        _, match_id, time_status, retrieved_at = row
+        try:
+            # Aceita com e sem frações de segundo
+            retrieved_at = (
+                datetime.fromisoformat(retrieved_at) if retrieved_at else None
+            )
+        except (ValueError, TypeError):
+            retrieved_at = None
+        return (match_id, time_status, retrieved_at)
+
+    def needs_update(self, event_id, known_match):
+        """Verifica se o evento (já gravado) precisa ser atualizado"""
+        _, time_status, retrieved_at = known_match
 
         # Se o evento está finalizado, não precisa atualizar
         if time_status == 3:
             logger.info(
                 f"   ⏭️  Evento {event_id} está finalizado, não precisa atualizar"
             )
-            conn.close()
             return False
 
-        # Verificar quando foi a última atualização
-        if retrieved_at:
-            try:
-                # Converter para datetime, lidando com diferentes formatos
-                if isinstance(retrieved_at, str):
-                    # Tentar parsear com frações de segundo
-                    try:
-                        last_update = datetime.strptime(
-                            retrieved_at, "%Y-%m-%d %H:%M:%S.%f"
-                        )
-                    except ValueError:
-                        # Tentar parsear sem frações de segundo
-                        last_update = datetime.strptime(
-                            retrieved_at, "%Y-%m-%d %H:%M:%S"
-                        )
-                else:
-                    last_update = retrieved_at
-
-                time_since_update = datetime.now() - last_update
-
-                # Atualizar apenas se passou mais de 1 hora da última atualização
-                if time_since_update.total_seconds() < 10:
-                    logger.info(
-                        f"   ⏭️  Evento {event_id} atualizado recentemente, não precisa atualizar"
-                    )
-                    conn.close()
-                    return False
-
-            except (ValueError, TypeError) as e:
-                logger.warning(
-                    f"   ⚠️  Erro ao analisar data de atualização do evento {event_id}: {e}"
+        # Verificar quando foi a última atualização (None = data inválida: atualiza)
+        if retrieved_at is not None:
+            time_since_update = datetime.now() - retrieved_at
+            if time_since_update.total_seconds() < 10:
+                logger.info(
+                    f"   ⏭️  Evento {event_id} atualizado recentemente, não precisa atualizar"
                 )
-                # Em caso de erro, assumir que precisa atualizar
-                conn.close()
-                return True
+                return False
 
-        conn.close()
         logger.info(f"   ✅ Evento {event_id} precisa ser atualizado")
         return True
 
-    async def process_event(self, event):
-        """Processa um evento e retorna o status"""
+    def plan_event(self, event, known):
+        """Decide o que fazer com o evento: 'new', 'update', 'skipped' ou 'error'.
+
+        ``known`` é o snapshot de ``load_known_matches``; só eventos fora dele
+        são conferidos no banco (pelo bet365_id), nunca na API.
+        """
         event_id = event.get("id")
 
         if not event_id:
@@ -246,201 +374,182 @@ class DatabaseUpdater:
             return "error"
 
         # Verificar se já existe
-        if self.event_exists(event_id):
-            if self.needs_update(event_id):
-                # Evento existe mas precisa ser atualizado
-                return await self.update_existing_event(event)
-            else:
-                # Evento já existe e não precisa ser atualizado
-                return "skipped"
-        else:
-            # Novo evento
-            return await self.process_new_event(event)
-
-    async def process_new_event(self, event):
-        """Processa um novo evento"""
-        event_id = event.get("id")
-
+        known_match = known.get(str(event_id))
+        if known_match is None:
+            # event_time fora da janela (ex.: partida remarcada)
+            known_match = self.lookup_known_match(event_id)
+            if known_match is not None:
+                known[str(event_id)] = known_match
+        if known_match is not None:
+            # Evento existe: só busca de novo se precisar ser atualizado
+            return "update" if self.needs_update(event_id, known_match) else "skipped"
+        # Novo evento
+        return "new"
+
+    async def fetch_result(self, event_id, action):
+        """Busca o resultado do evento; None em caso de erro"""
         try:
-            logger.info(f"   📥 Buscando detalhes do novo evento {event_id}...")
-            result_data = await self.client.result(event_id)
-            if result_data and result_data.get("success") == 1:
-                result = result_data.get("results", [{}])[0]
-                success = self.save_event(event, result)
-                if success:
-                    return "new"
-                else:
-                    return "error"
+            if action == "new":
+                logger.info(f"   📥 Buscando detalhes do novo evento {event_id}...")
             else:
-                logger.error(f"   ❌ Erro ao buscar detalhes do evento {event_id}")
-                return "error"
-        except Exception as e:
-            logger.error(f"   ❌ Erro ao processar novo evento {event_id}: {e}")
-            return "error"
-
-    async def update_existing_event(self, event):
-        """Atualiza um evento existente"""
-        event_id = event.get("id")
-
-        try:
-            logger.info(f"   📥 Buscando detalhes para atualizar evento {event_id}...")
+                logger.info(
+                    f"   📥 Buscando detalhes para atualizar evento {event_id}..."
+                )
             result_data = await self.client.result(event_id)
             if result_data and result_data.get("success") == 1:
-                result = result_data.get("results", [{}])[0]
-                success = self.update_event(event, result)
-                if success:
-                    return "updated"
-                else:
-                    return "error"
-            else:
-                logger.error(
-                    f"   ❌ Erro ao buscar detalhes para atualizar evento {event_id}"
-                )
-                return "error"
+                return result_data.get("results", [{}])[0]
+            logger.error(f"   ❌ Erro ao buscar detalhes do evento {event_id}")
         except Exception as e:
-            logger.error(f"   ❌ Erro ao atualizar evento {event_id}: {e}")
-            return "error"
+            logger.error(f"   ❌ Erro ao buscar resultado do evento {event_id}: {e}")
+        return None
 
-    def save_event(self, event, result):
-        """Salva um novo evento no banco"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
+    def write_results_batch(self, conn, batch):
+        """Grava um lote de (dia, evento, ação, resultado) em uma transação.
 
+        Cada evento fica em um SAVEPOINT: uma falha desfaz só aquele evento.
+        Retorna o status de cada item ('new', 'updated' ou 'error').
+        """
+        cursor = conn.cursor()
+        statuses = []
+        cursor.execute("BEGIN")
         try:
-            # 1. Salvar liga
-            league_name = event.get("league", {}).get("name")
-            league_id = event.get("league", {}).get("id")
-
-            if league_id and league_name:
-                cursor.execute(
-                    "INSERT OR IGNORE INTO leagues (league_id, name) VALUES (?, ?)",
-                    (league_id, league_name),
-                )
-
-            # 2. Salvar times
-            home_team = event.get("home", {})
-            away_team = event.get("away", {})
-
-            if home_team.get("id"):
-                cursor.execute(
-                    "INSERT OR IGNORE INTO teams (team_id, name, image_id, country_code) VALUES (?, ?, ?, ?)",
-                    (
-                        home_team.get("id"),
-                        home_team.get("name"),
-                        home_team.get("image_id"),
-                        home_team.get("cc"),
-                    ),
-                )
+            for _, event, action, result in batch:
+                cursor.execute("SAVEPOINT event_write")
+                try:
+                    if action == "new":
+                        self.save_event(cursor, event, result)
+                        statuses.append("new")
+                    else:
+                        self.update_event(cursor, event, result)
+                        statuses.append("updated")
+                    cursor.execute("RELEASE event_write")
+                except Exception as e:
+                    cursor.execute("ROLLBACK TO event_write")
+                    cursor.execute("RELEASE event_write")
+                    logger.error(f"   ❌ Erro ao gravar evento {event.get('id')}: {e}")
+                    statuses.append("error")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return statuses
 
-            if away_team.get("id"):
-                cursor.execute(
-                    "INSERT OR IGNORE INTO teams (team_id, name, image_id, country_code) VALUES (?, ?, ?, ?)",
-                    (
-                        away_team.get("id"),
-                        away_team.get("name"),
-                        away_team.get("image_id"),
-                        away_team.get("cc"),
-                    ),
-                )
+    def save_event(self, cursor, event, result):
+        """Salva um novo evento no banco (sem commit)"""
+        # 1. Salvar liga
+        league_name = event.get("league", {}).get("name")
+        league_id = event.get("league", {}).get("id")
 
-            # 3. Salvar jogo principal
-            event_time = (
-                datetime.fromtimestamp(int(event.get("time")))
-                if event.get("time")
-                else datetime.now()
+        if league_id and league_name:
+            cursor.execute(
+                "INSERT OR IGNORE INTO leagues (league_id, name) VALUES (?, ?)",
+                (league_id, league_name),
             )
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[
-                :-3
-            ]  # Formato com milissegundos
 
+        # 2. Salvar times
+        home_team = event.get("home", {})
+        away_team = event.get("away", {})
+
+        if home_team.get("id"):
             cursor.execute(
-                """
-                INSERT INTO matches 
-                (bet365_id, sport_id, league_id, home_team_id, away_team_id, 
-                 event_time, time_status, final_score, retrieved_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                """,
+                "INSERT OR IGNORE INTO teams (team_id, name, image_id, country_code) VALUES (?, ?, ?, ?)",
                 (
-                    event.get("id"),
-                    event.get("sport_id"),
-                    event.get("league", {}).get("id"),
                     home_team.get("id"),
+                    home_team.get("name"),
+                    home_team.get("image_id"),
+                    home_team.get("cc"),
+                ),
+            )
+
+        if away_team.get("id"):
+            cursor.execute(
+                "INSERT OR IGNORE INTO teams (team_id, name, image_id, country_code) VALUES (?, ?, ?, ?)",
+                (
                     away_team.get("id"),
-                    event_time,
-                    event.get("time_status"),
-                    result.get("ss"),
-                    current_time,
+                    away_team.get("name"),
+                    away_team.get("image_id"),
+                    away_team.get("cc"),
                 ),
             )
 
-            # Obter o ID do jogo inserido
-            match_id = cursor.lastrowid
+        # 3. Salvar jogo principal
+        event_time = (
+            datetime.fromtimestamp(int(event.get("time")))
+            if event.get("time")
+            else datetime.now()
+        )
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[
+            :-3
+        ]  # Formato com milissegundos
 
-            # 4. Salvar mapas e estatísticas
-            self._save_map_stats(cursor, match_id, result)
+        cursor.execute(
+            """
+            INSERT INTO matches 
+            (bet365_id, sport_id, league_id, home_team_id, away_team_id, 
+             event_time, time_status, final_score, retrieved_at)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """,
+            (
+                event.get("id"),
+                event.get("sport_id"),
+                event.get("league", {}).get("id"),
+                home_team.get("id"),
+                away_team.get("id"),
+                event_time,
+                event.get("time_status"),
+                result.get("ss"),
+                current_time,
+            ),
+        )
 
-            conn.commit()
-            logger.info(
-                f"   💾 Evento {event.get('id')} salvo com sucesso no banco de dados"
-            )
-            return True
+        # Obter o ID do jogo inserido
+        match_id = cursor.lastrowid
 
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"   ❌ Erro ao salvar evento {event.get('id')}: {e}")
-            return False
-        finally:
-            conn.close()
+        # 4. Salvar mapas e estatísticas (e a linha do tempo dos times)
+        self._save_map_stats(cursor, match_id, result)
+        refresh_team_map_timeline(cursor, match_id)
 
-    def update_event(self, event, result):
-        """Atualiza um evento existente"""
-        conn = self.db.get_connection()
-        cursor = conn.cursor()
+        logger.info(
+            f"   💾 Evento {event.get('id')} salvo com sucesso no banco de dados"
+        )
 
-        try:
-            # Atualizar informações principais
-            current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[
-                :-3
-            ]  # Formato com milissegundos
+    def update_event(self, cursor, event, result):
+        """Atualiza um evento existente (sem commit)"""
+        # Atualizar informações principais
+        current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S.%f")[
+            :-3
+        ]  # Formato com milissegundos
 
-            cursor.execute(
-                """
-                UPDATE matches 
-                SET time_status = ?, final_score = ?, retrieved_at = ?
-                WHERE bet365_id = ?
-                """,
-                (
-                    event.get("time_status"),
-                    result.get("ss"),
-                    current_time,
-                    event.get("id"),
-                ),
-            )
+        cursor.execute(
+            """
+            UPDATE matches 
+            SET time_status = ?, final_score = ?, retrieved_at = ?
+            WHERE bet365_id = ?
+            """,
+            (
+                event.get("time_status"),
+                result.get("ss"),
+                current_time,
+                event.get("id"),
+            ),
+        )
 
+        cursor.execute(
+            "SELECT match_id FROM matches WHERE bet365_id = ?",
+            (event.get("id"),),
+        )
+        match_row = cursor.fetchone()
+        if match_row:
+            match_id = match_row[0]
             # Se o jogo foi finalizado, salvar estatísticas completas
             if result.get("time_status") == "3":
-                # Obter match_id
-                cursor.execute(
-                    "SELECT match_id FROM matches WHERE bet365_id = ?",
-                    (event.get("id"),),
-                )
-                match_row = cursor.fetchone()
-                if match_row:
-                    match_id = match_row[0]
-                    self._save_map_stats(cursor, match_id, result)
-
-            conn.commit()
-            logger.info(
-                f"   💾 Evento {event.get('id')} atualizado com sucesso no banco de dados"
-            )
-            return True
+                self._save_map_stats(cursor, match_id, result)
+            # Status pode ter mudado: regravar a linha do tempo dos times
+            refresh_team_map_timeline(cursor, match_id)
 
-        except Exception as e:
-            conn.rollback()
-            logger.error(f"   ❌ Erro ao atualizar evento {event.get('id')}: {e}")
-            return False
-        finally:
-            conn.close()
+        logger.info(
+            f"   💾 Evento {event.get('id')} atualizado com sucesso no banco de dados"
+        )
 
     def _save_map_stats(self, cursor, match_id, result):
         """Salva estatísticas de mapas (método auxiliar)"""
@@ -454,24 +563,9 @@ class DatabaseUpdater:
 
         for map_number, stats in period_stats.items():
             try:
-                # Salvar mapa
-                cursor.execute(
-                    "INSERT OR REPLACE INTO game_maps (match_id, map_number) VALUES (?, ?)",
-                    (match_id, int(map_number)),
-                )
-
-                # Obter o ID do mapa
-                map_id = cursor.lastrowid
+                # Mapa + estatísticas (tipadas em map_stats, demais em map_statistics)
+                stat_count += save_map_stats(cursor, match_id, int(map_number), stats)
                 map_count += 1
-
-                # Salvar estatísticas
-                for stat_name, values in stats.items():
-                    if isinstance(values, list) and len(values) == 2:
-                        cursor.execute(
-                            "INSERT OR REPLACE INTO map_statistics (map_id, stat_name, home_value, away_value) VALUES (?, ?, ?, ?)",
-                            (map_id, stat_name, values[0], values[1]),
-                        )
-                        stat_count += 1
             except (ValueError, TypeError) as e:
                 logger.warning(f"   ⚠️  Erro ao processar mapa {map_number}: {e}")
                 continue
@@ -481,14 +575,44 @@ class DatabaseUpdater:
         )
 
 
+def parse_args(default_days=30):
+    parser = argparse.ArgumentParser(description="Atualiza resultados dos últimos dias")
+    parser.add_argument("--days", type=int, default=default_days)
+    parser.add_argument(
+        "--day-concurrency",
+        type=int,
+        default=settings.DAY_FETCH_CONCURRENCY,
+        help="Quantidade de dias buscados em paralelo",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.RESULT_FETCH_CONCURRENCY,
+        help="Resultados (result) buscados em paralelo",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=settings.RESULT_WRITE_BATCH,
+        help="Eventos gravados por transação",
+    )
+    return parser.parse_args()
+
+
 async def main():
-    logger.info("🎯 INICIANDO ATUALIZADOR DOS ÚLTIMOS 30 DIAS")
+    args = parse_args()
+    logger.info(f"🎯 INICIANDO ATUALIZADOR DOS ÚLTIMOS {args.days} DIAS")
     logger.info("=" * 60)
 
     updater = DatabaseUpdater()
 
     try:
-        await updater.update_last_days(days_back=30)
+        await updater.update_last_days(
+            days_back=args.days,
+            day_concurrency=args.day_concurrency,
+            concurrency=args.concurrency,
+            batch_size=args.batch_size,
+        )
         logger.info("✅ Atualização concluída com sucesso!")
 
     except Exception as e:
@@ -11,22 +11,135 @@ class Settings:
     BETSAPI_API_KEY: str = os.getenv("BETSAPI_API_KEY", "")
     BASE_URL: str = "https://api.b365api.com"
     CACHE_TTL: int = int(os.getenv("CACHE_TTL", 300))
+    CACHE_ENABLED: bool = os.getenv("CACHE_ENABLED", "1").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
     REQUEST_TIMEOUT: int = 30
 
+    # Transporte HTTP (pool compartilhado por processo)
+    HTTP_MAX_CONNECTIONS: int = int(os.getenv("HTTP_MAX_CONNECTIONS", 50))
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = int(
+        os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", 20)
+    )
+    HTTP_KEEPALIVE_EXPIRY: float = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", 30))
+    HTTP_CONNECT_TIMEOUT: float = float(os.getenv("HTTP_CONNECT_TIMEOUT", 10))
+    HTTP2_ENABLED: bool = os.getenv("HTTP2_ENABLED", "1").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    HTTP_COMPRESSION: str = os.getenv("HTTP_COMPRESSION", "gzip, br")
+
+    # Modo da API: "live" (padrão), "record" (grava requisições/respostas) ou
+    # "replay" (serve as gravações do disco, para benchmarks offline)
+    API_MODE: str = os.getenv("API_MODE", "live").lower()
+    REPLAY_LATENCY_MS: float = float(os.getenv("REPLAY_LATENCY_MS", 0))
+    REPLAY_LATENCY_JITTER_MS: float = float(os.getenv("REPLAY_LATENCY_JITTER_MS", 0))
+    REPLAY_ERROR_RATE: float = float(os.getenv("REPLAY_ERROR_RATE", 0))
+
+    # TTL (segundos) por endpoint; 0 = nunca cachear. Resultados finalizados
+    # (time_status == "3") são imutáveis e ficam em cache indefinidamente.
+    CACHE_TTL_BY_ENDPOINT = {
+        "v1/bet365/inplay": 0,
+        "v1/bet365/inplay_filter": 0,
+        "v1/bet365/event": 0,
+        "v1/bet365/upcoming": CACHE_TTL,
+        "v3/bet365/prematch": CACHE_TTL,
+        "v1/bet365/result": CACHE_TTL,
+    }
+
     # Paths (da nova versão)
     BASE_DIR = Path(__file__).parent.parent
     DATA_DIR = BASE_DIR / "data"
     DATABASE_PATH = DATA_DIR / "lol_esports.db"
+    # data/ na raiz do repositório: o workflow diário commita data/*.db, então
+    # só o que fica aqui sobrevive entre execuções agendadas
+    PERSISTENT_DATA_DIR = BASE_DIR.parent / "data"
+    QUOTA_DB_PATH = PERSISTENT_DATA_DIR / "api_quota.db"
+    TELEGRAM_OUTBOX_DB_PATH = PERSISTENT_DATA_DIR / "telegram_outbox.db"
+    CACHE_DB_PATH = DATA_DIR / "api_cache.db"
     JSON_BACKUP_DIR = DATA_DIR / "json_backups"
+    REPLAY_DIR = DATA_DIR / "replay"
 
     # App Settings (da nova versão)
     UPDATE_DAYS_BACK = 2
     INITIAL_DAYS_BACK = 10
     REQUEST_DELAY = 0.3  # Delay entre requests
+    UPCOMING_PAGE_CONCURRENCY = 5  # Páginas de upcoming buscadas em paralelo
+    ODDS_FETCH_CONCURRENCY = 10  # Requisições de prematch simultâneas
+    ODDS_QUEUE_SIZE = int(os.getenv("ODDS_QUEUE_SIZE", 50))  # Backpressure do pipeline
+    DAY_FETCH_CONCURRENCY = int(
+        os.getenv("DAY_FETCH_CONCURRENCY", 4)
+    )  # Dias em paralelo
+    RESULT_FETCH_CONCURRENCY = int(
+        os.getenv("RESULT_FETCH_CONCURRENCY", 8)
+    )  # result() simultâneos em update_30_days/db_get_matches
+    RESULT_WRITE_BATCH = 25  # Eventos por transação do gravador de resultados
+    # Agendador de odds: intervalo de atualização (min) por distância até o início
+    # da partida (h); None = qualquer distância acima das anteriores
+    ODDS_REFRESH_TIERS = (
+        (3, 15),
+        (24, 60),
+        (72, 240),
+        (None, 720),
+    )
+    # Fração da cota horária que cada execução de db_get_odds pode consumir
+    ODDS_QUOTA_SHARE: float = float(os.getenv("ODDS_QUOTA_SHARE", 0.5))
+
+    # Cache negativo do ledger de buscas: segundos até buscar de novo um evento
+    # cujo prematch veio vazio ou com erro
+    ODDS_EMPTY_TTL: int = int(os.getenv("ODDS_EMPTY_TTL", 1800))
+    ODDS_ERROR_TTL: int = int(os.getenv("ODDS_ERROR_TTL", 300))
+
+    # Guarda o payload bruto do prematch (zlib, um blob por evento) em lol_odds.db
+    ODDS_STORE_RAW_PAYLOAD: bool = os.getenv("ODDS_STORE_RAW_PAYLOAD", "0").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+
+    # Cota da BetsAPI (token bucket compartilhado entre scripts e execuções)
+    API_HOURLY_QUOTA: int = int(os.getenv("API_HOURLY_QUOTA", 3500))
+    API_QUOTA_WINDOW: int = 3600
+    RATE_LIMIT_PAUSE: int = 60  # Pausa global quando a API sinaliza rate limit
+
+    # Retry / circuit breaker das requisições
+    API_MAX_RETRIES: int = int(os.getenv("API_MAX_RETRIES", 3))
+    API_RETRY_BASE_DELAY: float = 1.0
+    API_RETRY_MAX_DELAY: float = 30.0
+    CIRCUIT_BREAKER_THRESHOLD: int = 5  # Falhas consecutivas para abrir o circuito
+    CIRCUIT_BREAKER_COOLDOWN: int = 60  # Segundos até permitir nova tentativa
+
+    # Outbox do Telegram (envio assíncrono fora das transações de ingestão)
+    TELEGRAM_DIGEST: bool = os.getenv("TELEGRAM_DIGEST", "0").lower() in (
+        "1",
+        "true",
+        "yes",
+    )
+    TELEGRAM_CHAT_INTERVAL: float = 1.0  # Segundos entre mensagens no mesmo chat
+    TELEGRAM_TIMEOUT: float = 10.0
+    TELEGRAM_MAX_RETRIES: int = 3  # Tentativas por envio
+    TELEGRAM_MAX_ATTEMPTS: int = 10  # Falhas acumuladas até desistir da mensagem
+    # Dias que mensagens enviadas/com falha ficam no outbox (versionado em data/)
+    TELEGRAM_OUTBOX_RETENTION_DAYS: int = int(
+        os.getenv("TELEGRAM_OUTBOX_RETENTION_DAYS", 7)
+    )
+
+    # Armazenamento em camadas: dias no banco quente antes de ir para os
+    # arquivos mensais (data/archive/<banco>_AAAA_MM.db)
+    ODDS_ARCHIVE_AFTER_DAYS: int = int(os.getenv("ODDS_ARCHIVE_AFTER_DAYS", 30))
+    BETS_ARCHIVE_AFTER_DAYS: int = int(os.getenv("BETS_ARCHIVE_AFTER_DAYS", 90))
+    ESPORTS_ARCHIVE_AFTER_DAYS: int = int(os.getenv("ESPORTS_ARCHIVE_AFTER_DAYS", 180))
 
-    # Database Settings (da nova versão)
+    # Database Settings (da nova versão), aplicados por src.core.connection
     DB_TIMEOUT = 30
     DB_JOURNAL_MODE = "WAL"
+    DB_SYNCHRONOUS = "NORMAL"  # Seguro com WAL; fsync só nos checkpoints
+    DB_CACHE_SIZE_KB: int = int(os.getenv("DB_CACHE_SIZE_KB", 65536))
+    DB_MMAP_SIZE: int = int(os.getenv("DB_MMAP_SIZE", 256 * 1024 * 1024))
+    DB_TEMP_STORE = "MEMORY"
 
     # Garantir que diretórios existam
     def __init__(self):
@@ -0,0 +1,440 @@
+import logging
+import re
+import sqlite3
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .connection import connect
+
+logger = logging.getLogger("archive")
+
+# Arquivos mensais ficam em <pasta do banco>/archive/<nome>_<AAAA_MM>.db
+ARCHIVE_SUBDIR = "archive"
+ARCHIVE_SCHEMA_PREFIX = "archive_"
+
+# Chaves da tabela raiz do mês sendo arquivado (tabela TEMP da conexão)
+_KEYS = "SELECT key FROM temp._archive_keys"
+
+# time_status da BetsAPI que não mudam mais (finalizado, cancelado, W.O., ...)
+FINISHED_TIME_STATUSES = (3, 5, 6, 8, 9, 99)
+
+
+@dataclass(frozen=True)
+class ArchivePlan:
+    """O que sai do banco quente e vai para os arquivos mensais.
+
+    ``root_table`` define o mês de cada linha (``month_expr``) e quais linhas
+    podem ser arquivadas (``eligible``, com os parâmetros ``:cutoff`` em texto
+    e ``:cutoff_ts`` em epoch). ``children`` são as tabelas dependentes, das
+    folhas para a raiz, com o predicado sobre as chaves em ``temp._archive_keys``.
+    ``dictionaries`` são copiadas inteiras (sem remoção) e ``views`` são
+    recriadas em cada arquivo.
+    """
+
+    root_table: str
+    key_column: str
+    month_expr: str
+    eligible: str
+    children: Tuple[Tuple[str, str], ...] = ()
+    dictionaries: Tuple[str, ...] = ()
+    views: Tuple[str, ...] = ()
+
+    @property
+    def data_tables(self) -> Tuple[str, ...]:
+        return tuple(table for table, _ in self.children) + (self.root_table,)
+
+
+# lol_odds.db: eventos cuja partida já passou do corte, com odds e histórico
+ODDS_ARCHIVE_PLAN = ArchivePlan(
+    root_table="events",
+    key_column="event_id",
+    month_expr="strftime('%Y_%m', match_timestamp, 'unixepoch')",
+    eligible="match_timestamp < :cutoff_ts",
+    children=(
+        ("odds_history", f"event_id IN ({_KEYS})"),
+        ("odds", f"event_id IN ({_KEYS})"),
+        ("event_odds_payload", f"event_id IN ({_KEYS})"),
+        ("odds_fetch_ledger", f"event_id IN ({_KEYS})"),
+    ),
+    dictionaries=("teams", "odds_markets", "odds_selections"),
+    views=("current_odds",),
+)
+
+# bets.db: eventos finalizados sem nenhuma aposta em aberto
+BETS_ARCHIVE_PLAN = ArchivePlan(
+    root_table="events",
+    key_column="event_id",
+    month_expr="strftime('%Y_%m', match_date)",
+    eligible="""
+        status IN ('finished', 'canceled') AND match_date < :cutoff
+        AND NOT EXISTS (
+            SELECT 1 FROM main.bets b
+            WHERE b.event_id = events.event_id
+            AND b.bet_status IN ('pending', 'to_verify')
+        )
+    """,
+    children=(
+        ("results_verification", f"event_id IN ({_KEYS})"),
+        ("bets", f"event_id IN ({_KEYS})"),
+    ),
+)
+
+# lol_esports.db: partidas encerradas, mapas e estatísticas
+_ESPORTS_BET365_IDS = f"SELECT bet365_id FROM main.matches WHERE match_id IN ({_KEYS})"
+_ESPORTS_ODDS_IDS = (
+    f"SELECT odds_id FROM main.event_odds WHERE bet365_id IN ({_ESPORTS_BET365_IDS})"
+)
+ESPORTS_ARCHIVE_PLAN = ArchivePlan(
+    root_table="matches",
+    key_column="match_id",
+    month_expr="strftime('%Y_%m', event_time)",
+    eligible=(
+        f"time_status IN ({', '.join(map(str, FINISHED_TIME_STATUSES))}) "
+        "AND event_time < :cutoff"
+    ),
+    children=(
+        (
+            "map_statistics",
+            f"map_id IN (SELECT map_id FROM main.game_maps WHERE match_id IN ({_KEYS}))",
+        ),
+        ("team_map_timeline", f"match_id IN ({_KEYS})"),
+        ("map_stats", f"match_id IN ({_KEYS})"),
+        ("game_maps", f"match_id IN ({_KEYS})"),
+        (
+            "odds_values",
+            "market_id IN (SELECT market_id FROM main.odds_markets "
+            f"WHERE odds_id IN ({_ESPORTS_ODDS_IDS}))",
+        ),
+        ("odds_markets", f"odds_id IN ({_ESPORTS_ODDS_IDS})"),
+        ("event_odds", f"bet365_id IN ({_ESPORTS_BET365_IDS})"),
+    ),
+    dictionaries=("leagues", "teams"),
+)
+
+# Plano por nome de arquivo (o mesmo banco pode estar em caminhos diferentes)
+PLANS_BY_NAME = {
+    "lol_odds": ODDS_ARCHIVE_PLAN,
+    "bets": BETS_ARCHIVE_PLAN,
+    "lol_esports": ESPORTS_ARCHIVE_PLAN,
+}
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _columns(conn: sqlite3.Connection, schema: str, table: str) -> List[str]:
+    cursor = conn.execute(f"PRAGMA {schema}.table_info({_quote(table)})")
+    return [row[1] for row in cursor.fetchall()]
+
+
+def incremental_vacuum(conn: sqlite3.Connection, max_pages: int = 0) -> int:
+    """Devolve ao sistema as páginas livres do arquivo; retorna quantas.
+
+    Na primeira chamada converte o banco para ``auto_vacuum=INCREMENTAL``
+    (exige um VACUUM completo, uma única vez). ``max_pages`` = 0 libera todas.
+    """
+    if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != 2:
+        logger.info("🔧 Convertendo banco para auto_vacuum incremental (VACUUM único)")
+        conn.execute("PRAGMA auto_vacuum = INCREMENTAL")
+        conn.execute("VACUUM")
+        return 0
+
+    before = conn.execute("PRAGMA freelist_count").fetchone()[0]
+    # execute() dá um único passo (uma página); executescript roda até o fim
+    conn.executescript(f"PRAGMA incremental_vacuum({int(max_pages)});")
+    return before - conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+class TieredStorage:
+    """Banco quente + arquivos SQLite mensais com o histórico.
+
+    ``archive`` move as linhas elegíveis para o arquivo do mês delas;
+    ``connect_history`` abre o banco com os arquivos anexados (ATTACH) e
+    visões TEMP com os mesmos nomes das tabelas, unindo quente e histórico.
+    Essas conexões são só para leitura.
+    """
+
+    def __init__(
+        self,
+        db_path,
+        plan: Optional[ArchivePlan] = None,
+        archive_dir: Optional[Path] = None,
+    ):
+        self.db_path = Path(db_path)
+        self.plan = plan or PLANS_BY_NAME.get(self.db_path.stem)
+        if self.plan is None:
+            raise ValueError(f"Sem plano de arquivamento para {self.db_path.name}")
+        self.archive_dir = Path(archive_dir or self.db_path.parent / ARCHIVE_SUBDIR)
+
+    def archive_path(self, month: str) -> Path:
+        return self.archive_dir / f"{self.db_path.stem}_{month}.db"
+
+    def archive_months(self) -> List[str]:
+        """Meses (AAAA_MM) com arquivo em disco, do mais antigo ao mais novo"""
+        pattern = re.compile(rf"^{re.escape(self.db_path.stem)}_(\d{{4}}_\d{{2}})$")
+        months = []
+        for path in self.archive_dir.glob(f"{self.db_path.stem}_*.db"):
+            match = pattern.match(path.stem)
+            if match:
+                months.append(match.group(1))
+        return sorted(months)
+
+    def _connect(self, **kwargs) -> sqlite3.Connection:
+        return connect(self.db_path, **kwargs)
+
+    # ------------------------------------------------------------------
+    # Arquivamento
+    # ------------------------------------------------------------------
+    def _ensure_archive_schema(self, conn: sqlite3.Connection, path: Path):
+        """Cria no arquivo as tabelas/índices/visões do plano, como no banco quente"""
+        plan = self.plan
+        objects = {
+            (row[0], row[1]): row
+            for row in conn.execute(
+                "SELECT type, name, tbl_name, sql FROM main.sqlite_master WHERE sql IS NOT NULL"
+            )
+        }
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with closing(sqlite3.connect(path)) as archive_conn, archive_conn:
+            existing = {
+                row[0]
+                for row in archive_conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type IN ('table', 'view')"
+                )
+            }
+            for table in plan.dictionaries + plan.data_tables:
+                if ("table", table) not in objects:
+                    continue
+                if table not in existing:
+                    archive_conn.execute(objects[("table", table)][3])
+                    for (kind, _), row in objects.items():
+                        if kind == "index" and row[2] == table:
+                            archive_conn.execute(row[3])
+                    continue
+
+                # Colunas adicionadas por migrações depois que o arquivo foi criado
+                archive_columns = set(_columns(archive_conn, "main", table))
+                for column in conn.execute(
+                    f"PRAGMA main.table_info({_quote(table)})"
+                ).fetchall():
+                    if column[1] not in archive_columns:
+                        archive_conn.execute(
+                            f"ALTER TABLE {_quote(table)} "
+                            f"ADD COLUMN {_quote(column[1])} {column[2]}"
+                        )
+
+            for view in plan.views:
+                if ("view", view) in objects and view not in existing:
+                    archive_conn.execute(objects[("view", view)][3])
+
+    def archive(self, cutoff: datetime) -> Dict[str, int]:
+        """Move as linhas anteriores a ``cutoff`` para os arquivos mensais.
+
+        Cada mês é movido em uma transação (cópia + remoção); rodar de novo é
+        seguro. Retorna linhas da tabela raiz movidas por mês.
+        """
+        plan = self.plan
+        params = {
+            "cutoff": cutoff.strftime("%Y-%m-%d %H:%M:%S"),
+            "cutoff_ts": int(cutoff.timestamp()),
+        }
+        moved: Dict[str, int] = {}
+
+        conn = self._connect()
+        try:
+            tables = {
+                row[0]
+                for row in conn.execute(
+                    "SELECT name FROM main.sqlite_master WHERE type = 'table'"
+                )
+            }
+            if plan.root_table not in tables:
+                return moved
+
+            months = [
+                row[0]
+                for row in conn.execute(
+                    f"""
+                    SELECT DISTINCT {plan.month_expr} FROM main.{plan.root_table}
+                    WHERE {plan.eligible}
+                    ORDER BY 1
+                """,
+                    params,
+                )
+                if row[0]
+            ]
+            conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS _archive_keys (key PRIMARY KEY)"
+            )
+
+            root = (plan.root_table, f"{plan.key_column} IN ({_KEYS})")
+            for month in months:
+                path = self.archive_path(month)
+                self._ensure_archive_schema(conn, path)
+                conn.execute("ATTACH DATABASE ? AS archive", (str(path),))
+                try:
+                    with conn:
+                        conn.execute("DELETE FROM temp._archive_keys")
+                        moved[month] = conn.execute(
+                            f"""
+                            INSERT INTO temp._archive_keys
+                            SELECT {plan.key_column} FROM main.{plan.root_table}
+                            WHERE ({plan.eligible}) AND {plan.month_expr} = :month
+                        """,
+                            {**params, "month": month},
+                        ).rowcount
+
+                        for table in plan.dictionaries:
+                            if table in tables:
+                                self._copy(conn, table, "1")
+
+                        for table, predicate in plan.children + (root,):
+                            if table not in tables:
+                                continue
+                            self._copy(conn, table, predicate)
+                            conn.execute(
+                                f"DELETE FROM main.{_quote(table)} WHERE {predicate}"
+                            )
+                finally:
+                    conn.execute("DETACH DATABASE archive")
+
+                logger.info(
+                    f"🗄️ {self.db_path.name}: {moved[month]} registros de "
+                    f"{plan.root_table} arquivados em {path.name}"
+                )
+        finally:
+            conn.close()
+        return moved
+
+    @staticmethod
+    def _copy(conn: sqlite3.Connection, table: str, predicate: str):
+        columns = ", ".join(_quote(c) for c in _columns(conn, "main", table))
+        conn.execute(
+            f"""
+            INSERT OR REPLACE INTO archive.{_quote(table)} ({columns})
+            SELECT {columns} FROM main.{_quote(table)} WHERE {predicate}
+        """
+        )
+
+    def incremental_vacuum(self, max_pages: int = 0) -> int:
+        """``incremental_vacuum`` no banco quente"""
+        conn = self._connect()
+        try:
+            return incremental_vacuum(conn, max_pages)
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Leitura com histórico
+    # ------------------------------------------------------------------
+    def attach(
+        self, conn: sqlite3.Connection, months: Optional[Iterable[str]] = None
+    ) -> List[str]:
+        """Anexa os arquivos mensais e cria as visões de união (TEMP).
+
+        As visões têm o nome das tabelas do plano, então as consultas
+        existentes passam a enxergar quente + histórico sem alteração. O
+        SQLite limita quantos bancos podem ser anexados; acima disso ficam
+        os meses mais recentes.
+        """
+        available = self.archive_months()
+        if months is not None:
+            wanted = set(months)
+            available = [month for month in available if month in wanted]
+
+        attached = {row[1] for row in conn.execute("PRAGMA database_list")}
+        limit = conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED) - (
+            len(attached - {"main", "temp"})
+        )
+        if len(available) > limit:
+            logger.warning(
+                f"⚠️ {len(available)} arquivos de {self.db_path.stem}, anexando só "
+                f"os {limit} mais recentes (use months= para escolher)"
+            )
+            available = available[len(available) - limit :]
+
+        schemas = []
+        for month in available:
+            schema = f"{ARCHIVE_SCHEMA_PREFIX}{month}"
+            if schema not in attached:
+                conn.execute(
+                    "ATTACH DATABASE ? AS " + _quote(schema),
+                    (str(self.archive_path(month)),),
+                )
+            schemas.append(schema)
+
+        self._create_union_views(conn, schemas)
+        return schemas
+
+    def _create_union_views(self, conn: sqlite3.Connection, schemas: List[str]):
+        plan = self.plan
+        for table in plan.dictionaries + plan.data_tables:
+            columns = _columns(conn, "main", table)
+            if not columns:
+                continue
+
+            selects = [
+                f"SELECT {', '.join(_quote(c) for c in columns)} FROM main.{_quote(table)}"
+            ]
+            for schema in schemas:
+                archive_columns = set(_columns(conn, _quote(schema), table))
+                if not archive_columns:
+                    continue
+                expressions = [
+                    _quote(c) if c in archive_columns else f"NULL AS {_quote(c)}"
+                    for c in columns
+                ]
+                selects.append(
+                    f"SELECT {', '.join(expressions)} "
+                    f"FROM {_quote(schema)}.{_quote(table)}"
+                )
+
+            # Dicionários são copiados para todo arquivo: UNION remove repetidos
+            joiner = "\nUNION\n" if table in plan.dictionaries else "\nUNION ALL\n"
+            conn.execute(f"DROP VIEW IF EXISTS temp.{_quote(table)}")
+            conn.execute(f"CREATE TEMP VIEW {_quote(table)} AS {joiner.join(selects)}")
+
+        # Visões do banco quente só enxergam o main: recria como TEMP
+        for view in plan.views:
+            row = conn.execute(
+                "SELECT sql FROM main.sqlite_master WHERE type = 'view' AND name = ?",
+                (view,),
+            ).fetchone()
+            if row is None:
+                continue
+            conn.execute(f"DROP VIEW IF EXISTS temp.{_quote(view)}")
+            conn.execute(
+                re.sub(
+                    r"^\s*CREATE\s+VIEW",
+                    "CREATE TEMP VIEW",
+                    row[0],
+                    count=1,
+                    flags=re.IGNORECASE,
+                )
+            )
+
+    def connect_history(
+        self, months: Optional[Iterable[str]] = None, **kwargs
+    ) -> sqlite3.Connection:
+        """Conexão (somente leitura) com o histórico anexado"""
+        conn = self._connect(**kwargs)
+        self.attach(conn, months)
+        return conn
+
+
+def connect_with_history(db_path, **kwargs) -> sqlite3.Connection:
+    """Abre ``db_path`` com os arquivos mensais anexados, se houver plano/arquivos.
+
+    Bancos sem plano de arquivamento (ou sem arquivos) abrem normalmente.
+    """
+    path = Path(db_path)
+    if path.stem not in PLANS_BY_NAME:
+        return connect(path, **kwargs)
+    storage = TieredStorage(path)
+    if not storage.archive_months():
+        return connect(path, **kwargs)
+    return storage.connect_history(**kwargs)
@@ -1,15 +1,76 @@
 import httpx
 import asyncio
-from typing import Dict, Any, List, Optional
-from .exceptions import BetsAPIError, RateLimitError
+import copy
+import logging
+import math
+import sys
+import time
+from pathlib import Path
+from typing import AsyncIterator, Dict, Any, Optional
+from .exceptions import BetsAPIError, RateLimitError, TransientAPIError
+from . import json_codec
+from .http_pool import acquire_shared_client, release_shared_client
+from .rate_limiter import QuotaManager
+from .resilience import CircuitBreaker, RetryPolicy
+from .response_cache import ResponseCache
+from .telemetry import ClientTelemetry
 from ..config.settings import settings
 
+logger = logging.getLogger("bet365_client")
+
+
+class _LeaderCancelled(Exception):
+    """A tarefa que fazia a requisição compartilhada foi cancelada; quem
+    aguardava o resultado refaz a requisição em vez de herdar o cancelamento"""
+
 
 class Bet365Client:
-    def __init__(self):
+    def __init__(
+        self,
+        client: Optional[httpx.AsyncClient] = None,
+        quota: Optional[QuotaManager] = None,
+        cache: Optional[ResponseCache] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+        telemetry_db=None,
+    ):
         self.base_url = settings.BASE_URL
         self.api_key = settings.BETSAPI_API_KEY
-        self.client = httpx.AsyncClient(timeout=settings.REQUEST_TIMEOUT)
+        # Por padrão usa o pool compartilhado do processo
+        self._owns_client = client is None
+        self.client = client if client is not None else acquire_shared_client()
+        # Cota horária compartilhada entre processos (token bucket em disco);
+        # o modo replay usa um bucket próprio para não consumir a cota real
+        replay = settings.API_MODE == "replay"
+        if quota is None:
+            quota = QuotaManager(bucket="replay" if replay else "betsapi")
+        self.quota = quota
+        # Cache em disco das respostas (TTL por endpoint); desligado no replay
+        # para que os benchmarks meçam o pipeline completo
+        if cache is None and settings.CACHE_ENABLED and not replay:
+            cache = ResponseCache()
+        self.cache = cache
+        # Retry com backoff + circuit breaker por endpoint
+        self.retry_policy = retry_policy or RetryPolicy()
+        self.circuit_breaker = CircuitBreaker()
+        self.retries = 0
+        # Single-flight: requisições idênticas em andamento compartilham o resultado
+        self._in_flight: Dict[str, asyncio.Future] = {}
+        self.coalesced = 0
+        # Métricas por endpoint, gravadas no close() em update_logs de
+        # ``telemetry_db`` (objeto com log_update, ex.: LoLDatabase)
+        self.telemetry = ClientTelemetry()
+        self.telemetry_db = telemetry_db
+
+    async def remaining_quota(self) -> int:
+        """Requisições ainda disponíveis na cota horária"""
+        # Leitura no SQLite fora do event loop, como em QuotaManager.acquire
+        return await asyncio.to_thread(self.quota.remaining)
+
+    def cache_stats(self) -> Dict[str, Any]:
+        """Hits/misses do cache de respostas (hits = requisições economizadas)"""
+        if self.cache is None:
+            return {"hits": 0, "misses": 0, "hit_rate": 0.0, "endpoints": {}}
+        return self.cache.stats()
 
     async def _make_request(
         self, endpoint: str, params: Dict[str, Any] = None
@@ -17,27 +78,145 @@ class Bet365Client:
         if params is None:
             params = {}
 
-        params["token"] = self.api_key
+        if self.cache is not None:
+            cached = self.cache.get(endpoint, params)
+            if cached is not None:
+                return cached
+
+        # Mesma requisição já em andamento: aguarda o mesmo resultado
+        # (cada chamador recebe uma cópia rasa do dict da resposta)
+        key = ResponseCache.make_key(endpoint, params)
+        while key in self._in_flight:
+            self.coalesced += 1
+            self.telemetry.record_coalesced(endpoint)
+            try:
+                return copy.copy(await asyncio.shield(self._in_flight[key]))
+            except _LeaderCancelled:
+                # A primeira tarefa a voltar aqui assume a requisição
+                continue
+
+        future = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            data = await self._request_with_retries(endpoint, params)
+        except asyncio.CancelledError:
+            future.set_exception(_LeaderCancelled())
+            future.exception()  # sem aguardando, evita o aviso do asyncio
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            future.exception()  # evita aviso "exception was never retrieved"
+            raise
+        else:
+            future.set_result(data)
+            return data
+        finally:
+            del self._in_flight[key]
+
+    async def _request_with_retries(
+        self, endpoint: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        # Cópia: o dict do chamador não recebe o token
+        params = {**params, "token": self.api_key}
+
+        self.circuit_breaker.before_call(endpoint)
+        try:
+            data = await self._attempts(endpoint, params)
+        finally:
+            # Cancelamento ou erro inesperado não deixam o circuito preso em teste
+            self.circuit_breaker.release(endpoint)
+
+        if self.cache is not None:
+            self.cache.set(endpoint, params, data)
+
+        return data
+
+    async def _attempts(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Tentativas com retry/backoff; registra o resultado no circuit breaker"""
+        attempt = 0
+        while True:
+            await self.quota.acquire()
+            self.telemetry.record_quota(endpoint)
+            try:
+                data = await self._send(endpoint, params)
+                break
+            except RateLimitError as e:
+                # Pausa o limitador compartilhado (todas as tarefas e processos)
+                await self.quota.pause(e.retry_after or settings.RATE_LIMIT_PAUSE)
+                error = e
+            except TransientAPIError as e:
+                error = e
+            except BetsAPIError:
+                # Erro definitivo (4xx, erro de negócio): o endpoint respondeu
+                self.circuit_breaker.record_success(endpoint)
+                raise
+
+            if attempt >= self.retry_policy.max_retries:
+                self.circuit_breaker.record_failure(endpoint)
+                raise error
+
+            delay = self.retry_policy.backoff(attempt)
+            attempt += 1
+            self.retries += 1
+            self.telemetry.record_retry(endpoint)
+            logger.warning(
+                f"🔁 {endpoint}: {error} - tentativa {attempt}/"
+                f"{self.retry_policy.max_retries} em {delay:.1f}s"
+            )
+            await asyncio.sleep(delay)
 
+        self.circuit_breaker.record_success(endpoint)
+        return data
+
+    async def _send(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Executa uma única requisição e classifica os erros (transitório ou não)"""
+        started = time.perf_counter()
         try:
             response = await self.client.get(
                 f"{self.base_url}/{endpoint}", params=params
             )
-            response.raise_for_status()
-
-            data = response.json()
+        except httpx.TransportError as e:
+            self.telemetry.record_response(
+                endpoint, time.perf_counter() - started, type(e).__name__
+            )
+            raise TransientAPIError(f"HTTP error: {str(e)}")
 
-            if data.get("success") == 0:
-                error_msg = data.get("error", "Unknown error")
-                if "rate limit" in error_msg.lower():
-                    raise RateLimitError(error_msg)
-                raise BetsAPIError(error_msg)
+        self.telemetry.record_response(
+            endpoint,
+            time.perf_counter() - started,
+            response.status_code,
+            len(response.content),
+        )
 
-            return data
+        if response.status_code == 429:
+            raise RateLimitError(
+                "HTTP 429 Too Many Requests",
+                retry_after=self.retry_policy.parse_retry_after(
+                    response.headers.get("Retry-After")
+                ),
+            )
 
-        except httpx.HTTPError as e:
+        try:
+            response.raise_for_status()
+        except httpx.HTTPStatusError as e:
+            if response.status_code >= 500:
+                raise TransientAPIError(f"HTTP error: {str(e)}")
             raise BetsAPIError(f"HTTP error: {str(e)}")
 
+        try:
+            # Decodifica direto dos bytes (orjson quando disponível)
+            data = json_codec.loads(response.content)
+        except ValueError as e:
+            raise TransientAPIError(f"Resposta inválida da API: {str(e)}")
+
+        if data.get("success") == 0:
+            error_msg = data.get("error", "Unknown error")
+            if "rate limit" in str(error_msg).lower():
+                raise RateLimitError(error_msg)
+            raise BetsAPIError(error_msg)
+
+        return data
+
     # Bet365 InPlay
     async def inplay(self) -> Dict[str, Any]:
         return await self._make_request("v1/bet365/inplay")
@@ -83,6 +262,61 @@ class Bet365Client:
             params["page"] = page
         return await self._make_request("v1/bet365/upcoming", params)
 
+    # Bet365 Upcoming Events (todas as páginas)
+    async def upcoming_all(
+        self,
+        sport_id: int,
+        league_id: Optional[int] = None,
+        day: Optional[str] = None,
+        max_concurrency: Optional[int] = None,
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """Itera sobre os eventos de todas as páginas do upcoming.
+
+        A primeira página informa o ``pager``; as demais são buscadas em
+        paralelo (limitadas por ``max_concurrency`` e pela cota) e os eventos
+        são entregues conforme cada página chega, sem ordem garantida. Erro na
+        primeira página é propagado; uma página seguinte que falha (após os
+        retries) é registrada no log e pulada, sem descartar as demais.
+        """
+        first_page = await self.upcoming(sport_id, league_id=league_id, day=day)
+        for event in first_page.get("results") or []:
+            yield event
+
+        pager = first_page.get("pager") or {}
+        per_page = int(pager.get("per_page") or 0)
+        total = int(pager.get("total") or 0)
+        if per_page <= 0 or total <= per_page:
+            return
+
+        semaphore = asyncio.Semaphore(
+            max_concurrency or settings.UPCOMING_PAGE_CONCURRENCY
+        )
+
+        async def fetch_page(page: int) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    return await self.upcoming(
+                        sport_id, league_id=league_id, day=day, page=page
+                    )
+                except Exception as e:
+                    logger.warning(
+                        f"⚠️ upcoming (dia {day}) página {page} ignorada: {e}"
+                    )
+                    return {}
+
+        tasks = [
+            asyncio.create_task(fetch_page(page))
+            for page in range(2, math.ceil(total / per_page) + 1)
+        ]
+        try:
+            for next_page in asyncio.as_completed(tasks):
+                data = await next_page
+                for event in data.get("results") or []:
+                    yield event
+        finally:
+            for task in tasks:
+                task.cancel()
+
     # Bet365 PreMatch Odds
     async def prematch(self, FI: str, raw: bool = False) -> Dict[str, Any]:
         params = {"FI": FI}
@@ -97,5 +331,46 @@ class Bet365Client:
             params["raw"] = 1
         return await self._make_request("v1/bet365/result", params)
 
+    def telemetry_summary(self) -> Dict[str, Any]:
+        """Resumo das métricas da execução (por endpoint + cache)"""
+        summary = self.telemetry.summary()
+        summary["run"] = Path(sys.argv[0]).name if sys.argv and sys.argv[0] else None
+        summary["cache"] = self.cache_stats()
+        return summary
+
+    def flush_telemetry(self, update_type: str = "api_telemetry"):
+        """Grava uma única linha de resumo em update_logs do ``telemetry_db``.
+
+        Sem ``telemetry_db`` ou no modo replay o resumo só vai para o log.
+        """
+        if not self.telemetry.total_requests and not self.cache_stats()["hits"]:
+            return
+
+        summary = self.telemetry_summary()
+        if self.telemetry_db is None or settings.API_MODE == "replay":
+            logger.info(
+                f"📈 Telemetria: {summary['requests']} requisições, "
+                f"{summary['quota_used']} da cota, {summary['errors']} erros"
+            )
+            self.telemetry = ClientTelemetry()
+            return
+
+        try:
+            self.telemetry_db.log_update(
+                update_type,
+                items_processed=summary["requests"],
+                new_items=summary["quota_used"],
+                success=summary["errors"] == 0,
+                details=json_codec.dumps(summary),
+            )
+        except Exception as e:
+            logger.warning(f"⚠️ Não foi possível gravar telemetria: {e}")
+        self.telemetry = ClientTelemetry()
+
     async def close(self):
-        await self.client.aclose()
+        self.flush_telemetry()
+        if self._owns_client:
+            await release_shared_client(self.client)
+        self.quota.close()
+        if self.cache is not None:
+            self.cache.close()
@@ -0,0 +1,124 @@
+import atexit
+import logging
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, List
+
+from ..config.settings import settings
+
+logger = logging.getLogger("connection")
+
+# Conexões reaproveitadas: um dicionário por thread e a lista de todas (atexit)
+_local = threading.local()
+_shared: List["TunedConnection"] = []
+_shared_lock = threading.Lock()
+
+
+class TunedConnection(sqlite3.Connection):
+    """Conexão SQLite do projeto; roda ``PRAGMA optimize`` ao fechar.
+
+    Conexões reaproveitadas por thread (``connect(..., reuse=True)``) ignoram
+    ``close()``: só desfazem a transação pendente e continuam abertas para a
+    próxima chamada da mesma thread. Elas são fechadas de fato por
+    ``close_thread_connections`` ou ``close_all_connections`` (no atexit).
+    """
+
+    shared = False
+
+    def close(self):
+        if self.shared:
+            if self.in_transaction:
+                self.rollback()
+            return
+        self._close()
+
+    def _close(self):
+        try:
+            self.execute("PRAGMA optimize")
+        except sqlite3.Error:
+            pass
+        super().close()
+
+
+def apply_pragmas(conn: sqlite3.Connection):
+    """Aplica WAL, synchronous, busy_timeout, cache, mmap e temp_store de settings"""
+    conn.execute(f"PRAGMA busy_timeout = {int(settings.DB_TIMEOUT * 1000)}")
+    try:
+        conn.execute(f"PRAGMA journal_mode = {settings.DB_JOURNAL_MODE}")
+    except sqlite3.OperationalError as e:
+        # Trocar o modo exige acesso exclusivo; segue no modo atual do arquivo
+        logger.warning(f"⚠️ journal_mode={settings.DB_JOURNAL_MODE} não aplicado: {e}")
+    conn.execute(f"PRAGMA synchronous = {settings.DB_SYNCHRONOUS}")
+    conn.execute(f"PRAGMA cache_size = -{settings.DB_CACHE_SIZE_KB}")
+    conn.execute(f"PRAGMA mmap_size = {settings.DB_MMAP_SIZE}")
+    conn.execute(f"PRAGMA temp_store = {settings.DB_TEMP_STORE}")
+
+
+def connect(db_path, reuse: bool = False, **kwargs) -> sqlite3.Connection:
+    """Abre ``db_path`` com os PRAGMAs do projeto.
+
+    Com ``reuse`` devolve a mesma conexão para a thread atual (por arquivo e
+    argumentos); quem a usa não deve alterar ``row_factory`` nem
+    ``isolation_level`` da conexão, que é compartilhada. Demais argumentos vão
+    para ``sqlite3.connect``.
+    """
+    kwargs.setdefault("timeout", settings.DB_TIMEOUT)
+    if not reuse:
+        conn = sqlite3.connect(db_path, factory=TunedConnection, **kwargs)
+        apply_pragmas(conn)
+        return conn
+
+    connections: Dict[tuple, TunedConnection] = getattr(_local, "connections", None)
+    if connections is None:
+        connections = _local.connections = {}
+
+    key = (str(Path(db_path).resolve()), tuple(sorted(kwargs.items())))
+    conn = connections.get(key)
+    if conn is None:
+        # check_same_thread=False só para o atexit poder fechá-la
+        kwargs["check_same_thread"] = False
+        conn = sqlite3.connect(db_path, factory=TunedConnection, **kwargs)
+        apply_pragmas(conn)
+        conn.shared = True
+        connections[key] = conn
+        with _shared_lock:
+            _shared.append(conn)
+    return conn
+
+
+def close_thread_connections():
+    """Fecha as conexões reaproveitadas da thread atual"""
+    connections = getattr(_local, "connections", None) or {}
+    for conn in connections.values():
+        with _shared_lock:
+            if conn in _shared:
+                _shared.remove(conn)
+        conn._close()
+    connections.clear()
+
+
+def checkpoint(db_path) -> bool:
+    """Grava o ``-wal`` de ``db_path`` no arquivo principal e o trunca.
+
+    Necessário antes de versionar ou copiar só o ``.db``: até o checkpoint, as
+    últimas transações existem apenas no ``-wal``. Usa uma conexão simples (sem
+    os PRAGMAs do projeto) para não mudar o journal_mode de bancos fora do WAL.
+    Retorna False se algum leitor impediu o checkpoint completo.
+    """
+    conn = sqlite3.connect(db_path, timeout=settings.DB_TIMEOUT)
+    try:
+        busy, _, _ = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()
+    finally:
+        conn.close()
+    return not busy
+
+
+@atexit.register
+def close_all_connections():
+    """Fecha todas as conexões reaproveitadas (com PRAGMA optimize)"""
+    with _shared_lock:
+        connections = list(_shared)
+        _shared.clear()
+    for conn in connections:
+        conn._close()
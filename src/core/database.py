@@ -1,13 +1,124 @@
-import sqlite3
+import math
 import os
 from datetime import datetime
 from pathlib import Path
 
+from .connection import connect
+
 # Configurações diretas - SEM import de config
 BASE_DIR = Path(__file__).parent.parent.parent  # Volta 3 níveis: src/core/../../
 DATA_DIR = BASE_DIR / "data"
 DB_PATH = DATA_DIR / "lol_esports.db"
 
+# Estatísticas de mapa com colunas próprias em map_stats (home_<stat>/away_<stat>);
+# as demais continuam como linhas em map_statistics (stat_name, home_value, away_value)
+MAP_STATS = ("kills", "dragons", "barons", "towers", "inhibitors")
+
+
+def _stat_int(value):
+    """Valor numérico de uma estatística ("1,234" -> 1234, "5.0" -> 5); None se
+    não for um número finito. Usado na gravação e na migração de map_statistics."""
+    if value is None:
+        return None
+    try:
+        number = float(str(value).replace(",", "").strip())
+    except ValueError:
+        return None
+    return int(number) if math.isfinite(number) else None
+
+
+def ensure_game_map(cursor, match_id, map_number):
+    """map_id do mapa da partida, criando o registro se preciso (id estável)"""
+    cursor.execute(
+        "INSERT OR IGNORE INTO game_maps (match_id, map_number) VALUES (?, ?)",
+        (match_id, map_number),
+    )
+    cursor.execute(
+        "SELECT map_id FROM game_maps WHERE match_id = ? AND map_number = ?",
+        (match_id, map_number),
+    )
+    return cursor.fetchone()[0]
+
+
+def save_map_stats(cursor, match_id, map_number, stats):
+    """Grava as estatísticas de um mapa ({stat: [casa, fora]}); retorna quantas.
+
+    As estatísticas de MAP_STATS vão tipadas para uma linha de map_stats; as
+    outras (ex.: gold "49.8k") ficam em map_statistics.
+    """
+    map_id = ensure_game_map(cursor, match_id, map_number)
+    values = {}
+    count = 0
+
+    for stat_name, pair in stats.items():
+        if not (isinstance(pair, list) and len(pair) == 2):
+            continue
+        count += 1
+        if stat_name in MAP_STATS:
+            values[f"home_{stat_name}"] = _stat_int(pair[0])
+            values[f"away_{stat_name}"] = _stat_int(pair[1])
+        else:
+            cursor.execute(
+                "INSERT OR REPLACE INTO map_statistics (map_id, stat_name, home_value, away_value) VALUES (?, ?, ?, ?)",
+                (map_id, stat_name, pair[0], pair[1]),
+            )
+
+    if values:
+        columns = ["map_id", "match_id", "map_number", *values]
+        cursor.execute(
+            f"INSERT OR REPLACE INTO map_stats ({', '.join(columns)}) VALUES ({', '.join('?' for _ in columns)})",
+            (map_id, match_id, map_number, *values.values()),
+        )
+        # Cópias antigas (pré-migração) deste mapa ficam obsoletas
+        cursor.execute(
+            f"DELETE FROM map_statistics WHERE map_id = ? AND stat_name IN ({', '.join('?' for _ in MAP_STATS)})",
+            (map_id, *MAP_STATS),
+        )
+    return count
+
+
+def _timeline_side(own, opp, is_home):
+    """SELECT de map_stats + matches do ponto de vista de um dos times"""
+    stats = ", ".join(
+        f"s.{own}_{stat}, s.{opp}_{stat}, s.home_{stat} + s.away_{stat}"
+        for stat in MAP_STATS
+    )
+    return f"""
+        SELECT m.{own}_team_id, m.event_time, m.match_id, s.map_number,
+               m.{opp}_team_id, {is_home}, {stats}
+        FROM map_stats s
+        JOIN matches m ON m.match_id = s.match_id
+        WHERE m.time_status = 3 AND m.event_time IS NOT NULL
+          AND m.{own}_team_id IS NOT NULL"""
+
+
+def refresh_team_map_timeline(cursor, match_id=None):
+    """Regrava as linhas de team_map_timeline de uma partida (None = todas)
+
+    A linha do tempo só tem mapas de partidas finalizadas (time_status = 3):
+    uma linha por time e mapa, com os valores do time, do adversário e o total.
+    Retorna quantas linhas foram gravadas.
+    """
+    columns = ", ".join(f"{stat}_own, {stat}_opp, {stat}_total" for stat in MAP_STATS)
+    where, params = "", ()
+    if match_id is not None:
+        where, params = " AND m.match_id = ?", (match_id,)
+        cursor.execute("DELETE FROM team_map_timeline WHERE match_id = ?", params)
+    else:
+        cursor.execute("DELETE FROM team_map_timeline")
+
+    cursor.execute(
+        f"""
+        INSERT OR REPLACE INTO team_map_timeline
+            (team_id, event_time, match_id, map_number, opponent_id, is_home, {columns})
+        {_timeline_side("home", "away", 1)}{where}
+        UNION ALL
+        {_timeline_side("away", "home", 0)}{where}
+        """,
+        params * 2,
+    )
+    return cursor.rowcount
+
 
 class LoLDatabase:
     def __init__(self):
@@ -90,6 +201,64 @@ class LoLDatabase:
             )
         """)
 
+        # Estatísticas tipadas por mapa (uma linha por mapa)
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS map_stats (
+                map_id INTEGER PRIMARY KEY,
+                match_id INTEGER NOT NULL,
+                map_number INTEGER NOT NULL,
+                home_kills INTEGER,
+                away_kills INTEGER,
+                home_dragons INTEGER,
+                away_dragons INTEGER,
+                home_barons INTEGER,
+                away_barons INTEGER,
+                home_towers INTEGER,
+                away_towers INTEGER,
+                home_inhibitors INTEGER,
+                away_inhibitors INTEGER,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+                FOREIGN KEY (map_id) REFERENCES game_maps (map_id),
+                FOREIGN KEY (match_id) REFERENCES matches (match_id),
+                UNIQUE(match_id, map_number)
+            )
+        """)
+        self._migrate_map_statistics(cursor)
+
+        # Linha do tempo por time (desnormalizada): uma linha por time e mapa
+        # de partida finalizada, ordenada por (team_id, event_time DESC) para
+        # que "últimos N mapas do time" seja uma leitura de intervalo
+        cursor.execute("""
+            CREATE TABLE IF NOT EXISTS team_map_timeline (
+                team_id INTEGER NOT NULL,
+                event_time DATETIME NOT NULL,
+                match_id INTEGER NOT NULL,
+                map_number INTEGER NOT NULL,
+                opponent_id INTEGER,
+                is_home INTEGER NOT NULL,
+                kills_own INTEGER,
+                kills_opp INTEGER,
+                kills_total INTEGER,
+                dragons_own INTEGER,
+                dragons_opp INTEGER,
+                dragons_total INTEGER,
+                barons_own INTEGER,
+                barons_opp INTEGER,
+                barons_total INTEGER,
+                towers_own INTEGER,
+                towers_opp INTEGER,
+                towers_total INTEGER,
+                inhibitors_own INTEGER,
+                inhibitors_opp INTEGER,
+                inhibitors_total INTEGER,
+                PRIMARY KEY (team_id, event_time DESC, match_id DESC, map_number DESC)
+            ) WITHOUT ROWID
+        """)
+        cursor.execute(
+            "CREATE INDEX IF NOT EXISTS idx_team_map_timeline_match ON team_map_timeline (match_id)"
+        )
+        self._backfill_team_map_timeline(cursor)
+
         # Tabela de logs
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS update_logs (
@@ -99,30 +268,147 @@ class LoLDatabase:
                 new_items INTEGER,
                 success BOOLEAN,
                 error_message TEXT,
+                details TEXT,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP
             )
         """)
 
+        # Migração: coluna de detalhes (JSON) em bancos antigos
+        cursor.execute("PRAGMA table_info(update_logs)")
+        if "details" not in {row[1] for row in cursor.fetchall()}:
+            cursor.execute("ALTER TABLE update_logs ADD COLUMN details TEXT")
+
         conn.commit()
         conn.close()
         print("✅ Banco de dados inicializado com sucesso!")
 
+    def _legacy_map_statistics(self, cursor, where=""):
+        """Linhas de MAP_STATS em map_statistics (EAV) agrupadas por mapa:
+        {map_id: (match_id, map_number, {coluna de map_stats: valor})}"""
+        placeholders = ", ".join("?" for _ in MAP_STATS)
+        cursor.execute(f"""
+            SELECT ms.map_id, gm.match_id, gm.map_number, ms.stat_name,
+                   ms.home_value, ms.away_value
+            FROM map_statistics ms
+            JOIN game_maps gm ON gm.map_id = ms.map_id
+            WHERE ms.stat_name IN ({placeholders}) {where}
+        """, MAP_STATS)
+        maps = {}
+        for map_id, match_id, map_number, stat_name, home, away in cursor.fetchall():
+            values = maps.setdefault(map_id, (match_id, map_number, {}))[2]
+            values[f"home_{stat_name}"] = _stat_int(home)
+            values[f"away_{stat_name}"] = _stat_int(away)
+        return maps
+
+    def _orphan_map_statistics(self, cursor):
+        """map_ids de map_statistics sem registro em game_maps (sem partida nem
+        número do mapa, não entram em map_stats)"""
+        cursor.execute("""
+            SELECT DISTINCT ms.map_id
+            FROM map_statistics ms
+            WHERE NOT EXISTS (SELECT 1 FROM game_maps gm WHERE gm.map_id = ms.map_id)
+        """)
+        return [row[0] for row in cursor.fetchall()]
+
+    def _migrate_map_statistics(self, cursor):
+        """Copia as estatísticas modeladas de map_statistics (EAV) para map_stats.
+
+        Só entram mapas ainda sem linha em map_stats, convertidos por
+        ``_stat_int`` (o mesmo parser da gravação). As linhas EAV são mantidas
+        como backup até ``purge_migrated_map_statistics`` conferir a cópia.
+        """
+        maps = self._legacy_map_statistics(
+            cursor, "AND NOT EXISTS (SELECT 1 FROM map_stats s WHERE s.map_id = ms.map_id)"
+        )
+        if not maps:
+            return
+
+        orphans = self._orphan_map_statistics(cursor)
+        if orphans:
+            print(
+                f"⚠️ {len(orphans)} mapas de map_statistics sem game_maps não foram "
+                "copiados (removidos por purge_migrated_map_statistics)"
+            )
+
+        columns = [f"{side}_{stat}" for stat in MAP_STATS for side in ("home", "away")]
+        cursor.executemany(
+            f"INSERT INTO map_stats (map_id, match_id, map_number, {', '.join(columns)}) "
+            f"VALUES ({', '.join('?' for _ in range(len(columns) + 3))})",
+            [
+                (map_id, match_id, map_number, *(values.get(c) for c in columns))
+                for map_id, (match_id, map_number, values) in maps.items()
+            ],
+        )
+        print(f"🔄 {len(maps)} mapas copiados de map_statistics para map_stats")
+
+    def purge_migrated_map_statistics(self):
+        """Remove de map_statistics as linhas de MAP_STATS cuja cópia em
+        map_stats confere e todas as linhas de mapas sem game_maps (órfãs, que
+        nenhuma consulta alcança); retorna (mapas removidos, mapas divergentes,
+        mapas órfãos removidos)"""
+        conn = self.get_connection()
+        cursor = conn.cursor()
+        maps = self._legacy_map_statistics(cursor)
+
+        columns = [f"{side}_{stat}" for stat in MAP_STATS for side in ("home", "away")]
+        verified, mismatched = [], 0
+        for map_id, (_, _, values) in maps.items():
+            cursor.execute(
+                f"SELECT {', '.join(columns)} FROM map_stats WHERE map_id = ?", (map_id,)
+            )
+            row = cursor.fetchone()
+            if row and all(values.get(c, row[i]) == row[i] for i, c in enumerate(columns)):
+                verified.append(map_id)
+            else:
+                mismatched += 1
+
+        placeholders = ", ".join("?" for _ in MAP_STATS)
+        cursor.executemany(
+            f"DELETE FROM map_statistics WHERE map_id = ? AND stat_name IN ({placeholders})",
+            [(map_id, *MAP_STATS) for map_id in verified],
+        )
+        orphans = self._orphan_map_statistics(cursor)
+        cursor.executemany(
+            "DELETE FROM map_statistics WHERE map_id = ?",
+            [(map_id,) for map_id in orphans],
+        )
+        conn.commit()
+        conn.close()
+        return len(verified), mismatched, len(orphans)
+
+    def _backfill_team_map_timeline(self, cursor):
+        """Preenche team_map_timeline a partir de map_stats em bancos antigos"""
+        cursor.execute("SELECT 1 FROM team_map_timeline LIMIT 1")
+        if cursor.fetchone():
+            return
+        cursor.execute("SELECT 1 FROM map_stats LIMIT 1")
+        if not cursor.fetchone():
+            return
+        rows = refresh_team_map_timeline(cursor)
+        print(f"🔄 team_map_timeline preenchida com {rows} linhas")
+
     def get_connection(self):
-        return sqlite3.connect(self.db_path)
+        return connect(self.db_path)
 
     def log_update(
-        self, update_type, items_processed, new_items, success, error_message=None
+        self,
+        update_type,
+        items_processed,
+        new_items,
+        success,
+        error_message=None,
+        details=None,
     ):
-        """Registra log de atualização"""
+        """Registra log de atualização (details: texto/JSON livre)"""
         conn = self.get_connection()
         cursor = conn.cursor()
 
         cursor.execute(
             """
-            INSERT INTO update_logs (update_type, items_processed, new_items, success, error_message)
-            VALUES (?, ?, ?, ?, ?)
+            INSERT INTO update_logs (update_type, items_processed, new_items, success, error_message, details)
+            VALUES (?, ?, ?, ?, ?, ?)
         """,
-            (update_type, items_processed, new_items, success, error_message),
+            (update_type, items_processed, new_items, success, error_message, details),
         )
 
         conn.commit()
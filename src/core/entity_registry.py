@@ -0,0 +1,321 @@
+import csv
+import logging
+import re
+import sqlite3
+import unicodedata
+from contextlib import closing
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from . import database
+from .connection import connect
+
+logger = logging.getLogger("entity_registry")
+
+KINDS = ("team", "league", "player")
+
+# Fonte dos ids externos: BetsAPI (team_id de lol_esports.db e lol_odds.db)
+SOURCE_BETSAPI = "betsapi"
+SOURCE_ORACLE = "oracle"
+
+# Colunas dos CSVs do Oracle's Elixir por tipo de entidade
+ORACLE_COLUMNS = {
+    "team": ("teamname", "t1", "t2"),
+    "league": ("league",),
+    "player": ("playername",),
+}
+
+_registries: Dict[str, "EntityRegistry"] = {}
+
+
+def normalize(name: Optional[str]) -> str:
+    """Chave de alias: sem acentos, minúscula, só letras/números separados por espaço"""
+    if not name:
+        return ""
+    text = unicodedata.normalize("NFKD", str(name))
+    text = "".join(c for c in text if not unicodedata.combining(c)).casefold()
+    return " ".join(re.sub(r"[^0-9a-z]+", " ", text).split())
+
+
+class EntityRegistry:
+    """Registro de times, ligas e jogadores com id canônico entre as fontes.
+
+    Cada entidade tem um ``entity_id``, uma lista de aliases (nomes
+    normalizados com ``normalize``) e ids externos por fonte. O registro fica
+    em lol_esports.db e é mantido em memória depois da primeira consulta.
+    """
+
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = str(db_path or database.DB_PATH)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._aliases: Dict[Tuple[str, str], int] = {}
+        self._external: Dict[Tuple[str, str, str], int] = {}
+        self._external_by_entity: Dict[Tuple[int, str], str] = {}
+        self._loaded = False
+        self._init_db()
+
+    @classmethod
+    def shared(cls, db_path: Optional[Path] = None) -> "EntityRegistry":
+        """Instância compartilhada por processo (um cache por arquivo)"""
+        key = str(Path(db_path or database.DB_PATH).resolve())
+        if key not in _registries:
+            _registries[key] = cls(db_path)
+        return _registries[key]
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._conn = connect(self.db_path)
+        return self._conn
+
+    def _init_db(self):
+        conn = self._get_connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entities (
+                entity_id INTEGER PRIMARY KEY,
+                kind TEXT NOT NULL CHECK (kind IN ('team', 'league', 'player')),
+                canonical_name TEXT NOT NULL,
+                created_at DATETIME DEFAULT CURRENT_TIMESTAMP
+            )
+        """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entity_aliases (
+                kind TEXT NOT NULL,
+                alias_key TEXT NOT NULL,
+                alias TEXT NOT NULL,
+                entity_id INTEGER NOT NULL,
+                source TEXT,
+                PRIMARY KEY (kind, alias_key),
+                FOREIGN KEY (entity_id) REFERENCES entities (entity_id)
+            )
+        """
+        )
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entity_external_ids (
+                source TEXT NOT NULL,
+                kind TEXT NOT NULL,
+                external_id TEXT NOT NULL,
+                entity_id INTEGER NOT NULL,
+                PRIMARY KEY (source, kind, external_id),
+                FOREIGN KEY (entity_id) REFERENCES entities (entity_id)
+            )
+        """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entity_aliases_entity ON entity_aliases (entity_id)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_entity_external_entity ON entity_external_ids (entity_id, source)"
+        )
+        conn.commit()
+
+    def _load(self):
+        """Carrega aliases e ids externos em memória (uma vez)"""
+        if self._loaded:
+            return
+        conn = self._get_connection()
+        self._aliases = {
+            (kind, alias_key): entity_id
+            for kind, alias_key, entity_id in conn.execute(
+                "SELECT kind, alias_key, entity_id FROM entity_aliases"
+            )
+        }
+        for source, kind, external_id, entity_id in conn.execute(
+            "SELECT source, kind, external_id, entity_id FROM entity_external_ids"
+        ):
+            self._external[(source, kind, external_id)] = entity_id
+            self._external_by_entity.setdefault((entity_id, source), external_id)
+        self._loaded = True
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    def resolve(self, kind: str, name: Optional[str]) -> Optional[int]:
+        """entity_id pelo nome (qualquer alias conhecido) ou None"""
+        self._load()
+        return self._aliases.get((kind, normalize(name)))
+
+    def resolve_external(
+        self, kind: str, external_id, source: str = SOURCE_BETSAPI
+    ) -> Optional[int]:
+        """entity_id pelo id da fonte (ex.: team_id da BetsAPI) ou None"""
+        if external_id is None:
+            return None
+        self._load()
+        return self._external.get((source, kind, str(external_id)))
+
+    def external_id(
+        self, entity_id: int, source: str = SOURCE_BETSAPI
+    ) -> Optional[str]:
+        """Id da entidade na fonte informada"""
+        self._load()
+        return self._external_by_entity.get((entity_id, source))
+
+    def resolve_many(
+        self, kind: str, names: Iterable[Optional[str]]
+    ) -> Dict[str, Optional[int]]:
+        """Resolve vários nomes de uma vez (aliases já carregados em memória)"""
+        self._load()
+        return {
+            name: self._aliases.get((kind, normalize(name))) for name in names if name
+        }
+
+    def aliases(self, entity_id: int) -> List[str]:
+        """Todos os nomes conhecidos da entidade"""
+        cursor = self._get_connection().execute(
+            "SELECT alias FROM entity_aliases WHERE entity_id = ? ORDER BY alias",
+            (entity_id,),
+        )
+        return [row[0] for row in cursor.fetchall()]
+
+    # ------------------------------------------------------------------
+    # Cadastro
+    # ------------------------------------------------------------------
+    def register(
+        self,
+        kind: str,
+        name: str,
+        external_id=None,
+        source: Optional[str] = None,
+        commit: bool = True,
+    ) -> Optional[int]:
+        """Garante a entidade (por id externo ou alias) e grava nome/id como aliases"""
+        if kind not in KINDS:
+            raise ValueError(f"Tipo de entidade inválido: {kind}")
+        alias_key = normalize(name)
+        if not alias_key:
+            return None
+
+        self._load()
+        conn = self._get_connection()
+        external_id = None if external_id is None else str(external_id)
+
+        entity_id = None
+        if external_id is not None:
+            entity_id = self._external.get((source, kind, external_id))
+        if entity_id is None:
+            entity_id = self._aliases.get((kind, alias_key))
+        if entity_id is None:
+            entity_id = conn.execute(
+                "INSERT INTO entities (kind, canonical_name) VALUES (?, ?)",
+                (kind, name.strip()),
+            ).lastrowid
+
+        if (kind, alias_key) not in self._aliases:
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO entity_aliases (kind, alias_key, alias, entity_id, source)
+                VALUES (?, ?, ?, ?, ?)
+            """,
+                (kind, alias_key, name.strip(), entity_id, source),
+            )
+            self._aliases[(kind, alias_key)] = entity_id
+
+        if (
+            external_id is not None
+            and (source, kind, external_id) not in self._external
+        ):
+            conn.execute(
+                """
+                INSERT OR IGNORE INTO entity_external_ids (source, kind, external_id, entity_id)
+                VALUES (?, ?, ?, ?)
+            """,
+                (source, kind, external_id, entity_id),
+            )
+            self._external[(source, kind, external_id)] = entity_id
+            self._external_by_entity.setdefault((entity_id, source), external_id)
+
+        if commit:
+            conn.commit()
+        return entity_id
+
+    def add_alias(
+        self, kind: str, alias: str, entity_id: int, source: Optional[str] = None
+    ):
+        """Associa (ou reassocia) um nome a uma entidade existente"""
+        alias_key = normalize(alias)
+        if not alias_key:
+            return
+        self._load()
+        conn = self._get_connection()
+        conn.execute(
+            """
+            INSERT INTO entity_aliases (kind, alias_key, alias, entity_id, source)
+            VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (kind, alias_key) DO UPDATE SET
+                entity_id = excluded.entity_id, alias = excluded.alias
+        """,
+            (kind, alias_key, alias.strip(), entity_id, source),
+        )
+        conn.commit()
+        self._aliases[(kind, alias_key)] = entity_id
+
+    def register_many(
+        self,
+        kind: str,
+        items: Iterable[Tuple[Optional[object], str]],
+        source: Optional[str] = None,
+    ) -> int:
+        """Cadastra pares (id externo, nome) em uma transação; retorna quantos eram novos"""
+        self._load()
+        before = len(self._aliases) + len(self._external)
+        for external_id, name in items:
+            self.register(kind, name, external_id, source, commit=False)
+        self._get_connection().commit()
+        return len(self._aliases) + len(self._external) - before
+
+    # ------------------------------------------------------------------
+    # Sincronização com as fontes
+    # ------------------------------------------------------------------
+    def sync_from_esports(self) -> int:
+        """Cadastra times e ligas de lol_esports.db (ids da BetsAPI)"""
+        conn = self._get_connection()
+        added = self.register_many(
+            "team",
+            conn.execute("SELECT team_id, name FROM teams").fetchall(),
+            SOURCE_BETSAPI,
+        )
+        added += self.register_many(
+            "league",
+            conn.execute("SELECT league_id, name FROM leagues").fetchall(),
+            SOURCE_BETSAPI,
+        )
+        return added
+
+    def sync_from_odds(self, odds_db_path: Path) -> int:
+        """Cadastra os times de lol_odds.db (team_id TEXT da BetsAPI)"""
+        with closing(connect(odds_db_path)) as odds_conn:
+            teams = odds_conn.execute("SELECT team_id, name FROM teams").fetchall()
+        return self.register_many("team", teams, SOURCE_BETSAPI)
+
+    def sync_from_oracle_csv(self, csv_path: Path) -> int:
+        """Cadastra nomes de times, ligas e jogadores de um CSV do Oracle's Elixir"""
+        names = {kind: set() for kind in KINDS}
+        with open(csv_path, newline="", encoding="utf-8") as f:
+            reader = csv.DictReader(f)
+            columns = {
+                kind: [
+                    c for c in ORACLE_COLUMNS[kind] if c in (reader.fieldnames or [])
+                ]
+                for kind in KINDS
+            }
+            for row in reader:
+                for kind, kind_columns in columns.items():
+                    for column in kind_columns:
+                        if row.get(column):
+                            names[kind].add(row[column])
+
+        added = 0
+        for kind, kind_names in names.items():
+            added += self.register_many(
+                kind, ((None, name) for name in sorted(kind_names)), SOURCE_ORACLE
+            )
+        return added
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -8,6 +8,20 @@ class BetsAPIError(Exception):
 class RateLimitError(BetsAPIError):
     """Exceção para erros de rate limit"""
 
+    def __init__(self, message: str = "", retry_after: float = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class TransientAPIError(BetsAPIError):
+    """Exceção para falhas temporárias (5xx, timeout, conexão)"""
+
+    pass
+
+
+class CircuitOpenError(BetsAPIError):
+    """Exceção quando o circuit breaker do endpoint está aberto"""
+
     pass
 
 
@@ -0,0 +1,106 @@
+import logging
+from typing import Optional
+
+import httpx
+
+from .replay import RecordingTransport, ReplayStore, ReplayTransport
+from ..config.settings import settings
+
+logger = logging.getLogger("http_pool")
+
+# Cliente compartilhado por processo (todas as instâncias de Bet365Client
+# reutilizam as mesmas conexões "quentes")
+_shared_client: Optional[httpx.AsyncClient] = None
+_shared_refs = 0
+
+
+def _module_available(*names: str) -> bool:
+    """Verifica se algum dos módulos opcionais está instalado"""
+    for name in names:
+        try:
+            __import__(name)
+            return True
+        except ImportError:
+            continue
+    return False
+
+
+def _accept_encoding() -> str:
+    """Monta o Accept-Encoding apenas com os algoritmos que o httpx consegue decodificar"""
+    supported = []
+    for encoding in settings.HTTP_COMPRESSION.split(","):
+        encoding = encoding.strip().lower()
+        if not encoding:
+            continue
+        if encoding == "br" and not _module_available("brotli", "brotlicffi"):
+            logger.debug("Brotli não instalado, removendo 'br' do Accept-Encoding")
+            continue
+        supported.append(encoding)
+    return ", ".join(supported) or "identity"
+
+
+def build_async_client(**overrides) -> httpx.AsyncClient:
+    """Cria um httpx.AsyncClient com pool, keep-alive, HTTP/2 e compressão configurados"""
+    http2 = settings.HTTP2_ENABLED
+    if http2 and not _module_available("h2"):
+        logger.warning(
+            "HTTP/2 habilitado mas pacote 'h2' não instalado, usando HTTP/1.1"
+        )
+        http2 = False
+
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+    )
+
+    options = {
+        "timeout": httpx.Timeout(
+            settings.REQUEST_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT
+        ),
+        "transport": _build_transport(limits, http2),
+        "headers": {"Accept-Encoding": _accept_encoding()},
+    }
+    options.update(overrides)
+    return httpx.AsyncClient(**options)
+
+
+def _build_transport(limits: httpx.Limits, http2: bool) -> httpx.AsyncBaseTransport:
+    """Transporte real, com gravação (record) ou servido do disco (replay)"""
+    if settings.API_MODE == "replay":
+        logger.info(f"🎞️  Modo replay: servindo respostas de {settings.REPLAY_DIR}")
+        return ReplayTransport(ReplayStore())
+
+    transport = httpx.AsyncHTTPTransport(limits=limits, http2=http2)
+    if settings.API_MODE == "record":
+        logger.info(f"⏺️  Modo record: gravando respostas em {settings.REPLAY_DIR}")
+        return RecordingTransport(transport, ReplayStore())
+
+    return transport
+
+
+def acquire_shared_client() -> httpx.AsyncClient:
+    """Retorna o cliente compartilhado do processo, criando-o se necessário"""
+    global _shared_client, _shared_refs
+
+    if _shared_client is None or _shared_client.is_closed:
+        _shared_client = build_async_client()
+        _shared_refs = 0
+
+    _shared_refs += 1
+    return _shared_client
+
+
+async def release_shared_client(client: httpx.AsyncClient):
+    """Libera uma referência ao cliente compartilhado; fecha quando não há mais usuários"""
+    global _shared_client, _shared_refs
+
+    if client is not _shared_client:
+        await client.aclose()
+        return
+
+    _shared_refs -= 1
+    if _shared_refs <= 0:
+        await client.aclose()
+        _shared_client = None
+        _shared_refs = 0
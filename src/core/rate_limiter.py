@@ -0,0 +1,159 @@
+import asyncio
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+from ..config.settings import settings
+from .connection import connect
+
+logger = logging.getLogger("rate_limiter")
+
+
+class QuotaManager:
+    """Token bucket da cota horária da API, persistido em SQLite.
+
+    O estado (tokens restantes e momento da última recarga) fica em um arquivo
+    local, então scripts executados em sequência ou em paralelo consomem o mesmo
+    orçamento horário. Cada aquisição é O(1): uma leitura e uma escrita dentro
+    de uma transação ``BEGIN IMMEDIATE``, executada em uma thread para que a
+    espera pelo lock do arquivo (outro processo) não trave o event loop.
+    """
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        max_requests: Optional[int] = None,
+        time_window: Optional[int] = None,
+        bucket: str = "betsapi",
+    ):
+        self.db_path = str(db_path or settings.QUOTA_DB_PATH)
+        self.capacity = float(max_requests or settings.API_HOURLY_QUOTA)
+        self.time_window = time_window or settings.API_QUOTA_WINDOW
+        self.refill_rate = self.capacity / self.time_window  # tokens por segundo
+        self.bucket = bucket
+        self._conn: Optional[sqlite3.Connection] = None
+        # Serializa o uso da conexão entre as threads de asyncio.to_thread
+        self._lock = threading.Lock()
+        self._init_db()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            # isolation_level=None -> controle manual das transações;
+            # check_same_thread=False -> usada pelas threads de to_thread
+            self._conn = connect(
+                self.db_path, isolation_level=None, check_same_thread=False
+            )
+        return self._conn
+
+    def _init_db(self):
+        conn = self._get_connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS quota_buckets (
+                bucket TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                paused_until REAL NOT NULL DEFAULT 0
+            )
+        """
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(quota_buckets)")}
+        if "paused_until" not in columns:
+            conn.execute(
+                "ALTER TABLE quota_buckets ADD COLUMN paused_until REAL NOT NULL DEFAULT 0"
+            )
+        conn.execute(
+            "INSERT OR IGNORE INTO quota_buckets (bucket, tokens, updated_at) VALUES (?, ?, ?)",
+            (self.bucket, self.capacity, time.time()),
+        )
+
+    def _refill(self, tokens: float, updated_at: float, now: float) -> float:
+        elapsed = max(0.0, now - updated_at)
+        return min(self.capacity, tokens + elapsed * self.refill_rate)
+
+    def _read_state(self, conn) -> Tuple[float, float, float]:
+        row = conn.execute(
+            "SELECT tokens, updated_at, paused_until FROM quota_buckets WHERE bucket = ?",
+            (self.bucket,),
+        ).fetchone()
+        if row is None:
+            return self.capacity, time.time(), 0.0
+        return row
+
+    def _try_consume(self, amount: float = 1.0) -> float:
+        """Tenta consumir tokens; retorna 0 em caso de sucesso ou o tempo de espera"""
+        with self._lock:
+            return self._consume(amount)
+
+    def _consume(self, amount: float) -> float:
+        conn = self._get_connection()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            now = time.time()
+            tokens, updated_at, paused_until = self._read_state(conn)
+            tokens = self._refill(tokens, updated_at, now)
+
+            wait_time = 0.0
+            if paused_until > now:
+                # Pausa global pedida após um sinal de rate limit da API
+                wait_time = paused_until - now
+            elif tokens >= amount:
+                tokens -= amount
+            else:
+                wait_time = (amount - tokens) / self.refill_rate
+
+            conn.execute(
+                "UPDATE quota_buckets SET tokens = ?, updated_at = ? WHERE bucket = ?",
+                (tokens, now, self.bucket),
+            )
+            conn.execute("COMMIT")
+            return wait_time
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    async def acquire(self, amount: float = 1.0):
+        """Aguarda até haver cota disponível e consome ``amount`` tokens"""
+        while True:
+            wait_time = await asyncio.to_thread(self._try_consume, amount)
+            if wait_time <= 0:
+                return
+            logger.debug(f"⏰ Cota da API esgotada, aguardando {wait_time:.2f}s")
+            await asyncio.sleep(wait_time)
+
+    async def pause(self, seconds: float):
+        """Suspende todas as aquisições (em todos os processos) por ``seconds``"""
+        await asyncio.to_thread(self._pause, time.time() + seconds)
+        logger.warning(f"⏸️  Cota da API pausada por {seconds:.0f}s (rate limit)")
+
+    def _pause(self, paused_until: float):
+        with self._lock:
+            self._get_connection().execute(
+                "UPDATE quota_buckets SET paused_until = MAX(paused_until, ?) WHERE bucket = ?",
+                (paused_until, self.bucket),
+            )
+
+    def remaining(self) -> int:
+        """Quantidade de requisições disponíveis agora (bloqueante: em corrotinas,
+        chamar via ``asyncio.to_thread``, como ``Bet365Client.remaining_quota``)"""
+        with self._lock:
+            tokens, updated_at, _ = self._read_state(self._get_connection())
+        return int(self._refill(tokens, updated_at, time.time()))
+
+    def seconds_until_available(self, amount: int = 1) -> float:
+        """Tempo estimado até haver ``amount`` requisições disponíveis
+        (bloqueante, como ``remaining``)"""
+        with self._lock:
+            _, _, paused_until = self._read_state(self._get_connection())
+        missing = amount - self.remaining()
+        return max(0.0, missing / self.refill_rate, paused_until - time.time())
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
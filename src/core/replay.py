@@ -0,0 +1,277 @@
+import asyncio
+import hashlib
+import logging
+import random
+from collections import defaultdict
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict, Iterable, Optional
+
+import httpx
+
+from . import json_codec
+from .response_cache import ResponseCache
+from ..config.settings import settings
+
+logger = logging.getLogger("replay")
+
+ODDS_SECTIONS = ("main", "map_1", "map_2", "match", "schedule", "others", "player")
+
+
+def _request_endpoint(request: httpx.Request) -> str:
+    return request.url.path.lstrip("/")
+
+
+def _request_params(request: httpx.Request) -> Dict[str, str]:
+    return {k: v for k, v in request.url.params.items() if k != "token"}
+
+
+class ReplayStore:
+    """Gravações de requisição/resposta da BetsAPI em disco (um JSON por chamada)"""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or settings.REPLAY_DIR)
+
+    def _path(self, endpoint: str, params: Dict[str, Any]) -> Path:
+        key = ResponseCache.make_key(endpoint, params)
+        digest = hashlib.sha1(key.encode("utf-8")).hexdigest()
+        return self.root / endpoint.replace("/", "_") / f"{digest}.json"
+
+    def save(
+        self,
+        endpoint: str,
+        params: Dict[str, Any],
+        body: Dict[str, Any],
+        status: int = 200,
+    ):
+        path = self._path(endpoint, params)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "endpoint": endpoint,
+            "params": {k: str(v) for k, v in params.items() if k != "token"},
+            "status": status,
+            "recorded_at": datetime.now().isoformat(),
+            "body": body,
+        }
+        with open(path, "wb") as f:
+            f.write(json_codec.dumps_bytes(record))
+
+    def load(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        path = self._path(endpoint, params)
+        if not path.exists():
+            return None
+        with open(path, "rb") as f:
+            return json_codec.loads(f.read())
+
+    def iter_bodies(self, endpoint: str) -> Iterable[Dict[str, Any]]:
+        """Itera sobre os payloads gravados de um endpoint"""
+        directory = self.root / endpoint.replace("/", "_")
+        for path in sorted(directory.glob("*.json")):
+            with open(path, "rb") as f:
+                yield json_codec.loads(f.read())["body"]
+
+    # ------------------------------------------------------------------
+    # Seed a partir dos arquivos já existentes no repositório
+    # ------------------------------------------------------------------
+    def seed_from_results(
+        self, results_dir: Path, sport_id: int = 151, upcoming_days: int = 10
+    ) -> int:
+        """Importa os arquivos de lol_results/*.json (event_info + result_info).
+
+        Gera as respostas de ``result(event_id)`` e de ``upcoming(day)``
+        agrupando os eventos pelo dia da partida. Como esses dias já passaram,
+        os ``upcoming_days + 1`` dias mais recentes também são gravados de novo
+        a partir de hoje (ver ``_seed_upcoming_window``), que é o intervalo
+        pedido por ``db_get_odds.py``.
+        """
+        events_by_day = defaultdict(list)
+        count = 0
+
+        for path in sorted(Path(results_dir).glob("*.json")):
+            try:
+                with open(path, "rb") as f:
+                    data = json_codec.loads(f.read())
+            except (OSError, ValueError) as e:
+                logger.warning(f"Arquivo ignorado {path.name}: {e}")
+                continue
+
+            event_info = data.get("event_info") if isinstance(data, dict) else None
+            result_info = data.get("result_info") if isinstance(data, dict) else None
+            if not event_info or not result_info:
+                continue
+
+            self.save(
+                "v1/bet365/result",
+                {"event_id": event_info["id"]},
+                {"success": 1, "results": [result_info]},
+            )
+            count += 1
+
+            if event_info.get("time"):
+                day = datetime.fromtimestamp(int(event_info["time"])).strftime("%Y%m%d")
+                events_by_day[day].append(event_info)
+
+        for day, events in events_by_day.items():
+            self.save(
+                "v1/bet365/upcoming",
+                {"sport_id": sport_id, "day": day},
+                {
+                    "success": 1,
+                    "pager": {"page": 1, "per_page": 50, "total": len(events)},
+                    "results": events,
+                },
+            )
+        self._seed_upcoming_window(events_by_day, sport_id, upcoming_days)
+
+        return count
+
+    def _seed_upcoming_window(
+        self, events_by_day: Dict[str, list], sport_id: int, upcoming_days: int
+    ):
+        """Regrava os dias mais recentes como hoje..hoje + ``upcoming_days``.
+
+        O horário de cada evento é deslocado pelo mesmo número de dias e o
+        ``time_status`` volta a "0" (não iniciado), para que as partidas
+        apareçam como futuras. O dia de hoje, se já gravado, é substituído. Só
+        há prematch no replay para os eventos cujo FI veio de json_backups.
+        """
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        past_days = sorted(
+            day for day in events_by_day if day < today.strftime("%Y%m%d")
+        )
+        recent = past_days[-(upcoming_days + 1) :]
+
+        for offset, day in enumerate(recent):
+            target = today + timedelta(days=offset)
+            shift = int((target - datetime.strptime(day, "%Y%m%d")).total_seconds())
+            events = [
+                {**event, "time": str(int(event["time"]) + shift), "time_status": "0"}
+                for event in events_by_day[day]
+            ]
+            self.save(
+                "v1/bet365/upcoming",
+                {"sport_id": sport_id, "day": target.strftime("%Y%m%d")},
+                {
+                    "success": 1,
+                    "pager": {"page": 1, "per_page": 50, "total": len(events)},
+                    "results": events,
+                },
+            )
+
+    def seed_from_backups(self, backup_dir: Path) -> int:
+        """Importa respostas brutas salvas por LoLDataManager._save_json_backup"""
+        count = 0
+        for path in sorted(Path(backup_dir).rglob("*.json")):
+            try:
+                with open(path, "rb") as f:
+                    data = json_codec.loads(f.read())
+            except (OSError, ValueError) as e:
+                logger.warning(f"Arquivo ignorado {path.name}: {e}")
+                continue
+
+            if not isinstance(data, dict) or not isinstance(data.get("results"), list):
+                continue
+
+            for result in data["results"]:
+                if not isinstance(result, dict):
+                    continue
+                if result.get("FI") and any(s in result for s in ODDS_SECTIONS):
+                    self.save(
+                        "v3/bet365/prematch",
+                        {"FI": result["FI"]},
+                        {"success": 1, "results": [result]},
+                    )
+                    count += 1
+                elif "period_stats" in result or "ss" in result:
+                    event_id = result.get("bet365_id") or result.get("id")
+                    if event_id:
+                        self.save(
+                            "v1/bet365/result",
+                            {"event_id": event_id},
+                            {"success": 1, "results": [result]},
+                        )
+                        count += 1
+
+        return count
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """Transporte que repassa as requisições e grava as respostas 200 no ReplayStore"""
+
+    def __init__(self, inner: httpx.AsyncBaseTransport, store: ReplayStore):
+        self.inner = inner
+        self.store = store
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(request)
+        if response.status_code != 200:
+            return response
+
+        content = await response.aread()
+        try:
+            body = json_codec.loads(content)
+        except ValueError:
+            return response
+
+        self.store.save(_request_endpoint(request), _request_params(request), body)
+        # O conteúdo já foi decodificado; devolve sem o Content-Encoding original
+        headers = [
+            (k, v)
+            for k, v in response.headers.multi_items()
+            if k.lower() not in ("content-encoding", "content-length")
+        ]
+        return httpx.Response(
+            response.status_code, headers=headers, content=content, request=request
+        )
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """Dublê local da BetsAPI: serve as gravações do disco.
+
+    Permite injetar latência (média + jitter, em ms) e uma taxa de erros 503
+    para testes de carga de ``db_get_odds.py`` e ``update_30_days.py`` sem
+    gastar cota. Requisições sem gravação recebem uma resposta vazia.
+    """
+
+    def __init__(
+        self,
+        store: ReplayStore,
+        latency_ms: Optional[float] = None,
+        jitter_ms: Optional[float] = None,
+        error_rate: Optional[float] = None,
+        seed: Optional[int] = None,
+    ):
+        self.store = store
+        self.latency_ms = (
+            settings.REPLAY_LATENCY_MS if latency_ms is None else latency_ms
+        )
+        self.jitter_ms = (
+            settings.REPLAY_LATENCY_JITTER_MS if jitter_ms is None else jitter_ms
+        )
+        self.error_rate = (
+            settings.REPLAY_ERROR_RATE if error_rate is None else error_rate
+        )
+        self.random = random.Random(seed)
+        self.served = 0
+        self.missing = 0
+        self.injected_errors = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay_ms = self.latency_ms + self.random.uniform(0, self.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.injected_errors += 1
+            return httpx.Response(503, json={"success": 0, "error": "replay error"})
+
+        record = self.store.load(_request_endpoint(request), _request_params(request))
+        if record is None:
+            self.missing += 1
+            return httpx.Response(200, json={"success": 1, "results": []})
+
+        self.served += 1
+        return httpx.Response(record.get("status", 200), json=record["body"])
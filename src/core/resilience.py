@@ -0,0 +1,101 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+from .exceptions import CircuitOpenError
+from ..config.settings import settings
+
+
+class RetryPolicy:
+    """Backoff exponencial com jitter ("full jitter") entre tentativas"""
+
+    def __init__(
+        self,
+        max_retries: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+    ):
+        self.max_retries = (
+            settings.API_MAX_RETRIES if max_retries is None else max_retries
+        )
+        self.base_delay = base_delay or settings.API_RETRY_BASE_DELAY
+        self.max_delay = max_delay or settings.API_RETRY_MAX_DELAY
+
+    def backoff(self, attempt: int) -> float:
+        """Tempo de espera antes da tentativa ``attempt + 1``"""
+        ceiling = min(self.max_delay, self.base_delay * (2**attempt))
+        return random.uniform(0, ceiling)
+
+    @staticmethod
+    def parse_retry_after(value: Optional[str]) -> Optional[float]:
+        """Interpreta o header Retry-After (segundos ou data HTTP)"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return max(0.0, retry_at.timestamp() - time.time())
+
+
+class CircuitBreaker:
+    """Circuit breaker por endpoint.
+
+    Após ``threshold`` falhas consecutivas o endpoint fica "aberto" por
+    ``cooldown`` segundos; depois disso uma única chamada de teste é liberada
+    (half-open) e o circuito fecha se ela tiver sucesso.
+    """
+
+    def __init__(self, threshold: Optional[int] = None, cooldown: Optional[int] = None):
+        self.threshold = threshold or settings.CIRCUIT_BREAKER_THRESHOLD
+        self.cooldown = cooldown or settings.CIRCUIT_BREAKER_COOLDOWN
+        self.failures: Dict[str, int] = {}
+        self.opened_at: Dict[str, float] = {}
+        self._half_open: Dict[str, bool] = {}
+
+    def is_open(self, endpoint: str) -> bool:
+        opened_at = self.opened_at.get(endpoint)
+        if opened_at is None:
+            return False
+        return time.time() - opened_at < self.cooldown
+
+    def before_call(self, endpoint: str):
+        """Lança CircuitOpenError se o endpoint estiver bloqueado"""
+        opened_at = self.opened_at.get(endpoint)
+        if opened_at is None:
+            return
+
+        remaining = self.cooldown - (time.time() - opened_at)
+        if remaining > 0:
+            raise CircuitOpenError(
+                f"Circuito aberto para {endpoint} (nova tentativa em {remaining:.0f}s)"
+            )
+
+        if self._half_open.get(endpoint):
+            raise CircuitOpenError(f"Circuito em teste para {endpoint}")
+        self._half_open[endpoint] = True
+
+    def release(self, endpoint: str):
+        """Encerra o teste (meio-aberto) sem registrar sucesso nem falha.
+
+        Chamado ao fim de toda requisição; após um cancelamento a próxima
+        chamada pode testar o endpoint de novo.
+        """
+        self._half_open.pop(endpoint, None)
+
+    def record_success(self, endpoint: str):
+        self.failures.pop(endpoint, None)
+        self.opened_at.pop(endpoint, None)
+        self._half_open.pop(endpoint, None)
+
+    def record_failure(self, endpoint: str):
+        self.failures[endpoint] = self.failures.get(endpoint, 0) + 1
+        if self._half_open.pop(endpoint, False) or (
+            self.failures[endpoint] >= self.threshold
+        ):
+            self.opened_at[endpoint] = time.time()
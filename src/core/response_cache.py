@@ -0,0 +1,143 @@
+import logging
+import sqlite3
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, Optional
+from urllib.parse import urlencode
+
+from . import json_codec
+from ..config.settings import settings
+from .connection import connect
+
+logger = logging.getLogger("response_cache")
+
+RESULT_ENDPOINT = "v1/bet365/result"
+FINISHED_STATUS = "3"
+
+
+class ResponseCache:
+    """Cache em disco (SQLite) das respostas da BetsAPI com TTL por endpoint"""
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        default_ttl: Optional[int] = None,
+        endpoint_ttls: Optional[Dict[str, int]] = None,
+    ):
+        self.db_path = str(db_path or settings.CACHE_DB_PATH)
+        self.default_ttl = settings.CACHE_TTL if default_ttl is None else default_ttl
+        self.endpoint_ttls = (
+            settings.CACHE_TTL_BY_ENDPOINT if endpoint_ttls is None else endpoint_ttls
+        )
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._init_db()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = connect(self.db_path)
+        return self._conn
+
+    def _init_db(self):
+        conn = self._get_connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS api_cache (
+                cache_key TEXT PRIMARY KEY,
+                endpoint TEXT NOT NULL,
+                payload TEXT NOT NULL,
+                created_at REAL NOT NULL,
+                expires_at REAL
+            )
+        """
+        )
+        # Remove entradas expiradas (expires_at NULL = imutável)
+        conn.execute(
+            "DELETE FROM api_cache WHERE expires_at IS NOT NULL AND expires_at < ?",
+            (time.time(),),
+        )
+        conn.commit()
+
+    @staticmethod
+    def make_key(endpoint: str, params: Dict[str, Any]) -> str:
+        """Chave estável: endpoint + parâmetros ordenados (sem o token)"""
+        items = sorted((k, str(v)) for k, v in params.items() if k != "token")
+        return f"{endpoint}?{urlencode(items)}"
+
+    def ttl_for(self, endpoint: str, data: Dict[str, Any]) -> Optional[float]:
+        """TTL da resposta; None = cache permanente, 0 = não cachear"""
+        if endpoint == RESULT_ENDPOINT:
+            results = data.get("results") or []
+            if results and all(
+                isinstance(r, dict) and str(r.get("time_status")) == FINISHED_STATUS
+                for r in results
+            ):
+                return None
+        return self.endpoint_ttls.get(endpoint, self.default_ttl)
+
+    def get(self, endpoint: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        if self.endpoint_ttls.get(endpoint, self.default_ttl) == 0:
+            return None
+
+        row = (
+            self._get_connection()
+            .execute(
+                "SELECT payload, expires_at FROM api_cache WHERE cache_key = ?",
+                (self.make_key(endpoint, params),),
+            )
+            .fetchone()
+        )
+
+        if row is None or (row[1] is not None and row[1] < time.time()):
+            self.misses[endpoint] += 1
+            return None
+
+        self.hits[endpoint] += 1
+        return json_codec.loads(row[0])
+
+    def set(self, endpoint: str, params: Dict[str, Any], data: Dict[str, Any]):
+        ttl = self.ttl_for(endpoint, data)
+        if ttl == 0:
+            return
+
+        now = time.time()
+        expires_at = None if ttl is None else now + ttl
+        conn = self._get_connection()
+        conn.execute(
+            """
+            INSERT OR REPLACE INTO api_cache (cache_key, endpoint, payload, created_at, expires_at)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            (
+                self.make_key(endpoint, params),
+                endpoint,
+                json_codec.dumps(data),
+                now,
+                expires_at,
+            ),
+        )
+        conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Contadores de hit/miss por endpoint (cada hit é uma requisição economizada)"""
+        endpoints = sorted(set(self.hits) | set(self.misses))
+        total_hits = sum(self.hits.values())
+        total_misses = sum(self.misses.values())
+        total = total_hits + total_misses
+        return {
+            "hits": total_hits,
+            "misses": total_misses,
+            "hit_rate": (total_hits / total) if total else 0.0,
+            "endpoints": {
+                endpoint: {"hits": self.hits[endpoint], "misses": self.misses[endpoint]}
+                for endpoint in endpoints
+            },
+        }
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
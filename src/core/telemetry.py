@@ -0,0 +1,102 @@
+import math
+from collections import Counter, defaultdict
+from typing import Any, Dict, List
+
+# Limites (ms) dos buckets do histograma de latência
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Percentil pelo método nearest-rank"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class EndpointStats:
+    def __init__(self):
+        self.latencies_ms: List[float] = []
+        self.response_bytes = 0
+        self.status_codes: Counter = Counter()
+        self.retries = 0
+        self.quota_used = 0
+        self.coalesced = 0
+
+    def histogram(self) -> Dict[str, int]:
+        buckets: Counter = Counter()
+        for latency in self.latencies_ms:
+            label = next(
+                (f"<={limit}" for limit in LATENCY_BUCKETS_MS if latency <= limit),
+                f">{LATENCY_BUCKETS_MS[-1]}",
+            )
+            buckets[label] += 1
+        return dict(buckets)
+
+    def summary(self) -> Dict[str, Any]:
+        latencies = sorted(self.latencies_ms)
+        return {
+            "requests": len(latencies),
+            "p50_ms": round(_percentile(latencies, 50), 1),
+            "p95_ms": round(_percentile(latencies, 95), 1),
+            "p99_ms": round(_percentile(latencies, 99), 1),
+            "max_ms": round(latencies[-1], 1) if latencies else 0.0,
+            "histogram_ms": self.histogram(),
+            "response_bytes": self.response_bytes,
+            "status_codes": {str(k): v for k, v in self.status_codes.items()},
+            "retries": self.retries,
+            "quota_used": self.quota_used,
+            "coalesced": self.coalesced,
+        }
+
+
+class ClientTelemetry:
+    """Métricas por endpoint do Bet365Client (latência, bytes, status, retries, cota)"""
+
+    def __init__(self):
+        self.endpoints: Dict[str, EndpointStats] = defaultdict(EndpointStats)
+
+    def record_response(
+        self, endpoint: str, latency_s: float, status: Any, response_bytes: int = 0
+    ):
+        stats = self.endpoints[endpoint]
+        stats.latencies_ms.append(latency_s * 1000)
+        stats.status_codes[status] += 1
+        stats.response_bytes += response_bytes
+
+    def record_retry(self, endpoint: str):
+        self.endpoints[endpoint].retries += 1
+
+    def record_quota(self, endpoint: str):
+        self.endpoints[endpoint].quota_used += 1
+
+    def record_coalesced(self, endpoint: str):
+        self.endpoints[endpoint].coalesced += 1
+
+    @property
+    def total_requests(self) -> int:
+        return sum(len(s.latencies_ms) for s in self.endpoints.values())
+
+    @property
+    def total_quota_used(self) -> int:
+        return sum(s.quota_used for s in self.endpoints.values())
+
+    @property
+    def total_errors(self) -> int:
+        return sum(
+            count
+            for s in self.endpoints.values()
+            for status, count in s.status_codes.items()
+            if not (isinstance(status, int) and status < 400)
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "requests": self.total_requests,
+            "quota_used": self.total_quota_used,
+            "errors": self.total_errors,
+            "endpoints": {
+                endpoint: stats.summary()
+                for endpoint, stats in sorted(self.endpoints.items())
+            },
+        }
@@ -9,7 +9,7 @@ from src.core.bet365_client import Bet365Client
 class LoLDataManager:
     def __init__(self):
         self.db = LoLDatabase()
-        self.client = Bet365Client()
+        self.client = Bet365Client(telemetry_db=self.db)
         self.json_backup_dir = Path("../data/json_backups")
         self.json_backup_dir.mkdir(parents=True, exist_ok=True)
 
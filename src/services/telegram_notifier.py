@@ -1,7 +1,10 @@
+import asyncio
 import requests
 import logging
 import os
-from typing import Optional
+from typing import Dict, Optional
+
+from .telegram_outbox import TelegramOutbox
 
 logger = logging.getLogger("telegram_notifier")
 
@@ -18,6 +21,8 @@ class TelegramNotifier:
             self.base_url = f"https://api.telegram.org/bot{self.token}"
             print("✅ Variáveis de ambiente do Telegram carregadas com sucesso")
 
+        self.outbox = TelegramOutbox(self.token)
+
     def send_message(self, text: str, parse_mode: Optional[str] = None) -> bool:
         """Envia mensagem para o Telegram"""
         if not self.token or not self.chat_id:
@@ -38,16 +43,35 @@ class TelegramNotifier:
             print(f"❌ Erro ao enviar mensagem para o Telegram: {e}")
             return False
 
+    def queue_message(
+        self, text: str, parse_mode: Optional[str] = None, kind: str = "message"
+    ) -> bool:
+        """Coloca a mensagem na outbox; o envio acontece em flush/flush_outbox"""
+        if not self.token or not self.chat_id:
+            logger.warning("Token ou Chat ID do Telegram não configurados")
+            return False
+
+        self.outbox.enqueue(self.chat_id, text, parse_mode=parse_mode, kind=kind)
+        return True
+
+    async def flush_outbox(self, digest: Optional[bool] = None) -> Dict[str, int]:
+        """Envia as mensagens pendentes da outbox (worker assíncrono)"""
+        return await self.outbox.send_pending(digest=digest)
+
+    def flush(self, digest: Optional[bool] = None) -> Dict[str, int]:
+        """Versão síncrona de flush_outbox para scripts sem event loop"""
+        return asyncio.run(self.flush_outbox(digest=digest))
+
     def notify_new_event(
-        self, team1: str, team2: str, league: str, competition: str
+        self, home_team: str, away_team: str, league_name: str, match_date: str
     ) -> bool:
-        """Notifica sobre novo evento disponível na Bet365"""
+        """Enfileira a notificação de novo evento disponível na Bet365"""
         message = (
             f"🎮 **NOVO JOGO DISPONÍVEL**\n\n"
-            f"🆚 **{team1}** vs **{team2}**\n"
-            f"🏆 **Liga:** {league}\n"
-            f"🎯 **Competição:** {competition}\n\n"
+            f"🆚 **{home_team}** vs **{away_team}**\n"
+            f"🏆 **Liga:** {league_name}\n"
+            f"📅 **Data:** {match_date}\n\n"
             f"💰 Apostas disponíveis na Bet365!"
         )
 
-        return self.send_message(message, parse_mode="Markdown")
+        return self.queue_message(message, parse_mode="Markdown", kind="new_event")
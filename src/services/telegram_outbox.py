@@ -0,0 +1,275 @@
+import asyncio
+import logging
+import sqlite3
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from ..config.settings import settings
+from ..core.connection import connect
+from ..core.resilience import RetryPolicy
+
+logger = logging.getLogger("telegram_outbox")
+
+# Limite de caracteres de uma mensagem do Telegram
+TELEGRAM_MAX_MESSAGE_LENGTH = 4096
+DIGEST_SEPARATOR = "\n\n➖➖➖➖➖\n\n"
+
+
+class TelegramOutbox:
+    """Fila persistente (SQLite) de mensagens do Telegram.
+
+    ``enqueue`` só grava a mensagem; o envio é feito depois por
+    ``send_pending``, fora das transações de ingestão. Mensagens que falham
+    continuam pendentes para a próxima execução: o banco fica em data/, que o
+    workflow diário commita junto com os demais bancos.
+    """
+
+    def __init__(
+        self,
+        token: Optional[str],
+        db_path: Optional[Path] = None,
+        retry_policy: Optional[RetryPolicy] = None,
+    ):
+        self.token = token
+        self.db_path = str(db_path or settings.TELEGRAM_OUTBOX_DB_PATH)
+        self.retry_policy = retry_policy or RetryPolicy(
+            max_retries=settings.TELEGRAM_MAX_RETRIES
+        )
+        self._conn: Optional[sqlite3.Connection] = None
+        self._init_db()
+
+    def _get_connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = connect(self.db_path)
+        return self._conn
+
+    def _init_db(self):
+        conn = self._get_connection()
+        conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS telegram_outbox (
+                id INTEGER PRIMARY KEY,
+                chat_id TEXT NOT NULL,
+                kind TEXT NOT NULL DEFAULT 'message',
+                text TEXT NOT NULL,
+                parse_mode TEXT,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                created_at REAL NOT NULL,
+                sent_at REAL
+            )
+        """
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_telegram_outbox_status ON telegram_outbox (status, id)"
+        )
+        conn.commit()
+
+    def enqueue(
+        self,
+        chat_id: str,
+        text: str,
+        parse_mode: Optional[str] = None,
+        kind: str = "message",
+    ) -> int:
+        """Grava uma mensagem pendente e retorna o id"""
+        conn = self._get_connection()
+        cursor = conn.execute(
+            """
+            INSERT INTO telegram_outbox (chat_id, kind, text, parse_mode, created_at)
+            VALUES (?, ?, ?, ?, ?)
+        """,
+            (str(chat_id), kind, text, parse_mode, time.time()),
+        )
+        conn.commit()
+        return cursor.lastrowid
+
+    def pending(self) -> List[Dict[str, Any]]:
+        """Mensagens pendentes na ordem de criação"""
+        cursor = self._get_connection().execute(
+            """
+            SELECT id, chat_id, kind, text, parse_mode, attempts
+            FROM telegram_outbox
+            WHERE status = 'pending'
+            ORDER BY id
+        """
+        )
+        columns = [c[0] for c in cursor.description]
+        return [dict(zip(columns, row)) for row in cursor.fetchall()]
+
+    def stats(self) -> Dict[str, int]:
+        """Quantidade de mensagens por status"""
+        cursor = self._get_connection().execute(
+            "SELECT status, COUNT(*) FROM telegram_outbox GROUP BY status"
+        )
+        return dict(cursor.fetchall())
+
+    def prune(self, retention_days: Optional[int] = None) -> int:
+        """Remove mensagens já resolvidas (enviadas ou com falha) mais antigas
+        que ``retention_days``; pendentes nunca são removidas"""
+        if retention_days is None:
+            retention_days = settings.TELEGRAM_OUTBOX_RETENTION_DAYS
+        conn = self._get_connection()
+        cursor = conn.execute(
+            "DELETE FROM telegram_outbox WHERE status != 'pending' AND created_at < ?",
+            (time.time() - retention_days * 86400,),
+        )
+        conn.commit()
+        return cursor.rowcount
+
+    @staticmethod
+    def build_digests(messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Junta mensagens consecutivas do mesmo chat, tipo e parse_mode.
+
+        Cada digest respeita o limite de tamanho do Telegram e guarda os ids
+        de todas as mensagens que o compõem.
+        """
+        digests: List[Dict[str, Any]] = []
+        for message in messages:
+            last = digests[-1] if digests else None
+            if (
+                last is not None
+                and (last["chat_id"], last["kind"], last["parse_mode"])
+                == (message["chat_id"], message["kind"], message["parse_mode"])
+                and len(last["text"]) + len(DIGEST_SEPARATOR) + len(message["text"])
+                <= TELEGRAM_MAX_MESSAGE_LENGTH
+            ):
+                last["text"] += DIGEST_SEPARATOR + message["text"]
+                last["ids"].append(message["id"])
+                last["attempts"] = max(last["attempts"], message["attempts"])
+                continue
+
+            digests.append({**message, "ids": [message["id"]]})
+        return digests
+
+    async def send_pending(self, digest: Optional[bool] = None) -> Dict[str, int]:
+        """Envia as mensagens pendentes.
+
+        Usa um único ``httpx.AsyncClient`` (conexões reaproveitadas), um
+        worker por chat respeitando ``TELEGRAM_CHAT_INTERVAL`` entre envios,
+        e retry com backoff (ou o ``retry_after`` do Telegram em caso de 429).
+        Com ``digest`` as mensagens do mesmo tipo são agrupadas.
+        """
+        stats = {"sent": 0, "failed": 0, "pending": 0}
+        self.prune()
+        messages = self.pending()
+        if not messages:
+            return stats
+        if not self.token:
+            logger.warning(
+                "Token do Telegram não configurado, mensagens mantidas na fila"
+            )
+            stats["pending"] = len(messages)
+            return stats
+
+        digest = settings.TELEGRAM_DIGEST if digest is None else digest
+        if digest:
+            batches = self.build_digests(messages)
+        else:
+            batches = [{**message, "ids": [message["id"]]} for message in messages]
+
+        by_chat: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for batch in batches:
+            by_chat[batch["chat_id"]].append(batch)
+
+        url = f"https://api.telegram.org/bot{self.token}/sendMessage"
+        async with httpx.AsyncClient(
+            timeout=settings.TELEGRAM_TIMEOUT,
+            limits=httpx.Limits(max_connections=len(by_chat)),
+        ) as client:
+
+            async def chat_worker(chat_batches: List[Dict[str, Any]]):
+                for i, batch in enumerate(chat_batches):
+                    if i:
+                        await asyncio.sleep(settings.TELEGRAM_CHAT_INTERVAL)
+                    status = await self._deliver(client, url, batch)
+                    stats[status] += len(batch["ids"])
+
+            await asyncio.gather(*[chat_worker(b) for b in by_chat.values()])
+
+        logger.info(
+            f"📤 Telegram: {stats['sent']} enviadas, {stats['pending']} pendentes, "
+            f"{stats['failed']} com falha definitiva"
+        )
+        return stats
+
+    async def _deliver(
+        self, client: httpx.AsyncClient, url: str, batch: Dict[str, Any]
+    ) -> str:
+        """Envia um item da fila com retry; retorna o status final"""
+        payload = {"chat_id": batch["chat_id"], "text": batch["text"]}
+        if batch["parse_mode"]:
+            payload["parse_mode"] = batch["parse_mode"]
+
+        attempts = batch["attempts"]
+        error = None
+        for retry in range(self.retry_policy.max_retries + 1):
+            try:
+                response = await client.post(url, json=payload)
+            except httpx.HTTPError as e:
+                error, delay = str(e), self.retry_policy.backoff(retry)
+            else:
+                if response.status_code == 200:
+                    self._mark(batch["ids"], "sent", attempts)
+                    return "sent"
+
+                error = f"HTTP {response.status_code}: {response.text[:200]}"
+                if response.status_code == 429:
+                    try:
+                        retry_after = response.json()["parameters"]["retry_after"]
+                    except (ValueError, KeyError, TypeError):
+                        retry_after = None
+                    delay = (
+                        float(retry_after)
+                        if retry_after is not None
+                        else self.retry_policy.backoff(retry)
+                    )
+                elif response.status_code >= 500:
+                    delay = self.retry_policy.backoff(retry)
+                else:
+                    # 4xx (mensagem inválida, chat inexistente): não adianta repetir
+                    logger.error(f"❌ Mensagem do Telegram rejeitada: {error}")
+                    self._mark(batch["ids"], "failed", attempts + 1, error)
+                    return "failed"
+
+            attempts += 1
+            if retry < self.retry_policy.max_retries:
+                logger.warning(
+                    f"⚠️ Falha ao enviar para o Telegram ({error}), "
+                    f"nova tentativa em {delay:.1f}s"
+                )
+                await asyncio.sleep(delay)
+
+        status = "failed" if attempts >= settings.TELEGRAM_MAX_ATTEMPTS else "pending"
+        self._mark(batch["ids"], status, attempts, error)
+        return status
+
+    def _mark(
+        self,
+        ids: List[int],
+        status: str,
+        attempts: int,
+        error: Optional[str] = None,
+    ):
+        conn = self._get_connection()
+        conn.executemany(
+            """
+            UPDATE telegram_outbox
+            SET status = ?, attempts = ?, last_error = ?,
+                sent_at = CASE WHEN ? = 'sent' THEN ? ELSE sent_at END
+            WHERE id = ?
+        """,
+            [(status, attempts, error, status, time.time(), id_) for id_ in ids],
+        )
+        conn.commit()
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None